@@ -34,6 +34,14 @@ def render_item(type_, obj, autogen_context):
     return False
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # Full-text search columns, indexes and FTS5 tables are created by
+    # app.database.search and the full_text_search migration, not the models
+    if reflected and compare_to is None and (name.endswith("search_vector") or "_fts" in name):
+        return False
+    return True
+
+
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
@@ -62,7 +70,8 @@ def run_migrations_offline():
     """
     url = get_url()
     context.configure(
-        url=url, target_metadata=target_metadata, literal_binds=True, compare_type=True, render_item=render_item
+        url=url, target_metadata=target_metadata, literal_binds=True, compare_type=True, render_item=render_item,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -86,7 +95,8 @@ def run_migrations_online():
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata, compare_type=True, render_item=render_item
+            connection=connection, target_metadata=target_metadata, compare_type=True, render_item=render_item,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
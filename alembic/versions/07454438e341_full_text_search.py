@@ -0,0 +1,65 @@
+"""Full-text search
+
+Revision ID: 07454438e341
+Revises: 0a80e184be53
+Create Date: 2026-10-16 17:41:12.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '07454438e341'
+down_revision: Union[str, Sequence[str], None] = '0a80e184be53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match the TextSearch definitions in app/models
+SEARCH_COLUMNS = {
+    'repair_requests': {'title': 'A', 'description': 'B'},
+    'services': {'name': 'A', 'service_type': 'B', 'description': 'C'},
+}
+SQLITE_WEIGHTS = {'A': 10.0, 'B': 4.0, 'C': 2.0, 'D': 1.0}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table, weights in SEARCH_COLUMNS.items():
+        if dialect == 'postgresql':
+            # The generated column is filled for existing rows as it is added
+            vector = ' || '.join(
+                f"setweight(to_tsvector('english', coalesce({column}, '')), '{weight}')"
+                for column, weight in weights.items()
+            )
+            op.execute(f"ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({vector}) STORED")
+            op.execute(f"CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)")
+        elif dialect == 'sqlite':
+            fts = f'{table}_fts'
+            columns = ', '.join(weights)
+            new = ', '.join(f'new.{c}' for c in weights)
+            old = ', '.join(f'old.{c}' for c in weights)
+            bm25 = ', '.join(str(SQLITE_WEIGHTS[w]) for w in weights.values())
+            insert_new = f'INSERT INTO {fts}(rowid, {columns}) VALUES (new.rowid, {new});'
+            delete_old = f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.rowid, {old});"
+            op.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{table}', tokenize='porter unicode61')")
+            op.execute(f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({bm25})')")
+            op.execute(f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END')
+            op.execute(f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END')
+            op.execute(f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN {delete_old} {insert_new} END')
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table in SEARCH_COLUMNS:
+        if dialect == 'postgresql':
+            op.execute(f'DROP INDEX IF EXISTS ix_{table}_search_vector')
+            op.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
+        elif dialect == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f'DROP TRIGGER IF EXISTS {table}_fts_{suffix}')
+            op.execute(f'DROP TABLE IF EXISTS {table}_fts')
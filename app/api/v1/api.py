@@ -3,7 +3,7 @@
 from fastapi import APIRouter
 from app.core.users import fastapi_users
 from app.core.security import auth_backend
-from app.api.v1.endpoints import test, repair_requests, service_providers, services, auth, admin
+from app.api.v1.endpoints import test, repair_requests, service_providers, services, auth, admin, changes
 from app.schemas.user import UserRead, UserCreate, UserUpdate
 
 api_v1_router = APIRouter(prefix="/api/v1")
@@ -49,3 +49,8 @@ api_v1_router.include_router(
     prefix="/admin", 
     tags=["Admin"]
 )
+api_v1_router.include_router(
+    changes.router,
+    prefix="/changes",
+    tags=["Changes"]
+)
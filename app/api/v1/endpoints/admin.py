@@ -1,22 +1,41 @@
 """Admin endpoints for system management and analytics."""
 
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+import uuid
+from typing import List, Dict, Any, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, desc
 from sqlalchemy.orm import selectinload
 
+from app.core.changes import compact_change_log as compact_changes
+from app.core.config import settings
+from app.core.dashboard import read_counters, recompute_counters
+from app.core.events import change_bus
+from app.core.feeds import repair_request_feed
+from app.core import jobs
+from app.core.matching import rebuild_matches
+from app.core.shared_cache import shared_tier
+from app.core.singleflight import read_flight
+from app.core.response_cache import invalidate as invalidate_responses, response_cache
+from app.core.pagination import paginate, page_response
+from app.core.serialization import ModelSerializer
 from app.core.permissions import require_admin_role
-from app.database.session import get_db
+from app.database.session import get_db, get_pool_stats
+from app.models.jobs import Job
 from app.models.users import User
 from app.models.repair_requests import RepairRequest
 from app.models.service_providers import ServiceProvider
 from app.models.services import Service
+from app.schemas.page import Page
 from app.schemas.user import UserRead
+from app.users.dependencies import user_cache
+from app.users.passwords import password_hasher
 
 router = APIRouter()
 
+user_serializer = ModelSerializer(UserRead)
+
 
 @router.get("/analytics/dashboard")
 async def get_dashboard_analytics(
@@ -24,42 +43,9 @@ async def get_dashboard_analytics(
     session: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """Get dashboard analytics for admin panel."""
-    
-    # Total counts
-    total_users = await session.scalar(
-        select(func.count(User.id)).where(User.role == "user")
-    )
-    total_providers = await session.scalar(
-        select(func.count(User.id)).where(
-            User.role.in_(["provider_individual", "provider_organization"])
-        )
-    )
-    total_requests = await session.scalar(select(func.count(RepairRequest.id)))
-    total_services = await session.scalar(select(func.count(Service.id)))
-    
-    # Recent activity (last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    
-    new_users_30d = await session.scalar(
-        select(func.count(User.id)).where(
-            User.role == "user",
-            # Note: We'd need a created_at field on User for this to work properly
-        )
-    )
-    
-    new_requests_30d = await session.scalar(
-        select(func.count(RepairRequest.id)).where(
-            RepairRequest.created_at >= thirty_days_ago
-        )
-    )
-    
-    # User role distribution
-    user_roles = await session.execute(
-        select(User.role, func.count(User.id).label('count'))
-        .group_by(User.role)
-    )
-    role_distribution = {role: count for role, count in user_roles.all()}
-    
+    # Totals and distributions come from precomputed counters (app.core.dashboard)
+    counters = await read_counters(session)
+
     # Recent repair requests
     recent_requests = await session.execute(
         select(RepairRequest)
@@ -67,28 +53,22 @@ async def get_dashboard_analytics(
         .order_by(desc(RepairRequest.created_at))
         .limit(10)
     )
-    
-    # Service type distribution
-    service_types = await session.execute(
-        select(Service.service_type, func.count(Service.id).label('count'))
-        .group_by(Service.service_type)
-    )
-    service_distribution = {service_type: count for service_type, count in service_types.all()}
-    
+
     return {
         "totals": {
-            "users": total_users or 0,
-            "providers": total_providers or 0,
-            "repair_requests": total_requests or 0,
-            "services": total_services or 0,
+            "users": counters["users"],
+            "providers": counters["providers"],
+            "repair_requests": counters["repair_requests"],
+            "services": counters["services"],
         },
         "recent_activity": {
-            "new_users_30d": new_users_30d or 0,
-            "new_requests_30d": new_requests_30d or 0,
+            # Note: We'd need a created_at field on User to count new users properly
+            "new_users_30d": counters["users"],
+            "new_requests_30d": counters["new_requests_30d"],
         },
         "distributions": {
-            "user_roles": role_distribution,
-            "service_types": service_distribution,
+            "user_roles": counters["user_roles"],
+            "service_types": counters["service_types"],
         },
         "recent_requests": [
             {
@@ -103,21 +83,169 @@ async def get_dashboard_analytics(
     }
 
 
-@router.get("/users", response_model=List[UserRead])
+async def _enqueue(session: AsyncSession, task: str) -> JSONResponse:
+    job = await jobs.enqueue(session, task)
+    await session.commit()
+    return JSONResponse({"job_id": str(job.id)}, status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.post("/analytics/recompute")
+async def recompute_dashboard_analytics(
+    background: bool = False,
+    current_user: User = Depends(require_admin_role),
+    session: AsyncSession = Depends(get_db),
+) -> Dict[str, Any]:
+    """Rebuild the dashboard counters from the source tables (as a background job with ``background=true``)."""
+    if background:
+        return await _enqueue(session, "dashboard.recompute")
+    counters = await recompute_counters(session)
+    await session.commit()
+    return counters
+
+
+@router.post("/matching/rebuild")
+async def rebuild_match_index(
+    background: bool = False,
+    current_user: User = Depends(require_admin_role),
+    session: AsyncSession = Depends(get_db),
+) -> Dict[str, int]:
+    """Rebuild the provider match index from repair requests and services (as a background job with ``background=true``)."""
+    if background:
+        return await _enqueue(session, "matching.rebuild")
+    counts = await rebuild_matches(session)
+    await session.commit()
+    return counts
+
+
+@router.post("/changes/compact")
+async def compact_change_log(
+    background: bool = False,
+    current_user: User = Depends(require_admin_role),
+    session: AsyncSession = Depends(get_db),
+) -> Dict[str, int]:
+    """Drop superseded change log entries and deletions older than CHANGE_LOG_TOMBSTONE_DAYS
+    (as a background job with ``background=true``)."""
+    if background:
+        return await _enqueue(session, "changes.compact")
+    counts = await compact_changes(session, settings.CHANGE_LOG_TOMBSTONE_DAYS)
+    await session.commit()
+    return counts
+
+
+@router.get("/system/db-pool")
+async def get_db_pool_stats(
+    current_user: User = Depends(require_admin_role),
+) -> Dict[str, Any]:
+    """Get connection pool statistics for this worker process."""
+    return get_pool_stats()
+
+
+@router.get("/system/caches")
+async def get_cache_stats(
+    current_user: User = Depends(require_admin_role),
+) -> Dict[str, Any]:
+    """Get cache statistics for this worker process and its shared tier connection."""
+    return {"users": user_cache.stats(), "responses": response_cache.stats(), "shared": shared_tier.stats()}
+
+
+@router.get("/system/single-flight")
+async def get_single_flight_stats(
+    current_user: User = Depends(require_admin_role),
+) -> Dict[str, Any]:
+    """Get read coalescing statistics for this worker process."""
+    return read_flight.stats()
+
+
+@router.get("/system/events")
+async def get_change_event_stats(
+    current_user: User = Depends(require_admin_role),
+) -> Dict[str, Any]:
+    """Get change event bus statistics for this worker process."""
+    return change_bus.stats()
+
+
+@router.get("/system/streams")
+async def get_stream_stats(
+    current_user: User = Depends(require_admin_role),
+) -> Dict[str, Any]:
+    """Get server-sent event stream statistics for this worker process."""
+    return {"repair_requests": repair_request_feed.stats()}
+
+
+@router.get("/system/jobs")
+async def get_job_stats(
+    current_user: User = Depends(require_admin_role),
+    session: AsyncSession = Depends(get_db),
+) -> Dict[str, Any]:
+    """Get background job queue depths, and this worker process's job counts and latencies."""
+    return {
+        "queues": await jobs.queue_depths(session),
+        "worker": jobs.job_worker.stats() if jobs.job_worker else None,
+    }
+
+
+@router.get("/jobs/dead")
+async def list_dead_jobs(
+    limit: int = 50,
+    current_user: User = Depends(require_admin_role),
+    session: AsyncSession = Depends(get_db),
+) -> List[Dict[str, Any]]:
+    """List dead-lettered jobs, most recently created first, with their last error."""
+    result = await session.execute(
+        select(Job).where(Job.status == jobs.DEAD).order_by(desc(Job.created_at)).limit(min(limit, 500))
+    )
+    return [
+        {
+            "id": str(job.id),
+            "queue": job.queue,
+            "task": job.task,
+            "payload": job.payload,
+            "attempts": job.attempts,
+            "created_at": job.created_at.isoformat(),
+            "last_error": job.last_error,
+        }
+        for job in result.scalars()
+    ]
+
+
+@router.post("/jobs/{job_id}/retry", status_code=status.HTTP_202_ACCEPTED)
+async def retry_dead_job(
+    job_id: uuid.UUID,
+    current_user: User = Depends(require_admin_role),
+    session: AsyncSession = Depends(get_db),
+) -> Dict[str, str]:
+    """Queue a dead-lettered job again with a fresh set of attempts."""
+    if not await jobs.retry_dead_job(session, job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dead job not found"
+        )
+    await session.commit()
+    return {"job_id": str(job_id)}
+
+
+@router.get("/system/password-hashing")
+async def get_password_hashing_stats(
+    current_user: User = Depends(require_admin_role),
+) -> Dict[str, Any]:
+    """Get password hashing executor statistics for this worker process."""
+    return password_hasher.stats()
+
+
+@router.get("/users", response_model=Union[List[UserRead], Page[UserRead]])
 async def get_all_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(require_admin_role),
     session: AsyncSession = Depends(get_db),
-) -> List[User]:
+):
     """Get all users for admin management."""
-    result = await session.execute(
-        select(User)
-        .offset(skip)
-        .limit(limit)
-        .order_by(desc(User.email))
+    items, next_cursor = await paginate(
+        session, select(User), User.email, User.id, cursor=cursor, skip=skip, limit=limit
     )
-    return result.scalars().all()
+    return page_response(response, items, next_cursor, cursor, user_serializer)
 
 
 @router.put("/users/{user_id}/role")
@@ -149,6 +277,8 @@ async def update_user_role(
     # Update role
     user.role = new_role
     await session.commit()
+    await user_cache.invalidate(user.id)
+    await invalidate_responses("users")
     
     return {"message": f"User role updated to {new_role}"}
 
@@ -178,26 +308,32 @@ async def delete_user(
     
     await session.delete(user)
     await session.commit()
+    await user_cache.invalidate(user.id)
+    await invalidate_responses("users", "services", "service_providers")
     
     return {"message": "User deleted successfully"}
 
 
 @router.get("/repair-requests")
 async def get_all_repair_requests(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(require_admin_role),
     session: AsyncSession = Depends(get_db),
 ):
     """Get all repair requests for admin management."""
-    result = await session.execute(
-        select(RepairRequest)
-        .options(selectinload(RepairRequest.user))
-        .offset(skip)
-        .limit(limit)
-        .order_by(desc(RepairRequest.created_at))
+    items, next_cursor = await paginate(
+        session,
+        select(RepairRequest).options(selectinload(RepairRequest.user)),
+        RepairRequest.created_at,
+        RepairRequest.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
     )
-    return result.scalars().all()
+    return page_response(response, items, next_cursor, cursor)
 
 
 @router.delete("/repair-requests/{request_id}")
@@ -226,20 +362,24 @@ async def delete_repair_request(
 
 @router.get("/services")
 async def get_all_services(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(require_admin_role),
     session: AsyncSession = Depends(get_db),
 ):
     """Get all services for admin management."""
-    result = await session.execute(
-        select(Service)
-        .options(selectinload(Service.provider))
-        .offset(skip)
-        .limit(limit)
-        .order_by(desc(Service.created_at))
+    items, next_cursor = await paginate(
+        session,
+        select(Service).options(selectinload(Service.provider)),
+        Service.created_at,
+        Service.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
     )
-    return result.scalars().all()
+    return page_response(response, items, next_cursor, cursor)
 
 
 @router.delete("/services/{service_id}")
@@ -260,5 +400,6 @@ async def delete_service(
     
     await session.delete(service)
     await session.commit()
+    await invalidate_responses("services")
     
     return {"message": "Service deleted successfully"}
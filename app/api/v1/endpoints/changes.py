@@ -0,0 +1,109 @@
+"""Incremental sync: repair requests, services and providers changed since a cursor."""
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.changes import ENTITY_MODELS, changes_since, compacted_seq, latest_seq
+from app.core.permissions import PROVIDER_ROLES, Principal, require_any_authenticated_claims
+from app.core.serialization import ModelSerializer
+from app.database.session import get_db
+from app.models.change_log import ChangeLogEntry
+from app.models.user_roles import UserRole
+from app.schemas.repair_request import RepairRequest as RepairRequestSchema
+from app.schemas.service import Service as ServiceSchema
+from app.schemas.service_provider import ServiceProvider as ServiceProviderSchema
+
+router = APIRouter()
+
+MAX_LIMIT = 1000
+
+# Payloads are flat: owners are referenced by id, not embedded
+payload_serializers = {
+    "repair_request": ModelSerializer(RepairRequestSchema).without("user"),
+    "service": ModelSerializer(ServiceSchema).without("provider"),
+    "provider": ModelSerializer(ServiceProviderSchema),
+}
+
+
+def _visible(principal: Principal) -> tuple:
+    """What each role can list: providers see every request, users every service and provider."""
+    if principal.role == UserRole.ADMIN:
+        return ()
+    own = ChangeLogEntry.owner_id == principal.id
+    if principal.role in PROVIDER_ROLES:
+        return (or_(ChangeLogEntry.entity == "repair_request", own),)
+    return (or_(ChangeLogEntry.entity != "repair_request", own),)
+
+
+async def _payloads(session: AsyncSession, entries: List[ChangeLogEntry]) -> Dict[Any, Dict[str, Any]]:
+    """Current representation of every row in ``entries`` that still exists, by (entity, id)."""
+    wanted: Dict[str, set] = {}
+    for entry in entries:
+        if entry.action != "deleted":
+            wanted.setdefault(entry.entity, set()).add(entry.entity_id)
+    payloads = {}
+    for entity, ids in wanted.items():
+        model = ENTITY_MODELS[entity]
+        serializer = payload_serializers[entity]
+        result = await session.execute(select(model).where(model.id.in_(ids)))
+        for row in result.scalars():
+            payloads[entity, row.id] = serializer(row)
+    return payloads
+
+
+@router.get("/")
+async def get_changes(
+    since: Optional[str] = None,
+    limit: int = 500,
+    current_user: Principal = Depends(require_any_authenticated_claims),
+    session: AsyncSession = Depends(get_db),
+):
+    """Get the repair requests, services and providers changed after ``since``, oldest change first.
+
+    Each change has the row's ``entity``, ``id``, ``action`` (``created``,
+    ``updated`` or ``deleted``) and its current ``data`` (null once deleted).
+    A row changed several times may appear once, with its latest action.
+    Pass ``next_cursor`` back as ``since`` until ``has_more`` is false; omit
+    ``since`` for everything. A 410 means the cursor predates log compaction
+    and the client must sync from scratch.
+    """
+    start = 0
+    if since:
+        try:
+            start = int(since)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid change cursor"
+            )
+        if start < await compacted_seq(session):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Change cursor has expired; sync from scratch without since"
+            )
+
+    # Every sequence number up to ``latest`` is committed, so a short page can skip to it
+    latest = await latest_seq(session)
+    entries, has_more = await changes_since(session, start, max(1, min(limit, MAX_LIMIT)), *_visible(current_user))
+    payloads = await _payloads(session, entries)
+    position = entries[-1].seq if entries else start
+    if not has_more:
+        position = max(position, latest)
+    return ORJSONResponse({
+        "changes": [
+            {
+                "seq": entry.seq,
+                "entity": entry.entity,
+                "id": entry.entity_id,
+                "action": entry.action,
+                "data": payloads.get((entry.entity, entry.entity_id)),
+            }
+            for entry in entries
+        ],
+        "next_cursor": str(position),
+        "has_more": has_more,
+    })
@@ -1,33 +1,59 @@
 """RepairRequest endpoints with role-based access control."""
 
 import uuid
-from typing import List
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response, status, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from app.core.permissions import require_user_role, require_provider_role
+from app.core.permissions import (
+    Principal,
+    require_provider_claims,
+    require_provider_role,
+    require_user_claims,
+    require_user_role,
+)
+from app.core.audio import RENDITION_MEDIA_TYPE, rendition_path
+from app.core.config import settings
+from app.core.compound import Embedded, wants_compound
+from app.core.etags import check_etag
+from app.core.feeds import repair_request_feed
+from app.core.fieldsets import parse_fields, sparse_options, sparse_response
+from app.core.jobs import enqueue
+from app.core.files import serve_file
+from app.core.pagination import annotated_response, paginate, page_response, search_response
+from app.core.serialization import ModelSerializer
+from app.core.similarity import service_similarity
+from app.core.singleflight import coalesce
 from app.database.session import get_db
+from app.core.uploads import save_upload
+from app.database.geo import check_location
 from app.core.users import current_active_user
 from app.models.users import User
-from app.models.repair_requests import RepairRequest
+from app.models.matching import RepairRequestMatch
+from app.models.repair_requests import RepairRequest, repair_request_search
+from app.models.services import Service
 from app.schemas.repair_request import (
     RepairRequestCreate,
     RepairRequestUpdate,
     RepairRequest as RepairRequestSchema,
 )
+from app.schemas.page import Page
+from app.schemas.service import Service as ServiceSchema
 
-import os
-import aiofiles
 from pathlib import Path
 
 router = APIRouter()
 
+repair_request_serializer = ModelSerializer(RepairRequestSchema)
+request_owners = Embedded("user", "user_id", "users")
+service_serializer = ModelSerializer(ServiceSchema)
+
 # Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("uploads/voices")
+UPLOAD_DIR = Path(settings.UPLOAD_DIR)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
@@ -35,6 +61,8 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 async def create_repair_request(
     title: str = Form(...),
     description: str = Form(None),
+    latitude: float = Form(None),
+    longitude: float = Form(None),
     voice_file: UploadFile = File(None),
     current_user: User = Depends(require_user_role),
     session: AsyncSession = Depends(get_db),
@@ -46,8 +74,10 @@ async def create_repair_request(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Either description or voice file must be provided"
         )
+    check_location(latitude, longitude)
 
     voice_file_path = None
+    voice_file_sha256 = None
     if voice_file:
         # Validate file type
         if not voice_file.content_type or not voice_file.content_type.startswith(('audio/', 'application/octet-stream')):
@@ -62,10 +92,13 @@ async def create_repair_request(
         unique_filename = f"{uuid.uuid4()}.{file_extension}"
         voice_file_path = UPLOAD_DIR / unique_filename
 
-        # Save file
-        async with aiofiles.open(voice_file_path, 'wb') as f:
-            content = await voice_file.read()
-            await f.write(content)
+        # Stream to disk in chunks, hashing as we go
+        _, voice_file_sha256 = await save_upload(
+            voice_file,
+            voice_file_path,
+            max_bytes=settings.VOICE_UPLOAD_MAX_BYTES,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        )
 
         voice_file_path = str(voice_file_path)
 
@@ -73,75 +106,222 @@ async def create_repair_request(
         title=title,
         description=description,
         voice_file=voice_file_path,
+        voice_file_sha256=voice_file_sha256,
+        latitude=latitude,
+        longitude=longitude,
         user_id=current_user.id,
     )
     session.add(repair_request)
-    await session.commit()
+    try:
+        if voice_file_path:
+            # Transcode and draw the waveform after the response; the job commits with the request
+            await session.flush()
+            await enqueue(session, "voice.transcode", {"repair_request_id": str(repair_request.id)})
+        await session.commit()
+    except Exception:
+        # Don't leave an orphaned upload behind
+        if voice_file_path:
+            Path(voice_file_path).unlink(missing_ok=True)
+        raise
     await session.refresh(repair_request)
     return repair_request
 
 
-@router.get("/", response_model=List[RepairRequestSchema])
+@router.get("/", response_model=Union[List[RepairRequestSchema], Page[RepairRequestSchema]])
 async def get_repair_requests(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(require_provider_role),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    q: Optional[str] = None,
+    current_user: Principal = Depends(require_provider_claims),
     session: AsyncSession = Depends(get_db),
-) -> List[RepairRequestSchema]:
-    """Get all repair requests (Providers only)."""
-    result = await session.execute(
-        select(RepairRequest)
-        .options(selectinload(RepairRequest.user))
-        .offset(skip)
-        .limit(limit)
-        .order_by(RepairRequest.created_at.desc())
-    )
-    return result.scalars().all()
+):
+    """Get all repair requests (Providers only).
 
+    With ``q``, only matching requests are returned, best match first, each
+    with a ``rank`` and a highlighted ``snippet``.
+    """
+    selection = parse_fields(fields, RepairRequestSchema)
+    if q is not None and cursor is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search results are ranked; page them with skip and limit"
+        )
 
-@router.get("/my-requests", response_model=List[RepairRequestSchema])
+    async def render():
+        await check_etag(request, response, session, ("repair_requests", "users"))
+        statement = select(RepairRequest).options(
+            *sparse_options(RepairRequest, selection, ["user"], always=[RepairRequest.created_at])
+        )
+        if q is not None:
+            results = await repair_request_search.search(session, statement, q, skip=skip, limit=limit)
+            return search_response(response, results, repair_request_serializer.only(selection))
+        items, next_cursor = await paginate(
+            session,
+            statement,
+            RepairRequest.created_at,
+            RepairRequest.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+        return page_response(
+            response,
+            items,
+            next_cursor,
+            cursor,
+            repair_request_serializer.only(selection),
+            request_owners if wants_compound(request, response) else None,
+        )
+
+    # Every provider sees the same list, so identical concurrent polls share one query
+    return await coalesce(request, render)
+
+
+@router.get("/my-requests", response_model=Union[List[RepairRequestSchema], Page[RepairRequestSchema]])
 async def get_my_repair_requests(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(require_user_role),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(require_user_claims),
     session: AsyncSession = Depends(get_db),
-) -> List[RepairRequestSchema]:
+):
     """Get current user's repair requests (Users only)."""
-    result = await session.execute(
+    selection = parse_fields(fields, RepairRequestSchema)
+    await check_etag(request, response, session, ("repair_requests", "users"), scope=current_user.id)
+    items, next_cursor = await paginate(
+        session,
         select(RepairRequest)
-        .options(selectinload(RepairRequest.user))
-        .where(RepairRequest.user_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
-        .order_by(RepairRequest.created_at.desc())
+        .options(*sparse_options(RepairRequest, selection, ["user"], always=[RepairRequest.created_at]))
+        .where(RepairRequest.user_id == current_user.id),
+        RepairRequest.created_at,
+        RepairRequest.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
+    return page_response(
+        response,
+        items,
+        next_cursor,
+        cursor,
+        repair_request_serializer.only(selection),
+        request_owners if wants_compound(request, response) else None,
+    )
+
+
+@router.get("/matched", response_model=Union[List[RepairRequestSchema], Page[RepairRequestSchema]])
+async def get_matched_repair_requests(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(require_provider_claims),
+    session: AsyncSession = Depends(get_db),
+):
+    """Get repair requests matching the current provider's services, best match first (Providers only).
+
+    Each request carries a ``match_score``; requests sharing no terms with
+    the provider's services are left out. Scores are precomputed as
+    requests and services are written (see ``app.core.matching``).
+    """
+    await check_etag(request, response, session, ("repair_requests", "services", "users"), scope=current_user.id)
+    matches, next_cursor = await paginate(
+        session,
+        select(RepairRequestMatch)
+        .options(selectinload(RepairRequestMatch.repair_request).selectinload(RepairRequest.user))
+        .where(RepairRequestMatch.provider_id == current_user.id),
+        RepairRequestMatch.score,
+        RepairRequestMatch.repair_request_id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
+    return annotated_response(
+        response,
+        [(match.repair_request, {"match_score": match.score}) for match in matches],
+        repair_request_serializer,
+        next_cursor,
+        cursor,
+    )
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_repair_requests(
+    last_event_id: Optional[str] = Header(None),
+    current_user: User = Depends(require_provider_role),
+    session: AsyncSession = Depends(get_db),
+):
+    """Push new repair requests as server-sent events (Providers only).
+
+    Each ``repair_request`` event carries the request's summary and its id as
+    the event id. Reconnect with ``Last-Event-ID`` to replay what was missed;
+    a ``reset`` event means the client should refetch the list instead.
+    """
+    # The stream can stay open for hours: hand the connection back to the pool now
+    await session.close()
+    subscription = repair_request_feed.subscribe(last_event_id)
+    return StreamingResponse(
+        repair_request_feed.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return result.scalars().all()
 
 
-@router.get("/voice/{filename}")
+@router.api_route("/voice/{filename}", methods=["GET", "HEAD"])
 async def get_voice_file(
     filename: str,
-    current_user: User = Depends(require_provider_role),
+    request: Request,
+    original: bool = False,
+    current_user: Principal = Depends(require_provider_claims),
 ):
-    """Serve voice files (Providers only)."""
+    """Serve voice files (Providers only) with Range and conditional GET support.
+
+    Serves the compact Opus rendition once it has been made, unless
+    ``original=true`` asks for the upload as it was sent.
+    """
     file_path = UPLOAD_DIR / filename
-    if not file_path.exists():
+    if filename != Path(filename).name or not file_path.is_file():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Voice file not found"
         )
-    return FileResponse(file_path)
+    media_type = None
+    accel_location = settings.VOICE_FILE_ACCEL_LOCATION
+    rendition = rendition_path(UPLOAD_DIR, filename)
+    if not original and rendition.is_file():
+        file_path, media_type = rendition, RENDITION_MEDIA_TYPE
+        accel_location = f"{accel_location.rstrip('/')}/{rendition.parent.name}"
+    return serve_file(
+        request,
+        file_path,
+        media_type=media_type,
+        sendfile_mode=settings.VOICE_FILE_SENDFILE,
+        accel_location=accel_location,
+    )
 
 
 @router.get("/{repair_request_id}", response_model=RepairRequestSchema)
 async def get_repair_request(
     repair_request_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
     session: AsyncSession = Depends(get_db),
 ) -> RepairRequestSchema:
     """Get a single repair request by ID."""
+    selection = parse_fields(fields, RepairRequestSchema)
+    await check_etag(request, response, session, ("repair_requests", "users"))
     result = await session.execute(
         select(RepairRequest)
-        .options(selectinload(RepairRequest.user))
+        .options(*sparse_options(RepairRequest, selection, ["user"]))
         .where(RepairRequest.id == repair_request_id)
     )
     repair_request = result.scalar_one_or_none()
@@ -152,7 +332,55 @@ async def get_repair_request(
             detail="Repair request not found"
         )
 
-    return repair_request
+    return sparse_response(response, repair_request, repair_request_serializer, selection)
+
+
+@router.get("/{repair_request_id}/services", response_model=List[ServiceSchema])
+async def get_similar_services(
+    repair_request_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    limit: int = 10,
+    current_user: Principal = Depends(require_user_claims),
+    session: AsyncSession = Depends(get_db),
+):
+    """Get the services most similar to one of the current user's repair requests (Users only).
+
+    Each service carries a ``similarity`` (cosine, 0..1). Similarity works on
+    related words as well as shared ones (see ``app.core.similarity``).
+    """
+    await check_etag(request, response, session, ("repair_requests", "services", "users"), scope=current_user.id)
+    repair_request = await session.get(RepairRequest, repair_request_id)
+    if not repair_request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Repair request not found"
+        )
+    if repair_request.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view this repair request"
+        )
+
+    (ranked,) = await service_similarity.similar_services(session, [repair_request], limit)
+    services = {}
+    if ranked:
+        result = await session.execute(
+            select(Service)
+            .options(selectinload(Service.provider))
+            .where(Service.id.in_([service_id for service_id, _ in ranked]))
+        )
+        services = {service.id: service for service in result.scalars()}
+    # A service deleted since the snapshot was built is skipped
+    return annotated_response(
+        response,
+        [
+            (services[service_id], {"similarity": round(score, 4)})
+            for service_id, score in ranked
+            if service_id in services
+        ],
+        service_serializer,
+    )
 
 
 @router.put("/{repair_request_id}", response_model=RepairRequestSchema)
@@ -183,6 +411,7 @@ async def update_repair_request(
     update_data = repair_request_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(repair_request, field, value)
+    check_location(repair_request.latitude, repair_request.longitude)
 
     await session.commit()
     await session.refresh(repair_request)
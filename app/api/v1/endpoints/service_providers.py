@@ -1,25 +1,52 @@
 """ServiceProvider endpoints with role-based access control."""
 
 import uuid
-from typing import List
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
-from app.core.permissions import require_provider_role, require_user_role, require_any_authenticated_user
+from app.core.permissions import (
+    Principal,
+    require_any_authenticated_claims,
+    require_provider_claims,
+    require_provider_role,
+    require_user_claims,
+)
+from app.core.etags import check_etag
+from app.core.fieldsets import parse_fields, sparse_options, sparse_response
+from app.core.response_cache import cache_response, cached_response, invalidate as invalidate_responses
+from app.core.pagination import paginate, page_response
+from app.core.serialization import ModelSerializer
+from app.core.singleflight import coalesce
+from app.database.geo import check_location
 from app.database.session import get_db
+from app.models.repair_requests import RepairRequest
 from app.models.users import User
-from app.models.service_providers import ServiceProvider
+from app.models.service_providers import ServiceProvider, provider_locations
 from app.schemas.service_provider import (
+    NearbyServiceProvider,
     ServiceProviderCreate,
     ServiceProviderUpdate,
     ServiceProvider as ServiceProviderSchema,
 )
+from app.schemas.page import Page
 
 router = APIRouter()
 
+service_provider_serializer = ModelSerializer(ServiceProviderSchema)
+
+
+def _check_provider_location(service_provider: ServiceProvider) -> None:
+    check_location(service_provider.latitude, service_provider.longitude)
+    if service_provider.service_radius_km is not None and service_provider.service_radius_km <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Service radius must be greater than 0"
+        )
+
 
 @router.post("/", response_model=ServiceProviderSchema, status_code=status.HTTP_201_CREATED)
 async def create_service_provider(
@@ -33,42 +60,144 @@ async def create_service_provider(
         service_type=service_provider_in.service_type,
         description=service_provider_in.description,
         contact_info=service_provider_in.contact_info,
+        latitude=service_provider_in.latitude,
+        longitude=service_provider_in.longitude,
+        service_radius_km=service_provider_in.service_radius_km,
         user_id=current_user.id,
     )
+    _check_provider_location(service_provider)
     session.add(service_provider)
     await session.commit()
+    await invalidate_responses("service_providers")
     await session.refresh(service_provider)
     return service_provider
 
 
-@router.get("/", response_model=List[ServiceProviderSchema])
+@router.get("/", response_model=Union[List[ServiceProviderSchema], Page[ServiceProviderSchema]])
 async def get_service_providers(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(require_user_role),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(require_user_claims),
     session: AsyncSession = Depends(get_db),
-) -> List[ServiceProvider]:
+):
     """Get all service providers (Users only - for browsing)."""
-    result = await session.execute(
-        select(ServiceProvider)
-        .options(selectinload(ServiceProvider.user))
-        .offset(skip)
-        .limit(limit)
-        .order_by(ServiceProvider.created_at.desc())
-    )
-    return result.scalars().all()
+    cached = await cached_response(request)
+    if cached is not None:
+        return cached
+    selection = parse_fields(fields, ServiceProviderSchema)
+
+    async def render():
+        await check_etag(request, response, session, ("service_providers",))
+        items, next_cursor = await paginate(
+            session,
+            select(ServiceProvider).options(
+                *sparse_options(ServiceProvider, selection, ["user"], always=[ServiceProvider.created_at])
+            ),
+            ServiceProvider.created_at,
+            ServiceProvider.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+        return await cache_response(
+            request,
+            page_response(response, items, next_cursor, cursor, service_provider_serializer.only(selection)),
+            ("service_providers",),
+        )
+
+    return await coalesce(request, render)
+
+
+@router.get("/nearby", response_model=List[NearbyServiceProvider])
+async def get_nearby_service_providers(
+    request: Request,
+    response: Response,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    repair_request_id: Optional[uuid.UUID] = None,
+    radius_km: float = 10.0,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(require_user_claims),
+    session: AsyncSession = Depends(get_db),
+):
+    """Get service providers within ``radius_km`` of a location, nearest first (Users only).
+
+    The location is ``latitude``/``longitude`` or one of the caller's repair
+    requests. Each provider carries its ``distance_km`` and whether the
+    location is within its own service radius.
+    """
+    if repair_request_id is not None:
+        result = await session.execute(
+            select(RepairRequest.user_id, RepairRequest.latitude, RepairRequest.longitude)
+            .where(RepairRequest.id == repair_request_id)
+        )
+        location = result.one_or_none()
+        if location is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Repair request not found"
+            )
+        if location.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions to use this repair request"
+            )
+        latitude, longitude = location.latitude, location.longitude
+        if latitude is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Repair request has no location"
+            )
+    if latitude is None or longitude is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give latitude and longitude or repair_request_id"
+        )
+    check_location(latitude, longitude)
+
+    tables = ("service_providers", "repair_requests") if repair_request_id else ("service_providers",)
+    await check_etag(request, response, session, tables)
+    nearest = await provider_locations.within(session, latitude, longitude, radius_km, limit)
+    providers = {}
+    if nearest:
+        result = await session.execute(
+            select(ServiceProvider).where(ServiceProvider.id.in_([provider_id for provider_id, _ in nearest]))
+        )
+        providers = {provider.id: provider for provider in result.scalars()}
+
+    items = []
+    for provider_id, distance in nearest:
+        provider = providers.get(provider_id)
+        if provider is None:
+            continue  # deleted since the lookup
+        item = service_provider_serializer(provider)
+        item["distance_km"] = round(distance, 3)
+        radius = provider.service_radius_km
+        item["serves_location"] = None if radius is None else distance <= radius
+        items.append(item)
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return ORJSONResponse(items, headers=headers)
 
 
 @router.get("/{service_provider_id}", response_model=ServiceProviderSchema)
 async def get_service_provider(
     service_provider_id: uuid.UUID,
-    current_user: User = Depends(require_any_authenticated_user),
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(require_any_authenticated_claims),
     session: AsyncSession = Depends(get_db),
 ) -> ServiceProvider:
     """Get a single service provider by ID (Any authenticated user)."""
+    selection = parse_fields(fields, ServiceProviderSchema)
+    await check_etag(request, response, session, ("service_providers",))
     result = await session.execute(
         select(ServiceProvider)
-        .options(selectinload(ServiceProvider.user))
+        .options(*sparse_options(ServiceProvider, selection, ["user"]))
         .where(ServiceProvider.id == service_provider_id)
     )
     service_provider = result.scalar_one_or_none()
@@ -79,7 +208,7 @@ async def get_service_provider(
             detail="Service provider not found"
         )
 
-    return service_provider
+    return sparse_response(response, service_provider, service_provider_serializer, selection)
 
 
 @router.put("/{service_provider_id}", response_model=ServiceProviderSchema)
@@ -111,8 +240,10 @@ async def update_service_provider(
     update_data = service_provider_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(service_provider, field, value)
+    _check_provider_location(service_provider)
 
     await session.commit()
+    await invalidate_responses("service_providers")
     await session.refresh(service_provider)
     return service_provider
 
@@ -144,11 +275,12 @@ async def delete_service_provider(
 
     await session.delete(service_provider)
     await session.commit()
+    await invalidate_responses("service_providers")
 
 
 @router.get("/my/providers", response_model=List[ServiceProviderSchema])
 async def get_my_service_providers(
-    current_user: User = Depends(require_provider_role),
+    current_user: Principal = Depends(require_provider_claims),
     session: AsyncSession = Depends(get_db),
 ) -> List[ServiceProvider]:
     """Get current provider's service provider listings."""
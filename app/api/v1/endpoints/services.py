@@ -1,25 +1,41 @@
 """Service endpoints with role-based access control."""
 
 import uuid
-from typing import List
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from app.core.permissions import require_user_role, require_provider_role
+from app.core.permissions import (
+    Principal,
+    require_provider_claims,
+    require_provider_role,
+    require_user_claims,
+)
+from app.core.compound import Embedded, wants_compound
+from app.core.etags import check_etag
+from app.core.fieldsets import parse_fields, sparse_options, sparse_response
+from app.core.response_cache import cache_response, cached_response, invalidate as invalidate_responses
+from app.core.pagination import paginate, page_response, search_response
+from app.core.serialization import ModelSerializer
+from app.core.singleflight import coalesce
 from app.database.session import get_db
 from app.models.users import User
-from app.models.services import Service
+from app.models.services import Service, service_search
 from app.schemas.service import (
     ServiceCreate,
     ServiceUpdate,
     Service as ServiceSchema,
 )
+from app.schemas.page import Page
 
 router = APIRouter()
 
+service_serializer = ModelSerializer(ServiceSchema)
+service_providers = Embedded("provider", "provider_id", "users")
+
 
 @router.post("/", response_model=ServiceSchema, status_code=status.HTTP_201_CREATED)
 async def create_service(
@@ -37,38 +53,90 @@ async def create_service(
     )
     session.add(service)
     await session.commit()
+    await invalidate_responses("services")
     await session.refresh(service)
     return service
 
 
-@router.get("/", response_model=List[ServiceSchema])
+@router.get("/", response_model=Union[List[ServiceSchema], Page[ServiceSchema]])
 async def get_services(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(require_user_role),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    q: Optional[str] = None,
+    current_user: Principal = Depends(require_user_claims),
     session: AsyncSession = Depends(get_db),
-) -> List[Service]:
-    """Get all services (Users only)."""
-    result = await session.execute(
-        select(Service)
-        .options(selectinload(Service.provider))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Service.created_at.desc())
-    )
-    return result.scalars().all()
+):
+    """Get all services (Users only).
+
+    With ``q``, only matching services are returned, best match first, each
+    with a ``rank`` and a highlighted ``snippet``.
+    """
+    cached = await cached_response(request)
+    if cached is not None:
+        return cached
+    selection = parse_fields(fields, ServiceSchema)
+    if q is not None and cursor is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search results are ranked; page them with skip and limit"
+        )
+
+    async def render():
+        await check_etag(request, response, session, ("services", "users"))
+        statement = select(Service).options(
+            *sparse_options(Service, selection, ["provider"], always=[Service.created_at])
+        )
+        if q is not None:
+            results = await service_search.search(session, statement, q, skip=skip, limit=limit)
+            return await cache_response(
+                request,
+                search_response(response, results, service_serializer.only(selection)),
+                ("services", "users"),
+            )
+        items, next_cursor = await paginate(
+            session,
+            statement,
+            Service.created_at,
+            Service.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+        return await cache_response(
+            request,
+            page_response(
+                response,
+                items,
+                next_cursor,
+                cursor,
+                service_serializer.only(selection),
+                service_providers if wants_compound(request, response) else None,
+            ),
+            ("services", "users"),
+        )
+
+    return await coalesce(request, render)
 
 
 @router.get("/{service_id}", response_model=ServiceSchema)
 async def get_service(
     service_id: uuid.UUID,
-    current_user: User = Depends(require_user_role),
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(require_user_claims),
     session: AsyncSession = Depends(get_db),
 ) -> Service:
     """Get a single service by ID (Users only)."""
+    selection = parse_fields(fields, ServiceSchema)
+    await check_etag(request, response, session, ("services", "users"))
     result = await session.execute(
         select(Service)
-        .options(selectinload(Service.provider))
+        .options(*sparse_options(Service, selection, ["provider"]))
         .where(Service.id == service_id)
     )
     service = result.scalar_one_or_none()
@@ -79,7 +147,7 @@ async def get_service(
             detail="Service not found"
         )
     
-    return service
+    return sparse_response(response, service, service_serializer, selection)
 
 
 @router.put("/{service_id}", response_model=ServiceSchema)
@@ -113,6 +181,7 @@ async def update_service(
         setattr(service, field, value)
     
     await session.commit()
+    await invalidate_responses("services")
     await session.refresh(service)
     return service
 
@@ -143,16 +212,18 @@ async def delete_service(
     
     await session.delete(service)
     await session.commit()
+    await invalidate_responses("services")
 
 
 @router.get("/my/services", response_model=List[ServiceSchema])
 async def get_my_services(
-    current_user: User = Depends(require_provider_role),
+    current_user: Principal = Depends(require_provider_claims),
     session: AsyncSession = Depends(get_db),
 ) -> List[Service]:
     """Get current provider's services."""
     result = await session.execute(
         select(Service)
+        .options(selectinload(Service.provider))
         .where(Service.provider_id == current_user.id)
         .order_by(Service.created_at.desc())
     )
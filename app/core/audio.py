@@ -0,0 +1,128 @@
+"""Voice file renditions and waveforms, computed in a process pool.
+
+Uploads are kept as the browser produced them. After upload a
+``voice.transcode`` job (``app.core.tasks``) runs ``process_voice`` in a
+process pool. One ffmpeg pass writes a mono Opus/OGG rendition to the
+``renditions`` directory beside the uploads, and pipes low-rate PCM back
+for the duration and a downsampled peaks array, so the UI can draw the
+waveform without fetching the audio.
+
+Without ffmpeg only PCM WAV uploads can be analysed (with the standard
+``wave`` module), and they get no rendition; anything else fails the job,
+which retries and eventually dead-letters until ffmpeg is installed.
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+# Sample rate the waveform is computed from: plenty for peaks, cheap to pipe
+ANALYSIS_RATE = 8000
+RENDITION_SUFFIX = ".opus"
+RENDITION_MEDIA_TYPE = "audio/ogg; codecs=opus"
+
+
+def rendition_path(upload_dir: Path, voice_file: str) -> Path:
+    """Where the compact rendition of the upload ``voice_file`` lives."""
+    return upload_dir / "renditions" / f"{Path(voice_file).stem}{RENDITION_SUFFIX}"
+
+
+def waveform_peaks(samples: np.ndarray, count: int) -> List[float]:
+    """Peak amplitude (0..1 of full scale) of ``count`` equal slices of mono float ``samples``."""
+    if samples.size == 0:
+        return []
+    slices = np.array_split(np.abs(samples), min(count, samples.size))
+    return [round(float(part.max()), 3) for part in slices]
+
+
+def _read_wav(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as audio:
+        width, channels, rate = audio.getsampwidth(), audio.getnchannels(), audio.getframerate()
+        frames = audio.readframes(audio.getnframes())
+    if width == 1:
+        samples = (np.frombuffer(frames, np.uint8).astype(np.float32) - 128) / 128
+    elif width in (2, 4):
+        dtype = np.int16 if width == 2 else np.int32
+        samples = np.frombuffer(frames, dtype).astype(np.float32) / np.iinfo(dtype).max
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+    samples = samples.reshape(-1, channels).mean(axis=1)
+    # Same rate as the ffmpeg path, so durations and peaks agree
+    if rate != ANALYSIS_RATE and samples.size:
+        positions = np.arange(0, samples.size, rate / ANALYSIS_RATE)
+        samples = np.interp(positions, np.arange(samples.size), samples)
+    return samples
+
+
+def _transcode(ffmpeg: str, source: str, rendition: str, bitrate: str) -> np.ndarray:
+    """Write the Opus rendition and return the audio as mono float samples at ``ANALYSIS_RATE``."""
+    partial = f"{rendition}.partial"
+    command = [
+        ffmpeg, "-nostdin", "-v", "error", "-y", "-i", source,
+        "-map", "0:a:0", "-ac", "1", "-c:a", "libopus", "-b:a", bitrate, "-application", "voip",
+        "-f", "ogg", partial,
+        "-map", "0:a:0", "-ac", "1", "-ar", str(ANALYSIS_RATE), "-f", "s16le", "pipe:1",
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, check=False)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {result.stderr.decode(errors='replace').strip()}")
+        # Readers never see a half-written rendition
+        os.replace(partial, rendition)
+    finally:
+        Path(partial).unlink(missing_ok=True)
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32767
+
+
+def process_voice(source: str, rendition: str, ffmpeg: str, bitrate: str, peaks: int) -> Dict[str, Any]:
+    """Transcode and analyse one upload; returns its duration, peaks and rendition (path and size)."""
+    ffmpeg_path = shutil.which(ffmpeg)
+    made: Optional[str] = None
+    if ffmpeg_path:
+        Path(rendition).parent.mkdir(parents=True, exist_ok=True)
+        samples = _transcode(ffmpeg_path, source, rendition, bitrate)
+        made = rendition
+    else:
+        try:
+            samples = _read_wav(source)
+        except (wave.Error, EOFError) as exc:
+            raise RuntimeError(f"ffmpeg ({ffmpeg}) is needed to decode {Path(source).name}: {exc}") from exc
+    return {
+        "rendition": made,
+        "bytes": os.path.getsize(made or source),
+        "duration": round(samples.size / ANALYSIS_RATE, 3),
+        "peaks": waveform_peaks(samples, peaks),
+    }
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.VOICE_TRANSCODE_PROCESSES)
+    return _pool
+
+
+async def analyse_voice(source: Path, rendition: Path) -> Dict[str, Any]:
+    """``process_voice`` in the transcoding process pool, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_pool(),
+        process_voice,
+        str(source),
+        str(rendition),
+        settings.VOICE_FFMPEG_PATH,
+        settings.VOICE_RENDITION_BITRATE,
+        settings.VOICE_WAVEFORM_PEAKS,
+    )
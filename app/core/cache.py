@@ -0,0 +1,137 @@
+"""In-process caching helpers."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Each gunicorn worker holds its own instance, so entries invalidated in one
+    worker may be served by another until they expire.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, MISSING, count=False) is not MISSING
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        entry = self._data.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._data.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[1]
+        if entry is not None:
+            self._discard(key)
+        if count:
+            self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._discard(next(iter(self._data)))
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        return self._discard(key)
+
+    def _discard(self, key: Hashable) -> bool:
+        return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class TaggedCache(TTLCache):
+    """TTLCache whose entries carry tags, so writes can drop every entry for an entity.
+
+    Entries also record their size in bytes (as given by the caller) so the
+    memory held by cached values can be reported.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._entry_info: Dict[Hashable, tuple] = {}
+        self.bytes = 0
+        self.tag_invalidations = 0
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        size: int = 0,
+    ) -> None:
+        self._discard(key)
+        tags = tuple(tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        self._entry_info[key] = (tags, size)
+        self.bytes += size
+        super().set(key, value, ttl)
+
+    def _discard(self, key: Hashable) -> bool:
+        tags, size = self._entry_info.pop(key, ((), 0))
+        self.bytes -= size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return super()._discard(key)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying any of ``tags``; returns how many were dropped."""
+        dropped = 0
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                dropped += self._discard(key)
+        self.tag_invalidations += 1
+        return dropped
+
+    def clear(self) -> None:
+        super().clear()
+        self._tags.clear()
+        self._entry_info.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update({
+            "bytes": self.bytes,
+            "tags": {tag: len(keys) for tag, keys in self._tags.items()},
+            "tag_invalidations": self.tag_invalidations,
+        })
+        return stats
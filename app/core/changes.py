@@ -0,0 +1,179 @@
+"""Append-only change log behind the incremental sync feed (``GET /changes``).
+
+Every ORM insert, update or delete of a repair request, service or service
+provider appends a ``change_log`` entry in the same transaction. A flush
+takes its block of sequence numbers from the ``change_log`` row of
+``table_versions``. That row stays locked until the transaction ends, so
+sequence numbers commit in order: a client that has read up to ``seq``
+never misses a later commit with a smaller number. Entries carry no
+payload; the feed reads the rows as they are now.
+
+Compaction keeps the log to about one entry per row. An entry followed by
+a later one for the same row tells a client nothing the later one does
+not, so it is dropped. Deletions older than ``CHANGE_LOG_TOMBSTONE_DAYS``
+are dropped too, and the newest dropped one becomes the compaction
+horizon: cursors before it may have missed a deletion and must resync
+from scratch. Rows written outside the ORM are not logged;
+``seed_change_log`` adds a ``created`` entry for every row without one.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import delete, event, exists, func, insert, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.database.upsert import increment
+from app.models.change_log import ChangeLogEntry
+from app.models.repair_requests import RepairRequest
+from app.models.service_providers import ServiceProvider
+from app.models.services import Service
+from app.models.table_versions import TableVersion
+
+# Entity name in the feed and the column naming the row's owner
+SYNCED_MODELS = {
+    RepairRequest: ("repair_request", "user_id"),
+    Service: ("service", "provider_id"),
+    ServiceProvider: ("provider", "user_id"),
+}
+ENTITY_MODELS = {entity: model for model, (entity, _) in SYNCED_MODELS.items()}
+
+# table_versions rows: the last sequence number handed out, and the compaction horizon
+SEQUENCE = "change_log"
+COMPACTED = "change_log.compacted"
+
+_table = ChangeLogEntry.__table__
+_versions = TableVersion.__table__
+
+# Session.info key for the entries recorded during the current flush
+_PENDING = "changes.pending"
+
+
+def _owner(connection: Connection, mapper, target: Any, column: str) -> Any:
+    loaded = inspect(target).dict
+    if column in loaded:
+        return loaded[column]
+    # Expired attributes can't be loaded mid-flush; read the row directly
+    table = mapper.local_table
+    return connection.execute(select(table.c[column]).where(table.c.id == target.id)).scalar()
+
+
+def _recorder(action: str):
+    def record(mapper, connection: Connection, target: Any) -> None:
+        entity, owner_column = SYNCED_MODELS[mapper.class_]
+        if action == "updated":
+            state = inspect(target)
+            if not any(state.attrs[attr.key].history.has_changes() for attr in mapper.column_attrs):
+                return
+        object_session(target).info.setdefault(_PENDING, []).append(
+            (entity, target.id, action, _owner(connection, mapper, target, owner_column))
+        )
+
+    return record
+
+
+# Deletions are recorded before the row is gone, while its owner can still be read
+for _model in SYNCED_MODELS:
+    for _event, _action in (("after_insert", "created"), ("after_update", "updated"), ("before_delete", "deleted")):
+        event.listen(_model, _event, _recorder(_action))
+
+
+def _next_block(connection: Connection, size: int) -> int:
+    """Reserve ``size`` sequence numbers; returns the first."""
+    last = increment(connection, _versions, {"table_name": SEQUENCE}, "version", size, returning=True)
+    return last - size + 1
+
+
+def _append(connection: Connection, entries: List[Tuple[str, Any, str, Any]]) -> None:
+    first = _next_block(connection, len(entries))
+    now = datetime.utcnow()
+    connection.execute(insert(_table), [
+        {"seq": first + i, "entity": entity, "entity_id": entity_id, "action": action, "owner_id": owner_id,
+         "created_at": now}
+        for i, (entity, entity_id, action, owner_id) in enumerate(entries)
+    ])
+
+
+@event.listens_for(Session, "after_flush")
+def _write_entries(session: Session, flush_context) -> None:
+    entries = session.info.pop(_PENDING, None)
+    if entries:
+        _append(session.connection(), entries)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_entries(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+async def _version(session: AsyncSession, name: str) -> int:
+    result = await session.execute(select(TableVersion.version).where(TableVersion.table_name == name))
+    return result.scalar() or 0
+
+
+async def latest_seq(session: AsyncSession) -> int:
+    return await _version(session, SEQUENCE)
+
+
+async def compacted_seq(session: AsyncSession) -> int:
+    """Cursors below this may have missed a deletion that compaction dropped."""
+    return await _version(session, COMPACTED)
+
+
+async def changes_since(session: AsyncSession, since: int, limit: int, *where) -> Tuple[List[ChangeLogEntry], bool]:
+    """Entries after ``since`` in commit order, and whether more follow."""
+    result = await session.execute(
+        select(ChangeLogEntry).where(ChangeLogEntry.seq > since, *where).order_by(ChangeLogEntry.seq).limit(limit + 1)
+    )
+    entries = list(result.scalars().all())
+    return entries[:limit], len(entries) > limit
+
+
+def _compact(connection: Connection, tombstone_days: float) -> Dict[str, int]:
+    newer = _table.alias("newer")
+    superseded = connection.execute(delete(_table).where(exists().where(
+        newer.c.entity == _table.c.entity,
+        newer.c.entity_id == _table.c.entity_id,
+        newer.c.seq > _table.c.seq,
+    ))).rowcount
+
+    cutoff = datetime.utcnow() - timedelta(days=tombstone_days)
+    old_deletions = (_table.c.action == "deleted", _table.c.created_at < cutoff)
+    horizon = connection.execute(select(func.max(_table.c.seq)).where(*old_deletions)).scalar()
+    tombstones = 0
+    if horizon is not None:
+        tombstones = connection.execute(delete(_table).where(*old_deletions, _table.c.seq <= horizon)).rowcount
+        current = connection.execute(
+            select(_versions.c.version).where(_versions.c.table_name == COMPACTED)
+        ).scalar() or 0
+        if horizon > current:
+            increment(connection, _versions, {"table_name": COMPACTED}, "version", horizon - current)
+    return {"superseded": superseded, "tombstones": tombstones}
+
+
+async def compact_change_log(session: AsyncSession, tombstone_days: float) -> Dict[str, int]:
+    """Drop superseded entries and old deletions; returns how many of each."""
+    counts = await session.run_sync(lambda sync_session: _compact(sync_session.connection(), tombstone_days))
+    counts["compacted_seq"] = await compacted_seq(session)
+    return counts
+
+
+def _seed(connection: Connection) -> int:
+    seeded = 0
+    for model, (entity, owner_column) in SYNCED_MODELS.items():
+        table = model.__table__
+        logged = exists().where(_table.c.entity == entity, _table.c.entity_id == table.c.id)
+        rows = connection.execute(
+            select(table.c.id, table.c[owner_column]).where(~logged).order_by(table.c.created_at, table.c.id)
+        ).all()
+        if rows:
+            _append(connection, [(entity, row_id, "created", owner_id) for row_id, owner_id in rows])
+            seeded += len(rows)
+    return seeded
+
+
+async def seed_change_log(session: AsyncSession) -> int:
+    """Log a ``created`` entry for every synced row that has no entry; returns how many."""
+    return await session.run_sync(lambda sync_session: _seed(sync_session.connection()))
@@ -0,0 +1,64 @@
+"""Compound-document list responses.
+
+Clients that send ``Accept: application/vnd.compound+json`` get each
+referenced owner once, in ``included``, instead of embedded in every row::
+
+    {"items": [{"id": ..., "user_id": "u1", ...}, ...],
+     "next_cursor": null,
+     "included": {"users": {"u1": {...}}}}
+
+Everyone else keeps the embedded shape.
+"""
+
+from typing import Any, Dict, NamedTuple, Sequence
+
+from fastapi import Request, Response
+
+from app.core.serialization import ModelSerializer
+
+COMPOUND_MEDIA_TYPE = "application/vnd.compound+json"
+
+
+class Embedded(NamedTuple):
+    """A nested object that a compound document moves into ``included``."""
+    relationship: str
+    foreign_key: str
+    collection: str
+
+
+def wants_compound(request: Request, response: Response) -> bool:
+    """Whether the client asked for the compound shape in its Accept header.
+
+    Marks the response as varying on Accept, since either shape can be served.
+    """
+    response.headers["Vary"] = "Accept"
+    return COMPOUND_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def compound_document(
+    items: Sequence[Any],
+    serializer: ModelSerializer,
+    embedded: Embedded,
+) -> Dict[str, Any]:
+    """Dump ``items`` with ``embedded`` replaced by its foreign key and de-duplicated.
+
+    With a sparse fieldset that leaves the relationship out, nothing is
+    included (it was never loaded).
+    """
+    loaded = serializer.include is None or embedded.relationship in serializer.include
+    row_serializer = serializer.without(embedded.relationship)
+    related_serializer = serializer.related(embedded.relationship) if loaded else None
+
+    rows = []
+    included: Dict[str, Any] = {}
+    for obj in items:
+        row = row_serializer(obj)
+        if loaded:
+            row[embedded.foreign_key] = getattr(obj, embedded.foreign_key)
+            related = getattr(obj, embedded.relationship)
+            if related is not None:
+                key = str(related.id)
+                if key not in included:
+                    included[key] = related_serializer(related)
+        rows.append(row)
+    return {"items": rows, "included": {embedded.collection: included}}
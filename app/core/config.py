@@ -15,6 +15,31 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Opt in: let read-only endpoints trust the role claim instead of loading
+    # the user. Bans and role changes then only reach those endpoints once the
+    # caller's token expires (ACCESS_TOKEN_EXPIRE_MINUTES).
+    AUTH_TRUST_ROLE_CLAIMS: bool = False
+    # Per-worker user cache for current_active_user; writes reach other
+    # workers through the shared tier (if any), the TTL bounds staleness
+    # otherwise. Set the TTL to 0 to disable.
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    # Cache of rendered catalog pages (services, providers), dropped by tag
+    # on writes. Set the TTL to 0 to disable.
+    RESPONSE_CACHE_SIZE: int = 512
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    # Shared tier behind the per-worker caches: "" (none),
+    # "sqlite:///path/cache.db" (one host) or "redis://host:6379/0"
+    SHARED_CACHE_URL: str = ""
+    # Identical concurrent reads of shared lists run the query once per worker
+    SINGLE_FLIGHT_READS: bool = True
+    # Password hashing runs off the event loop: "thread" or "process" pool
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    # List endpoints dump ORM rows with a prebuilt serializer and orjson
+    # instead of validating each row against its response_model
+    FAST_JSON_RESPONSES: bool = True
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = [
         "http://localhost:3000",
         "http://127.0.0.1:3000"
@@ -35,6 +60,16 @@ class Settings(BaseSettings):
     DATABASE_URL: Optional[str] = None
     SYNC_DATABASE_URL: Optional[str] = None
 
+    # Connection pool (per worker process)
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement cache; set to 0 behind pgbouncer
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
     def model_post_init(self, __context: Any) -> None:
         """Set default DB URLs if missing."""
         if not self.DATABASE_URL:
@@ -62,6 +97,59 @@ class Settings(BaseSettings):
     FIRST_SUPERUSER: EmailStr = "admin@example.com"
     FIRST_SUPERUSER_PASSWORD: str = "admin"
 
+    # Voice uploads: streamed to disk in UPLOAD_CHUNK_SIZE chunks
+    UPLOAD_DIR: str = "uploads/voices"
+    VOICE_UPLOAD_MAX_BYTES: int = 20 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    # Let the fronting proxy send voice file bytes after our auth check:
+    # "" (serve from Python), "x-accel-redirect" (nginx) or "x-sendfile"
+    VOICE_FILE_SENDFILE: str = ""
+    # nginx `internal` location that maps onto UPLOAD_DIR
+    VOICE_FILE_ACCEL_LOCATION: str = "/protected/voices"
+    # Background voice processing: a mono Opus/OGG rendition at this
+    # bitrate, served by default, and the number of waveform peaks stored
+    # for the UI. Runs in a pool of this many processes per worker; keep
+    # the "voice" limit in JOB_QUEUES no higher
+    VOICE_FFMPEG_PATH: str = "ffmpeg"
+    VOICE_RENDITION_BITRATE: str = "24k"
+    VOICE_WAVEFORM_PEAKS: int = 100
+    VOICE_TRANSCODE_PROCESSES: int = 2
+    # Memory-mapped service vectors for request/service similarity, shared
+    # by the workers on a host; changing the dimensions rebuilds them
+    SIMILARITY_INDEX_DIR: str = "data/similarity"
+    SIMILARITY_DIMENSIONS: int = 2048
+    # Server-sent event streams: frames a client may fall behind before it
+    # is reset, events kept for Last-Event-ID replay, and the comment
+    # interval that keeps idle connections open through proxies
+    STREAM_QUEUE_SIZE: int = 100
+    STREAM_REPLAY_SIZE: int = 500
+    STREAM_HEARTBEAT_SECONDS: float = 15.0
+    # Postgres NOTIFY channel for change events, and how often the idle
+    # listener connection is checked. LISTEN needs a session-mode
+    # connection: behind pgbouncer in transaction mode, point
+    # EVENT_BUS_DATABASE_URL at Postgres directly (default: DATABASE_URL)
+    EVENT_BUS_CHANNEL: str = "changes"
+    EVENT_BUS_DATABASE_URL: str = ""
+    EVENT_BUS_KEEPALIVE_SECONDS: float = 30.0
+    # Change log compaction drops deletions older than this; clients whose
+    # cursor predates them must sync from scratch
+    CHANGE_LOG_TOMBSTONE_DAYS: float = 30.0
+    # Background jobs: run a worker in every web process (or only in
+    # `python -m app.worker`), queue concurrency limits across all workers
+    # as "name=limit,..." (unlisted queues get 1), how often idle workers
+    # poll, and how long a claimed job's lease lasts: running jobs renew it
+    # every third of that, and another worker takes over a job whose lease
+    # ran out, assuming its worker died
+    JOB_WORKER_IN_PROCESS: bool = True
+    JOB_QUEUES: str = "default=4,voice=2"
+    JOB_POLL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: float = 300.0
+    # Failed jobs retry after base * 2**(attempt - 1) seconds (capped, with
+    # jitter) and are dead-lettered after this many attempts
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 10.0
+    JOB_RETRY_MAX_SECONDS: float = 3600.0
+
 
 
     model_config = {
@@ -0,0 +1,178 @@
+"""Incrementally maintained counters behind the admin dashboard.
+
+Mapper events bump rows in ``dashboard_counters`` inside the same flush (and
+so the same transaction) that inserts, updates or deletes a user, repair
+request or service. Cascaded deletes go through the ORM and are counted too.
+The dashboard then reads a handful of counter rows instead of aggregating
+the whole tables; ``recompute_counters`` rebuilds them from scratch.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, event, func, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.upsert import increment
+from app.models.dashboard_counters import DashboardCounter
+from app.models.repair_requests import RepairRequest
+from app.models.services import Service
+from app.models.user_roles import UserRole
+from app.models.users import User
+
+USERS_BY_ROLE = "users.role"
+SERVICES_BY_TYPE = "services.type"
+REPAIR_REQUESTS_TOTAL = "repair_requests.total"
+REPAIR_REQUESTS_BY_DAY = "repair_requests.day"
+
+RECENT_DAYS = 30
+PROVIDER_ROLE_VALUES = (UserRole.PROVIDER_INDIVIDUAL.value, UserRole.PROVIDER_ORGANIZATION.value)
+
+_table = DashboardCounter.__table__
+
+
+def _role_value(role: Any) -> str:
+    return UserRole(role).value
+
+
+def _day_bucket(created_at: Optional[datetime]) -> str:
+    return (created_at or datetime.utcnow()).date().isoformat()
+
+
+def _bump(connection: Connection, name: str, bucket: str, delta: int) -> None:
+    increment(connection, _table, {"name": name, "bucket": bucket}, "value", delta)
+
+
+def _changed(target: Any, attribute: str):
+    """Return ``(old, new)`` if ``attribute`` changed in this flush, else None."""
+    history = inspect(target).attrs[attribute].history
+    if not history.added or not history.deleted:
+        return None
+    return history.deleted[0], history.added[0]
+
+
+# Users
+
+@event.listens_for(User, "after_insert")
+def _user_inserted(mapper, connection, target: User) -> None:
+    _bump(connection, USERS_BY_ROLE, _role_value(target.role), 1)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target: User) -> None:
+    _bump(connection, USERS_BY_ROLE, _role_value(target.role), -1)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User) -> None:
+    change = _changed(target, "role")
+    if change and _role_value(change[0]) != _role_value(change[1]):
+        _bump(connection, USERS_BY_ROLE, _role_value(change[0]), -1)
+        _bump(connection, USERS_BY_ROLE, _role_value(change[1]), 1)
+
+
+# Repair requests
+
+@event.listens_for(RepairRequest, "after_insert")
+def _repair_request_inserted(mapper, connection, target: RepairRequest) -> None:
+    _bump(connection, REPAIR_REQUESTS_TOTAL, "", 1)
+    _bump(connection, REPAIR_REQUESTS_BY_DAY, _day_bucket(target.created_at), 1)
+
+
+@event.listens_for(RepairRequest, "after_delete")
+def _repair_request_deleted(mapper, connection, target: RepairRequest) -> None:
+    _bump(connection, REPAIR_REQUESTS_TOTAL, "", -1)
+    _bump(connection, REPAIR_REQUESTS_BY_DAY, _day_bucket(target.created_at), -1)
+
+
+# Services
+
+@event.listens_for(Service, "after_insert")
+def _service_inserted(mapper, connection, target: Service) -> None:
+    _bump(connection, SERVICES_BY_TYPE, target.service_type, 1)
+
+
+@event.listens_for(Service, "after_delete")
+def _service_deleted(mapper, connection, target: Service) -> None:
+    _bump(connection, SERVICES_BY_TYPE, target.service_type, -1)
+
+
+@event.listens_for(Service, "after_update")
+def _service_updated(mapper, connection, target: Service) -> None:
+    change = _changed(target, "service_type")
+    if change and change[0] != change[1]:
+        _bump(connection, SERVICES_BY_TYPE, change[0], -1)
+        _bump(connection, SERVICES_BY_TYPE, change[1], 1)
+
+
+async def read_counters(session: AsyncSession, today: Optional[date] = None) -> Dict[str, Any]:
+    """Read the dashboard totals and distributions from the counter rows."""
+    since = (today or datetime.utcnow().date()) - timedelta(days=RECENT_DAYS)
+    rows = await session.execute(
+        select(DashboardCounter.name, DashboardCounter.bucket, DashboardCounter.value).where(
+            DashboardCounter.name.in_([USERS_BY_ROLE, SERVICES_BY_TYPE, REPAIR_REQUESTS_TOTAL])
+        )
+    )
+    roles: Dict[str, int] = {}
+    service_types: Dict[str, int] = {}
+    total_requests = 0
+    for name, bucket, value in rows.all():
+        if name == REPAIR_REQUESTS_TOTAL:
+            total_requests = value
+        elif value > 0:
+            (roles if name == USERS_BY_ROLE else service_types)[bucket] = value
+
+    new_requests = await session.scalar(
+        select(func.coalesce(func.sum(DashboardCounter.value), 0)).where(
+            DashboardCounter.name == REPAIR_REQUESTS_BY_DAY,
+            DashboardCounter.bucket >= since.isoformat(),
+        )
+    )
+    return {
+        "users": roles.get(UserRole.USER.value, 0),
+        "providers": sum(roles.get(role, 0) for role in PROVIDER_ROLE_VALUES),
+        "repair_requests": total_requests,
+        "services": sum(service_types.values()),
+        "new_requests_30d": new_requests or 0,
+        "user_roles": roles,
+        "service_types": service_types,
+    }
+
+
+async def recompute_counters(session: AsyncSession) -> Dict[str, Any]:
+    """Rebuild every counter from the source tables in the caller's transaction.
+
+    On PostgreSQL the counter table is locked first so concurrent writers wait
+    for the rebuild instead of bumping rows that are about to be replaced.
+    The caller commits.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        await session.execute(text("LOCK TABLE dashboard_counters IN EXCLUSIVE MODE"))
+    await session.execute(delete(DashboardCounter))
+
+    counters = []
+    roles = await session.execute(select(User.role, func.count()).group_by(User.role))
+    counters += [(USERS_BY_ROLE, _role_value(role), count) for role, count in roles.all()]
+
+    service_types = await session.execute(
+        select(Service.service_type, func.count()).group_by(Service.service_type)
+    )
+    counters += [(SERVICES_BY_TYPE, service_type, count) for service_type, count in service_types.all()]
+
+    total_requests = await session.scalar(select(func.count()).select_from(RepairRequest))
+    counters.append((REPAIR_REQUESTS_TOTAL, "", total_requests or 0))
+
+    # Older day buckets are never read, so only the recent window is rebuilt
+    since = datetime.combine(datetime.utcnow().date() - timedelta(days=RECENT_DAYS), datetime.min.time())
+    day = func.date(RepairRequest.created_at)
+    days = await session.execute(
+        select(day, func.count()).where(RepairRequest.created_at >= since).group_by(day)
+    )
+    counters += [(REPAIR_REQUESTS_BY_DAY, str(bucket), count) for bucket, count in days.all()]
+
+    session.add_all(
+        DashboardCounter(name=name, bucket=bucket, value=value) for name, bucket, value in counters
+    )
+    await session.flush()
+    return await read_counters(session)
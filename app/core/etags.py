@@ -0,0 +1,93 @@
+"""Weak ETags and conditional GET for read endpoints.
+
+Every ORM insert, update or delete bumps its table's row in
+``table_versions`` (once per table per flush, in the same transaction). A
+read endpoint reads the versions of the tables its payload depends on, one
+primary-key lookup, and hashes them with the request into a weak ETag.
+A matching ``If-None-Match`` gets a 304 before the list query or any
+serialization runs.
+
+Writes that bypass the ORM (raw SQL, restores) do not bump versions.
+"""
+
+import hashlib
+from typing import Any, Iterable, Optional, Sequence
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.database.upsert import increment
+from app.models.repair_requests import RepairRequest
+from app.models.service_providers import ServiceProvider
+from app.models.services import Service
+from app.models.table_versions import TableVersion
+from app.models.users import User
+
+VERSIONED_MODELS = (User, RepairRequest, Service, ServiceProvider)
+
+# Session.info key for the tables already bumped in the current flush
+_BUMPED = "etags.bumped_tables"
+
+
+def _bump_version(mapper, connection: Connection, target: Any) -> None:
+    table_name = mapper.local_table.name
+    bumped = object_session(target).info.setdefault(_BUMPED, set())
+    if table_name not in bumped:
+        bumped.add(table_name)
+        increment(connection, TableVersion.__table__, {"table_name": table_name}, "version")
+
+
+for _model in VERSIONED_MODELS:
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _bump_version)
+
+
+@event.listens_for(Session, "before_flush")
+def _reset_bumped(session: Session, flush_context, instances) -> None:
+    session.info.pop(_BUMPED, None)
+
+
+async def table_versions(session: AsyncSession, tables: Sequence[str]) -> str:
+    """Return the current versions of ``tables`` as a compact string."""
+    rows = await session.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables))
+    )
+    versions = dict(rows.all())
+    return ".".join(str(versions.get(table, 0)) for table in tables)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison: W/"x" matches "x"
+    opaque = etag.removeprefix("W/")
+    for candidate in (tag.strip() for tag in if_none_match.split(",")):
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+async def check_etag(
+    request: Request,
+    response: Response,
+    session: AsyncSession,
+    tables: Iterable[str],
+    scope: Optional[Any] = None,
+) -> str:
+    """Set a weak ETag for this request, or raise 304 if the client has it.
+
+    The tag covers the versions of ``tables``, the full URL (query params,
+    sparse fields), the Accept header (compound shape) and ``scope`` (e.g.
+    the current user for per-user lists).
+    """
+    versions = await table_versions(session, list(tables))
+    raw = "|".join((versions, str(request.url), request.headers.get("accept", ""), str(scope or "")))
+    etag = f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return etag
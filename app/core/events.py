@@ -0,0 +1,209 @@
+"""Change events fanned out to every worker process.
+
+Every ORM insert, update or delete of a user, repair request or service
+becomes a change event such as ``repair_request.created``, with the row's
+id and a small summary of its columns. This covers the writes of every
+endpoint, including cascaded deletes. Handlers registered with
+``change_bus.subscribe`` receive each event once it is committed, in every
+worker:
+
+* Postgres: the mapper event runs ``pg_notify`` in the writing transaction,
+  so nothing is sent for a rollback and events arrive in commit order. Each
+  process keeps a single connection, outside the pool, that ``LISTEN``s on
+  ``EVENT_BUS_CHANNEL`` and hands notifications to the handlers. The
+  writing worker gets its own events the same way.
+* Anything else (SQLite, tests): events are held on the session and handed
+  to this process's handlers after commit. Other processes never see them.
+
+Events committed while the listener is reconnecting are lost; handlers get
+a ``resync`` event when it is back so they can tell their clients to reload.
+Writes that bypass the ORM publish nothing.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.repair_requests import RepairRequest
+from app.models.services import Service
+from app.models.users import User
+
+logger = logging.getLogger(__name__)
+
+RESYNC = "resync"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more; bigger events go without their data
+MAX_PAYLOAD_BYTES = 7900
+
+# Entity name and the columns summarized in its events
+EVENT_MODELS = {
+    RepairRequest: ("repair_request", ("title", "description", "latitude", "longitude", "created_at", "user_id")),
+    Service: ("service", ("name", "service_type", "description", "created_at", "provider_id")),
+    User: ("user", ("role", "is_active", "first_name", "last_name")),
+}
+
+# Session.info key for events waiting for the commit (in-process delivery)
+_PENDING = "events.pending"
+
+Handler = Callable[[Dict[str, Any]], None]
+
+
+def encode_change(entity: str, action: str, row_id: Any, data: Optional[Dict[str, Any]]) -> str:
+    message = {"type": f"{entity}.{action}", "entity": entity, "action": action, "id": str(row_id), "data": data}
+    payload = orjson.dumps(message)
+    if len(payload) >= MAX_PAYLOAD_BYTES:
+        message["data"] = None
+        payload = orjson.dumps(message)
+    return payload.decode()
+
+
+def _summary(target: Any, columns) -> Dict[str, Any]:
+    # Only loaded values: reading an expired attribute here would query mid-flush
+    loaded = inspect(target).dict
+    return {name: loaded[name] for name in columns if name in loaded}
+
+
+def _stage(connection: Connection, target: Any, payload: str) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.execute(select(func.pg_notify(change_bus.channel, payload)))
+    else:
+        object_session(target).info.setdefault(_PENDING, []).append(payload)
+
+
+def _listener(action: str):
+    def listener(mapper, connection: Connection, target: Any) -> None:
+        entity, columns = EVENT_MODELS[mapper.class_]
+        if action == "updated":
+            state = inspect(target)
+            if not any(state.attrs[attr.key].history.has_changes() for attr in mapper.column_attrs):
+                return
+        data = None if action == "deleted" else _summary(target, columns)
+        _stage(connection, target, encode_change(entity, action, target.id, data))
+
+    return listener
+
+
+for _model in EVENT_MODELS:
+    for _event, _action in (("after_insert", "created"), ("after_update", "updated"), ("after_delete", "deleted")):
+        event.listen(_model, _event, _listener(_action))
+
+
+@event.listens_for(Session, "after_commit")
+def _deliver_pending(session: Session) -> None:
+    for payload in session.info.pop(_PENDING, ()):
+        change_bus.dispatch(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+class ChangeBus:
+    """This process's change event handlers and its Postgres listener."""
+
+    def __init__(self, channel: str, keepalive: float):
+        self.channel = channel
+        self.keepalive = keepalive
+        self._handlers: List[Handler] = []
+        self._listener: Optional[asyncio.Task] = None
+        self.backend = "in-process"
+        self.events_received = 0
+        self.handler_errors = 0
+        self.listener_errors = 0
+
+    def subscribe(self, handler: Handler) -> Handler:
+        """Call ``handler`` with every committed change event; usable as a decorator."""
+        self._handlers.append(handler)
+        return handler
+
+    def unsubscribe(self, handler: Handler) -> None:
+        self._handlers.remove(handler)
+
+    def dispatch(self, payload: str) -> None:
+        self.events_received += 1
+        self._emit(orjson.loads(payload))
+
+    def _emit(self, change: Dict[str, Any]) -> None:
+        for handler in self._handlers:
+            try:
+                handler(change)
+            except Exception:
+                self.handler_errors += 1
+                logger.exception("Change event handler failed for %s", change.get("type"))
+
+    async def start(self, database_url: str) -> None:
+        """Listen for other workers' events when the database is Postgres."""
+        url = make_url(database_url)
+        if url.get_backend_name() != "postgresql":
+            return
+        self.backend = "postgres"
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        started = asyncio.Event()
+        self._listener = asyncio.create_task(self._listen(dsn, started))
+        await started.wait()
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.backend = "in-process"
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self.dispatch(payload)
+
+    async def _listen(self, dsn: str, started: asyncio.Event) -> None:
+        import asyncpg
+
+        failed = False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.channel, self._on_notify)
+                if failed:
+                    self._emit({"type": RESYNC})
+                    failed = False
+                started.set()
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), self.keepalive)
+                    except asyncio.TimeoutError:
+                        # An idle socket can die silently; a round trip finds out
+                        await connection.execute("SELECT 1")
+                raise ConnectionError("Listener connection closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.listener_errors += 1
+                failed = True
+                started.set()
+                logger.exception("Change event listener failed; reconnecting")
+                await asyncio.sleep(1.0)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "listening": self._listener is not None and not self._listener.done(),
+            "handlers": len(self._handlers),
+            "events_received": self.events_received,
+            "handler_errors": self.handler_errors,
+            "listener_errors": self.listener_errors,
+        }
+
+
+change_bus = ChangeBus(settings.EVENT_BUS_CHANNEL, settings.EVENT_BUS_KEEPALIVE_SECONDS)
@@ -0,0 +1,168 @@
+"""Server-sent event feeds pushed to long-lived streaming connections.
+
+An ``EventFeed`` fans each published event out to every open stream in this
+worker. The event is encoded into its ``text/event-stream`` frame once and
+the same bytes are queued for every subscriber, so publishing costs one
+``put_nowait`` per connection and never waits on a slow client.
+``repair_request_feed`` publishes the ``repair_request.created`` change
+events of every worker (see ``app.core.events``).
+
+Backpressure is per connection: each subscriber has a bounded queue. A
+client that falls ``queue_size`` frames behind is dropped from the feed, its
+backlog is discarded and it gets a single ``reset`` event before the stream
+closes. It reconnects with ``Last-Event-ID`` and catches up from the replay
+buffer, or refetches the list if it fell out of it.
+
+Idle connections cost a queue and a suspended generator, with no timer of
+their own: one heartbeat task per feed queues a comment frame for every
+subscriber each ``heartbeat`` seconds, which keeps proxies from closing
+idle streams and surfaces disconnected clients (the write fails and the
+stream is cleaned up). The task runs only while someone is subscribed.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set, Tuple
+
+import orjson
+
+from app.core.config import settings
+from app.core.events import RESYNC, change_bus
+
+RESET = b"event: reset\ndata: {}\n\n"
+HEARTBEAT = b": ping\n\n"
+
+
+def encode_event(event: str, event_id: str, data: Any) -> bytes:
+    """One ``text/event-stream`` frame; ``data`` is JSON on a single line."""
+    payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event_id.encode(), event.encode(), payload)
+
+
+class Subscription:
+    """One open stream: a bounded queue of encoded frames."""
+
+    __slots__ = ("queue", "closed")
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.closed = False
+
+    def offer(self, frame: bytes) -> bool:
+        """Queue ``frame`` without waiting; False if the subscriber is too far behind."""
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def reset(self) -> None:
+        """Drop the backlog and leave only a ``reset`` event, after which the stream ends."""
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(RESET)
+
+
+class EventFeed:
+    """Fan events out to this worker's open streams, with a short replay buffer."""
+
+    def __init__(self, queue_size: int, replay_size: int, heartbeat: float):
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._subscribers: Set[Subscription] = set()
+        self._recent: Deque[Tuple[str, bytes]] = deque(maxlen=replay_size)
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.dropped = 0
+        self.max_subscribers = 0
+
+    def publish(self, event: str, event_id: str, data: Any) -> int:
+        """Queue an event for every open stream; returns how many streams got it."""
+        frame = encode_event(event, event_id, data)
+        self._recent.append((event_id, frame))
+        self.published += 1
+        return self._broadcast(frame)
+
+    def _broadcast(self, frame: bytes) -> int:
+        delivered = 0
+        for subscription in list(self._subscribers):
+            if subscription.offer(frame):
+                delivered += 1
+            else:
+                self.dropped += 1
+                self._subscribers.discard(subscription)
+                subscription.reset()
+        return delivered
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """Open a stream, first replaying what was published after ``last_event_id``."""
+        subscription = Subscription(self.queue_size)
+        if last_event_id:
+            ids = [event_id for event_id, _ in self._recent]
+            if last_event_id in ids:
+                for _, frame in list(self._recent)[ids.index(last_event_id) + 1:]:
+                    if not subscription.offer(frame):
+                        subscription.reset()
+                        return subscription
+            else:
+                # Missed more than the buffer holds (or connected before a restart): refetch the list
+                subscription.offer(RESET)
+        self._subscribers.add(subscription)
+        self.max_subscribers = max(self.max_subscribers, len(self._subscribers))
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.get_running_loop().create_task(self._beat())
+        return subscription
+
+    def reset_all(self) -> None:
+        """Send every open stream a ``reset`` event and close it; the replay buffer is dropped too."""
+        self._recent.clear()
+        for subscription in list(self._subscribers):
+            self._subscribers.discard(subscription)
+            subscription.reset()
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        subscription.closed = True
+
+    async def _beat(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self.heartbeat)
+            self._broadcast(HEARTBEAT)
+
+    async def stream(self, subscription: Subscription, retry_ms: int = 5000) -> AsyncIterator[bytes]:
+        """Yield the frames queued for ``subscription`` until it is reset or the client goes away."""
+        try:
+            yield b"retry: %d\n\n" % retry_ms
+            while True:
+                frame = await subscription.queue.get()
+                yield frame
+                if frame is RESET and subscription.closed:
+                    return
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "published": self.published,
+            "dropped": self.dropped,
+            "replay_buffer": len(self._recent),
+        }
+
+
+repair_request_feed = EventFeed(
+    queue_size=settings.STREAM_QUEUE_SIZE,
+    replay_size=settings.STREAM_REPLAY_SIZE,
+    heartbeat=settings.STREAM_HEARTBEAT_SECONDS,
+)
+
+
+@change_bus.subscribe
+def _push_new_requests(change: Dict[str, Any]) -> None:
+    if change["type"] == "repair_request.created":
+        repair_request_feed.publish("repair_request", change["id"], {"id": change["id"], **(change["data"] or {})})
+    elif change["type"] == RESYNC:
+        # Requests committed while the listener was down were never pushed
+        repair_request_feed.reset_all()
@@ -0,0 +1,113 @@
+"""Sparse fieldsets: ``?fields=id,title,user.first_name``.
+
+The selection is pushed into the query with ``load_only`` so unrequested
+columns are never read, and a relationship is only loaded when at least one
+of its fields is asked for. Rendering goes through ``ModelSerializer.only``.
+"""
+
+from typing import Any, Dict, FrozenSet, Optional, Sequence, Type
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+
+from app.core.serialization import ModelSerializer, nested_model
+
+# Top-level field -> None (the whole field) or the requested nested fields
+Selection = Dict[str, Optional[FrozenSet[str]]]
+
+
+def _unknown_field(name: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Unknown field: {name}"
+    )
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[Selection]:
+    """Parse a comma-separated ``fields`` parameter against ``schema``.
+
+    ``user`` selects the whole nested object, ``user.first_name`` one of its
+    fields. Returns None when no fields were given (the full representation).
+    """
+    if not fields:
+        return None
+
+    selection: Dict[str, Any] = {}
+    for name in (part.strip() for part in fields.split(",")):
+        if not name:
+            continue
+        head, _, sub = name.partition(".")
+        field = schema.model_fields.get(head)
+        if field is None:
+            raise _unknown_field(name)
+        if not sub:
+            selection[head] = None
+            continue
+        nested = nested_model(field.annotation)
+        if nested is None or sub not in nested.model_fields:
+            raise _unknown_field(name)
+        if head not in selection:
+            selection[head] = set()
+        if selection[head] is not None:
+            selection[head].add(sub)
+
+    if not selection:
+        return None
+    return {name: None if sub is None else frozenset(sub) for name, sub in selection.items()}
+
+
+def sparse_options(
+    entity: Any,
+    selection: Optional[Selection],
+    relationships: Sequence[str] = (),
+    always: Sequence[Any] = (),
+) -> list:
+    """Loader options for ``entity`` under ``selection``.
+
+    Without a selection the full row is loaded along with ``relationships``
+    (eagerly, via selectinload). With one, only the selected columns plus the
+    primary key and ``always`` (e.g. the pagination sort column) are read, and
+    a relationship is loaded only if some of its fields were selected.
+    """
+    if selection is None:
+        return [selectinload(getattr(entity, name)) for name in relationships]
+
+    mapper = inspect(entity)
+    columns = [getattr(entity, mapper.get_property_by_column(column).key) for column in mapper.primary_key]
+    columns.extend(always)
+    loaders = []
+    for name, subfields in selection.items():
+        if name in mapper.column_attrs:
+            columns.append(getattr(entity, name))
+        elif name in relationships:
+            relationship = mapper.relationships[name]
+            # The foreign key is needed to load a many-to-one relationship
+            columns.extend(
+                getattr(entity, mapper.get_property_by_column(column).key)
+                for column in relationship.local_columns
+            )
+            loader = selectinload(getattr(entity, name))
+            if subfields:
+                related = relationship.mapper.class_
+                loader = loader.load_only(*(getattr(related, field) for field in subfields))
+            loaders.append(loader)
+    return [load_only(*columns), *loaders]
+
+
+def sparse_response(
+    response: Response,
+    obj: Any,
+    serializer: ModelSerializer,
+    selection: Optional[Selection],
+) -> Any:
+    """Return ``obj`` as-is for the response_model, or its sparse rendering.
+
+    The sparse rendering carries over headers already set on ``response``.
+    """
+    if selection is None:
+        return obj
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return ORJSONResponse(serializer.only(selection)(obj), headers=headers)
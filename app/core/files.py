@@ -0,0 +1,148 @@
+"""Serving stored files with conditional GET, byte ranges and proxy offload."""
+
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import aiofiles
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+CHUNK_SIZE = 64 * 1024
+
+
+def file_etag(stat: os.stat_result) -> str:
+    """Strong ETag for an immutable stored file (uploads are never rewritten)."""
+    return f'"{stat.st_ino:x}-{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified_since(header: str, mtime: float) -> bool:
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into inclusive ``(start, end)``.
+
+    Returns None when the header should be ignored (malformed or multiple
+    ranges, which we answer with the full file). Raises ValueError when the
+    range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_str, sep, end_str = spec.strip().partition("-")
+    if not sep or not (start_str or end_str):
+        return None
+    if not all(part.isdigit() for part in (start_str, end_str) if part):
+        return None
+
+    if not start_str:
+        # Suffix range: the last N bytes
+        length = int(end_str)
+        if length == 0 or size == 0:
+            raise ValueError("range not satisfiable")
+        return max(size - length, 0), size - 1
+
+    start = int(start_str)
+    if end_str and int(end_str) < start:
+        return None
+    if start >= size:
+        raise ValueError("range not satisfiable")
+    end = min(int(end_str), size - 1) if end_str else size - 1
+    return start, end
+
+
+async def _read_range(path: Path, start: int, end: int) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_file(
+    request: Request,
+    path: Path,
+    *,
+    media_type: Optional[str] = None,
+    sendfile_mode: str = "",
+    accel_location: str = "",
+) -> Response:
+    """Build the response for GET/HEAD of a stored file.
+
+    Handles If-None-Match / If-Modified-Since (304), Range / If-Range (206 or
+    416) and always sends ETag, Last-Modified and Accept-Ranges. With
+    ``sendfile_mode`` set to ``x-accel-redirect`` (nginx) or ``x-sendfile``
+    (Apache, lighttpd, Caddy) the body is left to the fronting proxy, which
+    then handles ranges itself. ``media_type`` defaults to a guess from the
+    file name.
+    """
+    stat = path.stat()
+    etag = file_etag(stat)
+    headers: Dict[str, str] = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=86400",
+    }
+    media_type = media_type or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif _not_modified_since(request.headers.get("if-modified-since"), stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if sendfile_mode == "x-accel-redirect":
+        headers["X-Accel-Redirect"] = f"{accel_location.rstrip('/')}/{path.name}"
+        return Response(media_type=media_type, headers=headers)
+    if sendfile_mode == "x-sendfile":
+        headers["X-Sendfile"] = str(path.resolve())
+        return Response(media_type=media_type, headers=headers)
+
+    size = stat.st_size
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # If-Range: only honour Range when the client's copy is still current
+    if range_header and (
+        if_range is None
+        or if_range == etag
+        or (not if_range.startswith(('"', "W/")) and _not_modified_since(if_range, stat.st_mtime))
+    ):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1 if size else 0)
+    status_code = 200
+    if byte_range is not None:
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    if request.method == "HEAD" or size == 0:
+        return Response(status_code=status_code, media_type=media_type, headers=headers)
+    return StreamingResponse(
+        _read_range(path, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
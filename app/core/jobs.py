@@ -0,0 +1,432 @@
+"""Durable background jobs on the ``jobs`` table.
+
+Slow work is registered as a task and enqueued as a row in the caller's
+transaction, so a job exists exactly when the write that asked for it
+commits::
+
+    @task("dashboard.recompute")
+    async def recompute(session: AsyncSession, payload: dict) -> None:
+        ...
+
+    await enqueue(session, "dashboard.recompute")
+    await session.commit()
+
+A ``JobWorker`` claims due jobs with a single ``UPDATE ... WHERE id IN
+(SELECT ... FOR UPDATE SKIP LOCKED) RETURNING``, so concurrent workers never
+get the same job and never wait on each other's rows. SQLite has no row
+locks; its single writer gives the same guarantee. A claim leases the job
+for ``JOB_LEASE_SECONDS``, and the worker renews the lease every third of
+that while the task runs, so long tasks are not taken over; a worker that
+dies mid-job stops renewing and the job is claimed again once the lease
+runs out.
+
+Each queue has a concurrency limit across all workers (``JOB_QUEUES``).
+Claims count the queue's running jobs first, under a per-queue advisory
+lock on Postgres, so the limit holds with any number of workers.
+
+The task runs in its own session, and the worker deletes the job in that
+same transaction: the task's writes and the job's completion commit
+together. A failed job is retried after an exponential backoff with
+jitter, and after ``max_attempts`` it is dead-lettered (``status =
+"dead"``) with its last error, until an admin retries it.
+
+Workers run inside each web process (``JOB_WORKER_IN_PROCESS``) or on
+their own with ``python -m app.worker``. They poll every
+``JOB_POLL_SECONDS``, and are woken at once by jobs enqueued in their own
+process.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import statistics
+import traceback
+import uuid
+import weakref
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from sqlalchemy import and_, delete, event, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.jobs import Job
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DEAD = "queued", "running", "dead"
+# Recent timings kept per worker for the latency percentiles
+TIMING_WINDOW = 1000
+
+TaskFunction = Callable[[AsyncSession, Dict[str, Any]], Awaitable[None]]
+
+_table = Job.__table__
+
+# Session.info key for the queues that got jobs in the current transaction
+_ENQUEUED = "jobs.enqueued"
+
+
+@dataclass
+class Task:
+    name: str
+    fn: TaskFunction
+    queue: str
+    max_attempts: int
+
+
+tasks: Dict[str, Task] = {}
+
+
+def task(name: str, queue: str = "default", max_attempts: Optional[int] = None):
+    """Register ``fn(session, payload)`` as the task ``name``.
+
+    The worker commits the session after ``fn`` returns; tasks should not
+    commit themselves, so their writes land with the job's completion.
+    """
+    def register(fn: TaskFunction) -> TaskFunction:
+        tasks[name] = Task(name, fn, queue, max_attempts or settings.JOB_MAX_ATTEMPTS)
+        return fn
+
+    return register
+
+
+async def enqueue(
+    session: AsyncSession, name: str, payload: Optional[Dict[str, Any]] = None, delay: float = 0.0
+) -> Job:
+    """Add a job for the task ``name`` to the session; it is queued when the session commits."""
+    spec = tasks.get(name)
+    if spec is None:
+        raise ValueError(f"Unknown task: {name}")
+    now = datetime.utcnow()
+    job = Job(
+        queue=spec.queue,
+        task=name,
+        payload=payload or {},
+        status=QUEUED,
+        attempts=0,
+        max_attempts=spec.max_attempts,
+        run_at=now + timedelta(seconds=delay),
+        created_at=now,
+    )
+    session.add(job)
+    session.sync_session.info.setdefault(_ENQUEUED, set()).add(spec.queue)
+    return job
+
+
+_workers: "weakref.WeakSet[JobWorker]" = weakref.WeakSet()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session: Session) -> None:
+    queues = session.info.pop(_ENQUEUED, None)
+    if queues:
+        for worker in list(_workers):
+            worker.wake(queues)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueued(session: Session) -> None:
+    session.info.pop(_ENQUEUED, None)
+
+
+def parse_queues(spec: str) -> Dict[str, int]:
+    """``"default=4,voice=2"`` -> ``{"default": 4, "voice": 2}``."""
+    queues = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, limit = item.partition("=")
+        queues[name.strip()] = int(limit or 1)
+    return queues
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before retrying a job that has failed ``attempts`` times."""
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_SECONDS)
+    # Jitter spreads out retries of jobs that failed together
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _summarize(samples: Deque[float]) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {"count": 0, "p50": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50": round(statistics.median(ordered), 4),
+        "p95": round(ordered[max(int(len(ordered) * 0.95) - 1, 0)], 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+class JobWorker:
+    """Claim and run jobs from ``queues`` (name -> concurrency limit across all workers)."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        queues: Dict[str, int],
+        poll_interval: float,
+        lease: float,
+    ):
+        self.session_factory = session_factory
+        self.queues = queues
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._active: Dict[str, Set[asyncio.Task]] = defaultdict(set)
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._runner: Optional[asyncio.Task] = None
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.wait_seconds: Deque[float] = deque(maxlen=TIMING_WINDOW)
+        self.run_seconds: Deque[float] = deque(maxlen=TIMING_WINDOW)
+        _workers.add(self)
+
+    def wake(self, queues=None) -> None:
+        if queues is None or any(queue in self.queues for queue in queues):
+            self._wakeup.set()
+
+    async def _claim(self, queue: str, limit: int, wanted: int) -> List[Any]:
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            if session.get_bind().dialect.name == "postgresql":
+                # Serialize claims per queue so the running count below stays true
+                await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"jobs:{queue}"))))
+            running = await session.scalar(
+                select(func.count()).select_from(_table)
+                .where(_table.c.queue == queue, _table.c.status == RUNNING, _table.c.locked_until > now)
+            )
+            wanted = min(wanted, limit - running)
+            if wanted <= 0:
+                return []
+            due = (
+                select(_table.c.id)
+                .where(
+                    _table.c.queue == queue,
+                    or_(
+                        and_(_table.c.status == QUEUED, _table.c.run_at <= now),
+                        # Claimed by a worker that died: its lease ran out
+                        and_(_table.c.status == RUNNING, _table.c.locked_until <= now),
+                    ),
+                )
+                .order_by(_table.c.run_at)
+                .limit(wanted)
+                .with_for_update(skip_locked=True)
+            )
+            result = await session.execute(
+                update(_table)
+                .where(_table.c.id.in_(due.scalar_subquery()))
+                .values(
+                    status=RUNNING,
+                    attempts=_table.c.attempts + 1,
+                    locked_by=self.worker_id,
+                    locked_until=now + timedelta(seconds=self.lease),
+                )
+                .returning(_table.c.id, _table.c.task, _table.c.payload, _table.c.attempts,
+                           _table.c.max_attempts, _table.c.run_at)
+            )
+            claimed = result.all()
+            await session.commit()
+        self.counts["claimed"] += len(claimed)
+        return claimed
+
+    async def _renew_lease(self, job: Any) -> None:
+        """Push the job's lease forward every third of a lease until cancelled or taken over."""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                async with self.session_factory() as session:
+                    renewed = await session.execute(
+                        update(_table)
+                        .where(_table.c.id == job.id, _table.c.locked_by == self.worker_id)
+                        .values(locked_until=datetime.utcnow() + timedelta(seconds=self.lease))
+                    )
+                    await session.commit()
+            except Exception:
+                # Try again on the next beat; the lease has two more thirds to go
+                logger.exception("Job %s (%s): failed to renew its lease", job.id, job.task)
+                continue
+            if renewed.rowcount != 1:
+                return
+
+    async def _finish(self, session: AsyncSession, job: Any, error: Optional[str]) -> None:
+        """Requeue a failed job with backoff, or dead-letter it when out of attempts."""
+        values: Dict[str, Any] = {"locked_by": None, "locked_until": None, "last_error": error}
+        if job.attempts >= job.max_attempts or job.task not in tasks:
+            values["status"] = DEAD
+            self.counts["dead"] += 1
+        else:
+            values.update(status=QUEUED, run_at=datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts)))
+            self.counts["retried"] += 1
+        await session.execute(
+            update(_table).where(_table.c.id == job.id, _table.c.locked_by == self.worker_id).values(**values)
+        )
+        await session.commit()
+
+    async def _run(self, job: Any) -> None:
+        started = datetime.utcnow()
+        self.wait_seconds.append(max((started - job.run_at).total_seconds(), 0.0))
+        spec = tasks.get(job.task)
+        heartbeat = asyncio.create_task(self._renew_lease(job)) if self.lease > 0 else None
+        async with self.session_factory() as session:
+            try:
+                if spec is None:
+                    raise LookupError(f"Unknown task: {job.task}")
+                if job.attempts > job.max_attempts:
+                    raise RuntimeError("Lease expired on every attempt")
+                await spec.fn(session, job.payload)
+                done = await session.execute(
+                    delete(_table).where(_table.c.id == job.id, _table.c.locked_by == self.worker_id)
+                )
+                if done.rowcount != 1:
+                    # Our lease ran out and another worker took the job over
+                    await session.rollback()
+                    self.counts["lost"] += 1
+                    return
+                await session.commit()
+                self.counts["succeeded"] += 1
+            except asyncio.CancelledError:
+                # Shutting down: the lease runs out and another worker retries it
+                raise
+            except Exception:
+                await session.rollback()
+                logger.exception("Job %s (%s) failed on attempt %d", job.id, job.task, job.attempts)
+                await self._finish(session, job, traceback.format_exc(limit=20))
+            finally:
+                if heartbeat is not None:
+                    heartbeat.cancel()
+                self.run_seconds.append((datetime.utcnow() - started).total_seconds())
+
+    def _start(self, queue: str, job: Any) -> None:
+        running = asyncio.create_task(self._run(job))
+        active = self._active[queue]
+        active.add(running)
+
+        def done(finished: asyncio.Task) -> None:
+            active.discard(finished)
+            # A free slot: look for more work now rather than at the next poll
+            self._wakeup.set()
+
+        running.add_done_callback(done)
+
+    async def poll(self) -> int:
+        """Claim as many due jobs as the queue limits allow and start them; returns how many."""
+        started = 0
+        for queue, limit in self.queues.items():
+            free = limit - len(self._active[queue])
+            if free <= 0:
+                continue
+            for job in await self._claim(queue, limit, free):
+                self._start(queue, job)
+                started += 1
+        return started
+
+    async def drain(self) -> None:
+        """Run jobs until none is due (for tests and one-off runs)."""
+        while await self.poll() or any(self._active.values()):
+            await asyncio.gather(*(t for active in self._active.values() for t in active))
+
+    async def run(self) -> None:
+        """Poll for and run jobs until ``stop`` is called, then wait for running jobs."""
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                await self.poll()
+            except Exception:
+                self.counts["poll_errors"] += 1
+                logger.exception("Job worker %s failed to claim jobs", self.worker_id)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        running = [t for active in self._active.values() for t in active]
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    def start(self) -> None:
+        self._runner = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Stop claiming, give running jobs ``timeout`` seconds, then cancel them."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._runner is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._runner), timeout)
+        except asyncio.TimeoutError:
+            for active in self._active.values():
+                for running in active:
+                    running.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+        self._runner = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "running": {queue: len(self._active[queue]) for queue in self.queues},
+            "limits": dict(self.queues),
+            **{name: self.counts[name] for name in ("claimed", "succeeded", "retried", "dead", "lost", "poll_errors")},
+            "wait_seconds": _summarize(self.wait_seconds),
+            "run_seconds": _summarize(self.run_seconds),
+        }
+
+
+def build_worker(session_factory: Callable[[], AsyncSession]) -> JobWorker:
+    """A worker for the queues in ``JOB_QUEUES`` plus any other queue a task uses (limit 1)."""
+    queues = {spec.queue: 1 for spec in tasks.values()}
+    queues.update(parse_queues(settings.JOB_QUEUES))
+    return JobWorker(session_factory, queues, settings.JOB_POLL_SECONDS, settings.JOB_LEASE_SECONDS)
+
+
+async def queue_depths(session: AsyncSession) -> Dict[str, Dict[str, Any]]:
+    """Jobs per queue and status, with how long the oldest due job has waited."""
+    now = datetime.utcnow()
+    depths: Dict[str, Dict[str, Any]] = defaultdict(lambda: {QUEUED: 0, "due": 0, RUNNING: 0, DEAD: 0,
+                                                              "oldest_due_seconds": None})
+    result = await session.execute(
+        select(_table.c.queue, _table.c.status, func.count()).group_by(_table.c.queue, _table.c.status)
+    )
+    for queue, status, count in result:
+        depths[queue][status] = count
+    result = await session.execute(
+        select(_table.c.queue, func.count(), func.min(_table.c.run_at))
+        .where(_table.c.status == QUEUED, _table.c.run_at <= now)
+        .group_by(_table.c.queue)
+    )
+    for queue, count, oldest in result:
+        depths[queue]["due"] = count
+        depths[queue]["oldest_due_seconds"] = round((now - oldest).total_seconds(), 3)
+    return dict(depths)
+
+
+async def retry_dead_job(session: AsyncSession, job_id: uuid.UUID) -> bool:
+    """Queue a dead-lettered job again with fresh attempts; False if there is no such dead job."""
+    result = await session.execute(
+        update(_table)
+        .where(_table.c.id == job_id, _table.c.status == DEAD)
+        .values(status=QUEUED, attempts=0, run_at=datetime.utcnow(), last_error=None)
+    )
+    return result.rowcount == 1
+
+
+# This process's worker, when it runs one
+job_worker: Optional[JobWorker] = None
+
+
+def start_worker(session_factory: Callable[[], AsyncSession]) -> JobWorker:
+    global job_worker
+    job_worker = build_worker(session_factory)
+    job_worker.start()
+    return job_worker
+
+
+async def stop_worker() -> None:
+    global job_worker
+    if job_worker is not None:
+        await job_worker.stop()
+        job_worker = None
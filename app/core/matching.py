@@ -0,0 +1,256 @@
+"""Provider/request matching over an incrementally maintained inverted index.
+
+Repair requests (title, description) and services (service type, name,
+description) are tokenized into weighted term vectors of unit length and
+stored as postings in ``repair_request_terms`` and ``service_terms``. A
+provider's vector is the sum of its services' vectors, so a request's score
+for a provider is the sum of its cosine similarities with their services.
+
+Scores are precomputed into ``repair_request_matches`` by mapper events,
+inside the same flush (and so the same transaction) as the write:
+
+- a new or edited request is scored against the providers sharing any of
+  its terms, found through the ``service_terms`` postings;
+- a new, edited or deleted service rescores its provider against the
+  requests containing any of the service's old or new terms, found through
+  the ``repair_request_terms`` postings; no other request's score for the
+  provider can change.
+
+The feed then reads a provider's matches best first from an index, with no
+scoring at query time. Writes that bypass the ORM are not indexed;
+``rebuild_matches`` rebuilds everything from the source tables.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Collection, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import delete, distinct, event, func, insert, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.matching import RepairRequestMatch, RepairRequestTerm, ServiceTerm
+from app.models.repair_requests import RepairRequest
+from app.models.services import Service
+
+REQUEST_FIELDS = {"title": 2.0, "description": 1.0}
+SERVICE_FIELDS = {"service_type": 3.0, "name": 2.0, "description": 1.0}
+MAX_TERM_LENGTH = 64
+STOPWORDS = frozenset(
+    "a about after again all also am an and any are as at be been before being but by can could did do does "
+    "doing done for from get got had has have having he her here him his how i if in into is it its just me "
+    "more most my need needs no not now of off on once only or other our out over please so some still such "
+    "than that the their them then there these they this those through to too under until up very was we "
+    "were what when where which while who why will with would you your".split()
+)
+
+_terms = RepairRequestTerm.__table__
+_service_terms = ServiceTerm.__table__
+_matches = RepairRequestMatch.__table__
+
+
+def stem(word: str) -> str:
+    """Strip common English suffixes, so "leaking", "leaks" and "leaked" all give "leak"."""
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("ing") and len(word) > 5:
+        word = word[:-3]
+    elif word.endswith("ed") and len(word) > 4:
+        word = word[:-2]
+    elif word.endswith("er") and len(word) > 5:
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        word = word[:-1]
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: Optional[str]) -> Iterable[str]:
+    """Stemmed terms of ``text`` without stopwords, numbers and one- or two-letter words."""
+    for word in re.findall(r"[^\W\d_]+", (text or "").lower()):
+        if len(word) > 2 and word not in STOPWORDS:
+            yield stem(word)[:MAX_TERM_LENGTH]
+
+
+def term_vector(fields: Iterable[Tuple[Optional[str], float]]) -> Dict[str, float]:
+    """Unit-length term vector of weighted text fields, with log-scaled term counts."""
+    counts: Dict[str, float] = defaultdict(float)
+    for text, weight in fields:
+        for term, count in Counter(tokenize(text)).items():
+            counts[term] += weight * (1.0 + math.log(count))
+    norm = math.sqrt(sum(weight * weight for weight in counts.values()))
+    return {term: weight / norm for term, weight in counts.items()}
+
+
+def request_vector(target: Any) -> Dict[str, float]:
+    return term_vector((getattr(target, name), weight) for name, weight in REQUEST_FIELDS.items())
+
+
+def service_vector(target: Any) -> Dict[str, float]:
+    return term_vector((getattr(target, name), weight) for name, weight in SERVICE_FIELDS.items())
+
+
+def _changed(target: Any, attributes: Iterable[str]) -> bool:
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+# Index maintenance, on the flush's connection
+
+def _store_request_terms(connection: Connection, request_id: Any, vector: Dict[str, float]) -> None:
+    if vector:
+        connection.execute(insert(_terms), [
+            {"term": term, "repair_request_id": request_id, "weight": weight} for term, weight in vector.items()
+        ])
+
+
+def _store_service_terms(connection: Connection, service_id: Any, provider_id: Any, vector: Dict[str, float]) -> None:
+    if vector:
+        connection.execute(insert(_service_terms), [
+            {"term": term, "service_id": service_id, "provider_id": provider_id, "weight": weight}
+            for term, weight in vector.items()
+        ])
+
+
+def _score_request(connection: Connection, request_id: Any, vector: Dict[str, float]) -> None:
+    """Insert the request's match with every provider sharing one of its terms."""
+    if not vector:
+        return
+    postings = connection.execute(
+        select(_service_terms.c.provider_id, _service_terms.c.term, _service_terms.c.weight)
+        .where(_service_terms.c.term.in_(vector))
+    )
+    scores: Dict[Any, float] = defaultdict(float)
+    for provider_id, term, weight in postings:
+        scores[provider_id] += vector[term] * weight
+    if scores:
+        connection.execute(insert(_matches), [
+            {"provider_id": provider_id, "repair_request_id": request_id, "score": score}
+            for provider_id, score in scores.items()
+        ])
+
+
+def _scores(*where) -> Any:
+    """``(provider_id, repair_request_id, score)`` for service postings matching ``where``."""
+    return (
+        select(
+            _service_terms.c.provider_id,
+            _terms.c.repair_request_id,
+            func.sum(_terms.c.weight * _service_terms.c.weight),
+        )
+        .join_from(_service_terms, _terms, _terms.c.term == _service_terms.c.term)
+        .where(*where)
+        .group_by(_service_terms.c.provider_id, _terms.c.repair_request_id)
+    )
+
+
+def _score_provider(connection: Connection, provider_id: Any, terms: Collection[str]) -> None:
+    """Replace the provider's matches with the requests containing any of ``terms``."""
+    if not terms:
+        return
+    requests = select(_terms.c.repair_request_id).where(_terms.c.term.in_(terms))
+    connection.execute(
+        delete(_matches).where(_matches.c.provider_id == provider_id, _matches.c.repair_request_id.in_(requests))
+    )
+    connection.execute(insert(_matches).from_select(
+        ["provider_id", "repair_request_id", "score"],
+        _scores(_service_terms.c.provider_id == provider_id, _terms.c.repair_request_id.in_(requests)),
+    ))
+
+
+def _unindex_service(connection: Connection, service_id: Any) -> Set[str]:
+    """Delete the service's postings and return their terms."""
+    result = connection.execute(
+        delete(_service_terms).where(_service_terms.c.service_id == service_id).returning(_service_terms.c.term)
+    )
+    return set(result.scalars())
+
+
+def _unindex_request(connection: Connection, request_id: Any) -> None:
+    connection.execute(delete(_matches).where(_matches.c.repair_request_id == request_id))
+    connection.execute(delete(_terms).where(_terms.c.repair_request_id == request_id))
+
+
+# Repair requests
+
+@event.listens_for(RepairRequest, "after_insert")
+def _repair_request_inserted(mapper, connection, target: RepairRequest) -> None:
+    vector = request_vector(target)
+    _store_request_terms(connection, target.id, vector)
+    _score_request(connection, target.id, vector)
+
+
+@event.listens_for(RepairRequest, "after_update")
+def _repair_request_updated(mapper, connection, target: RepairRequest) -> None:
+    if _changed(target, REQUEST_FIELDS):
+        _unindex_request(connection, target.id)
+        _repair_request_inserted(mapper, connection, target)
+
+
+@event.listens_for(RepairRequest, "after_delete")
+def _repair_request_deleted(mapper, connection, target: RepairRequest) -> None:
+    _unindex_request(connection, target.id)
+
+
+# Services
+
+def _index_service(connection: Connection, target: Service, old_terms: Collection[str] = ()) -> None:
+    vector = service_vector(target)
+    _store_service_terms(connection, target.id, target.provider_id, vector)
+    _score_provider(connection, target.provider_id, {*old_terms, *vector})
+
+
+@event.listens_for(Service, "after_insert")
+def _service_inserted(mapper, connection, target: Service) -> None:
+    _index_service(connection, target)
+
+
+@event.listens_for(Service, "after_update")
+def _service_updated(mapper, connection, target: Service) -> None:
+    if not _changed(target, [*SERVICE_FIELDS, "provider_id"]):
+        return
+    old_terms = _unindex_service(connection, target.id)
+    previous = inspect(target).attrs.provider_id.history.deleted
+    if previous and previous[0] != target.provider_id:
+        # Moved to another provider: the old one loses the old terms, the new one gains the new
+        _index_service(connection, target)
+        _score_provider(connection, previous[0], old_terms)
+    else:
+        _index_service(connection, target, old_terms)
+
+
+@event.listens_for(Service, "after_delete")
+def _service_deleted(mapper, connection, target: Service) -> None:
+    # Where the database cascades the delete the postings are gone already; the row's fields give the terms
+    terms = _unindex_service(connection, target.id) or set(service_vector(target))
+    _score_provider(connection, target.provider_id, terms)
+
+
+def _rebuild(connection: Connection) -> Dict[str, int]:
+    for table in (_matches, _terms, _service_terms):
+        connection.execute(delete(table))
+    requests = connection.execute(
+        select(RepairRequest.id, *(getattr(RepairRequest, name) for name in REQUEST_FIELDS))
+    ).all()
+    for row in requests:
+        _store_request_terms(connection, row.id, request_vector(row))
+    services = connection.execute(
+        select(Service.id, Service.provider_id, *(getattr(Service, name) for name in SERVICE_FIELDS))
+    ).all()
+    for row in services:
+        _store_service_terms(connection, row.id, row.provider_id, service_vector(row))
+    connection.execute(insert(_matches).from_select(["provider_id", "repair_request_id", "score"], _scores()))
+    return {
+        "providers": connection.execute(select(func.count(distinct(_service_terms.c.provider_id)))).scalar_one(),
+        "matches": connection.execute(select(func.count()).select_from(_matches)).scalar_one(),
+    }
+
+
+async def rebuild_matches(session: AsyncSession) -> Dict[str, int]:
+    """Rebuild the term postings and every match from the source tables, in the caller's transaction.
+
+    The caller commits.
+    """
+    return await session.run_sync(lambda sync_session: _rebuild(sync_session.connection()))
@@ -0,0 +1,156 @@
+"""Keyset (cursor) pagination helpers for list endpoints."""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.compound import COMPOUND_MEDIA_TYPE, Embedded, compound_document
+from app.core.config import settings
+from app.core.serialization import ModelSerializer
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: Any, row_id: uuid.UUID) -> str:
+    """Encode the position after a row as an opaque, URL-safe cursor."""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, str(row_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column) -> Tuple[Any, uuid.UUID]:
+    """Decode a cursor produced by ``encode_cursor`` for ``sort_column``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        if sort_column.type.python_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+async def paginate(
+    session: AsyncSession,
+    statement: Select,
+    sort_column,
+    id_column,
+    *,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[List[Any], Optional[str]]:
+    """Run ``statement`` newest-first and return ``(items, next_cursor)``.
+
+    With a cursor the page starts strictly after that position using a
+    ``(sort_column, id) < (:value, :id)`` seek, so the cost does not grow with
+    page depth. Without one, ``skip`` is applied as an OFFSET for backwards
+    compatibility. Either way one extra row is fetched to tell whether a next
+    page exists.
+    """
+    statement = statement.order_by(sort_column.desc(), id_column.desc())
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_column)
+        statement = statement.where(tuple_(sort_column, id_column) < (sort_value, row_id))
+    elif skip:
+        statement = statement.offset(skip)
+
+    result = await session.execute(statement.limit(limit + 1))
+    rows = list(result.scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def page_response(
+    response: Response,
+    items: Sequence[Any],
+    next_cursor: Optional[str],
+    cursor: Optional[str],
+    serializer: Optional[ModelSerializer] = None,
+    embedded: Optional[Embedded] = None,
+) -> Any:
+    """Shape a paginated result for the client.
+
+    Callers that sent ``cursor`` (an empty value asks for the first page) get
+    ``{"items": [...], "next_cursor": ...}``; skip/limit callers keep the plain
+    list. The next cursor is also sent in the ``X-Next-Cursor`` header.
+
+    With a ``serializer`` (and ``FAST_JSON_RESPONSES`` on) the rows are dumped
+    directly and returned as an ``ORJSONResponse``, skipping response_model
+    validation. With ``embedded`` as well, the page is a compound document
+    (see ``app.core.compound``) whatever ``cursor`` was.
+    """
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    # A returned Response does not pick up headers set on the injected one
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+
+    if serializer is not None and embedded is not None:
+        document = compound_document(items, serializer, embedded)
+        return ORJSONResponse(
+            {"items": document["items"], "next_cursor": next_cursor, "included": document["included"]},
+            media_type=COMPOUND_MEDIA_TYPE,
+            headers=headers,
+        )
+
+    # Sparse fieldsets cannot pass response_model validation, so they always
+    # take the fast path
+    fast = serializer is not None and (settings.FAST_JSON_RESPONSES or serializer.include is not None)
+    if fast:
+        items = serializer.many(items)
+    if cursor is not None:
+        items = {"items": items, "next_cursor": next_cursor}
+    if fast:
+        return ORJSONResponse(items, headers=headers)
+    return items
+
+
+def annotated_response(
+    response: Response,
+    results: Sequence[Tuple[Any, Dict[str, Any]]],
+    serializer: ModelSerializer,
+    next_cursor: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> ORJSONResponse:
+    """Shape ``(row, extra)`` pairs: each row's fields plus the ``extra`` keys.
+
+    The extra keys are not part of the response_model, so this always takes
+    the fast path. ``next_cursor``/``cursor`` work as in ``page_response``.
+    """
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    items = []
+    for row, extra in results:
+        item = serializer(row)
+        item.update(extra)
+        items.append(item)
+    if cursor is not None:
+        return ORJSONResponse({"items": items, "next_cursor": next_cursor}, headers=headers)
+    return ORJSONResponse(items, headers=headers)
+
+
+def search_response(
+    response: Response,
+    results: Sequence[Tuple[Any, float, str]],
+    serializer: ModelSerializer,
+) -> ORJSONResponse:
+    """Shape ranked search results: each row plus its ``rank`` and highlighted ``snippet``."""
+    return annotated_response(
+        response, [(row, {"rank": rank, "snippet": snippet}) for row, rank, snippet in results], serializer
+    )
@@ -1,75 +1,110 @@
 """Role-based permission guards for endpoints."""
 
-from typing import List
+from typing import List, Union
 from fastapi import Depends, HTTPException, status
+from app.core.config import settings
+from app.core.security import ClaimsPrincipal, current_claims_principal
 from app.core.users import current_active_user
 from app.models.users import User
 from app.models.user_roles import UserRole
 
+PROVIDER_ROLES = [UserRole.PROVIDER_INDIVIDUAL, UserRole.PROVIDER_ORGANIZATION]
+
+Principal = Union[User, ClaimsPrincipal]
+
+# Read-only endpoints resolve the caller from the verified token claims unless
+# AUTH_TRUST_ROLE_CLAIMS is disabled, in which case they load the user row too.
+current_principal = (
+    current_claims_principal if settings.AUTH_TRUST_ROLE_CLAIMS else current_active_user
+)
+
+
+def _check_role(principal: Principal, allowed_roles: List[UserRole], detail: str) -> Principal:
+    if principal.role not in allowed_roles:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+    return principal
+
 
 def require_roles(allowed_roles: List[UserRole]):
     """
     Dependency factory that creates a role-based guard.
-    
+
     Args:
         allowed_roles: List of roles that are allowed to access the endpoint
-    
+
     Returns:
         Dependency function that checks user role
     """
     def role_guard(current_user: User = Depends(current_active_user)) -> User:
-        if current_user.role not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required roles: {[role.value for role in allowed_roles]}"
-            )
-        return current_user
-    
+        return _check_role(
+            current_user,
+            allowed_roles,
+            f"Access denied. Required roles: {[role.value for role in allowed_roles]}",
+        )
+
     return role_guard
 
 
 # Specific role guards for common use cases
 def require_user_role(current_user: User = Depends(current_active_user)) -> User:
     """Guard that only allows users with 'user' role."""
-    if current_user.role != UserRole.USER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Only users can access this endpoint."
-        )
-    return current_user
+    return _check_role(
+        current_user, [UserRole.USER], "Access denied. Only users can access this endpoint."
+    )
 
 
 def require_provider_role(current_user: User = Depends(current_active_user)) -> User:
     """Guard that only allows users with provider roles."""
-    if current_user.role not in [UserRole.PROVIDER_INDIVIDUAL, UserRole.PROVIDER_ORGANIZATION]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Only service providers can access this endpoint."
-        )
-    return current_user
+    return _check_role(
+        current_user,
+        PROVIDER_ROLES,
+        "Access denied. Only service providers can access this endpoint.",
+    )
 
 
 def require_admin_role(current_user: User = Depends(current_active_user)) -> User:
     """Guard that only allows users with 'admin' role."""
-    if current_user.role != UserRole.ADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Only administrators can access this endpoint."
-        )
-    return current_user
+    return _check_role(
+        current_user,
+        [UserRole.ADMIN],
+        "Access denied. Only administrators can access this endpoint.",
+    )
 
 
 def require_admin_or_provider_role(current_user: User = Depends(current_active_user)) -> User:
     """Guard that allows admins and providers."""
-    allowed_roles = [UserRole.ADMIN, UserRole.PROVIDER_INDIVIDUAL, UserRole.PROVIDER_ORGANIZATION]
-    if current_user.role not in allowed_roles:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Only administrators and service providers can access this endpoint."
-        )
-    return current_user
+    return _check_role(
+        current_user,
+        [UserRole.ADMIN, *PROVIDER_ROLES],
+        "Access denied. Only administrators and service providers can access this endpoint.",
+    )
 
 
 def require_any_authenticated_user(current_user: User = Depends(current_active_user)) -> User:
     """Guard that allows any authenticated user (for general endpoints)."""
     return current_user
+
+
+# Claims-based guards for read-only endpoints. They return a principal with
+# ``id`` and ``role`` only; use the guards above when the full user row is needed.
+def require_user_claims(principal: Principal = Depends(current_principal)) -> Principal:
+    """Claims-based guard that only allows users with 'user' role."""
+    return _check_role(
+        principal, [UserRole.USER], "Access denied. Only users can access this endpoint."
+    )
+
+
+def require_provider_claims(principal: Principal = Depends(current_principal)) -> Principal:
+    """Claims-based guard that only allows users with provider roles."""
+    return _check_role(
+        principal,
+        PROVIDER_ROLES,
+        "Access denied. Only service providers can access this endpoint.",
+    )
+
+
+def require_any_authenticated_claims(
+    principal: Principal = Depends(current_principal),
+) -> Principal:
+    """Claims-based guard that allows any authenticated user."""
+    return principal
@@ -0,0 +1,99 @@
+"""Cache of rendered catalog responses, invalidated by entity tag.
+
+Catalog lists (``GET /services/``, ``GET /providers/``) are the same for
+every caller allowed to see them, so the rendered body is cached per route,
+query string and Accept header. Entries are tagged with the tables they were
+built from; write handlers call ``invalidate`` with those tags after they
+commit.
+
+With ``SHARED_CACHE_URL`` set, rendered bodies are also stored in the shared
+tier and invalidations reach every worker (see ``app.core.shared_cache``).
+Without it each worker keeps serving its copy until it expires after
+``RESPONSE_CACHE_TTL_SECONDS``.
+
+Only fast-path responses (``ORJSONResponse`` and friends) are cached; with
+``FAST_JSON_RESPONSES`` off the endpoints return plain objects and bypass it.
+"""
+
+from typing import Any, Iterable, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+
+from app.core.cache import TaggedCache
+from app.core.config import settings
+from app.core.etags import etag_matches
+from app.core.shared_cache import TwoTierCache
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+
+def _encode(entry: Tuple[bytes, str, dict]) -> bytes:
+    body, media_type, headers = entry
+    return orjson.dumps({"media_type": media_type, "headers": headers}) + b"\n" + body
+
+
+def _decode(data: bytes) -> Tuple[bytes, str, dict]:
+    meta, _, body = data.partition(b"\n")
+    meta = orjson.loads(meta)
+    return body, meta["media_type"], meta["headers"]
+
+
+response_cache = TwoTierCache(
+    "responses",
+    TaggedCache(maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL_SECONDS),
+    encode=_encode,
+    decode=_decode,
+)
+
+
+def _enabled() -> bool:
+    return settings.RESPONSE_CACHE_TTL_SECONDS > 0
+
+
+def request_key(request: Request) -> str:
+    """Identify a request by path, sorted query params and Accept header."""
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    return f"{request.url.path}?{query}|{request.headers.get('accept', '')}"
+
+
+async def cached_response(request: Request) -> Optional[Response]:
+    """Return the cached response for this request, or None on a miss.
+
+    A cached entry that carries an ETag matching ``If-None-Match`` is
+    answered with 304.
+    """
+    if not _enabled():
+        return None
+    entry = await response_cache.get(request_key(request))
+    if entry is None:
+        return None
+
+    body, media_type, headers = entry
+    headers = {**headers, CACHE_STATUS_HEADER: "HIT"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and "etag" in headers and etag_matches(if_none_match, headers["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+async def cache_response(request: Request, response: Any, tags: Iterable[str]) -> Any:
+    """Store a rendered 200 response under ``tags`` and pass it through."""
+    if not _enabled() or not isinstance(response, Response) or response.status_code != 200:
+        return response
+    headers = {
+        k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")
+    }
+    await response_cache.set(
+        request_key(request),
+        (response.body, response.media_type, headers),
+        tags=tags,
+        size=len(response.body) + sum(len(k) + len(v) for k, v in headers.items()),
+    )
+    response.headers[CACHE_STATUS_HEADER] = "MISS"
+    return response
+
+
+async def invalidate(*tags: str) -> int:
+    """Drop every cached response built from any of ``tags`` (table names), in every worker."""
+    return await response_cache.invalidate_tags(*tags)
@@ -3,6 +3,8 @@
 import uuid
 from typing import Optional, Dict, Any
 
+import jwt
+from fastapi import Depends, HTTPException, status
 from fastapi_users.authentication import (
     JWTStrategy,
     AuthenticationBackend,
@@ -11,6 +13,7 @@ from fastapi_users.authentication import (
 from fastapi_users.jwt import decode_jwt, generate_jwt
 
 from app.core.config import settings
+from app.models.user_roles import UserRole
 
 
 # Bearer transport defines how tokens are sent by clients (Authorization header)
@@ -50,3 +53,59 @@ auth_backend = AuthenticationBackend(
     transport=bearer_transport,
     get_strategy=get_jwt_strategy,
 )
+
+
+class ClaimsPrincipal:
+    """Authenticated identity built from verified JWT claims, without a DB lookup.
+
+    The role is whatever it was when the token was issued, so a role change or
+    deactivation only takes effect once the token expires. Use the full
+    ``current_active_user`` lookup for endpoints where that matters.
+    """
+
+    is_active = True
+
+    def __init__(
+        self,
+        id: uuid.UUID,
+        role: UserRole,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+    ):
+        self.id = id
+        self.role = role
+        self.first_name = first_name
+        self.last_name = last_name
+
+    def __repr__(self) -> str:
+        return f"ClaimsPrincipal(id={self.id}, role={self.role.value})"
+
+
+def read_token_claims(token: str) -> Optional[ClaimsPrincipal]:
+    """Verify a token and build a principal from its claims, or return None."""
+    strategy = get_jwt_strategy()
+    try:
+        data: Dict[str, Any] = decode_jwt(
+            token,
+            strategy.decode_key,
+            strategy.token_audience,
+            algorithms=[strategy.algorithm],
+        )
+        return ClaimsPrincipal(
+            id=uuid.UUID(data["sub"]),
+            role=UserRole(data["role"]),
+            first_name=data.get("first_name"),
+            last_name=data.get("last_name"),
+        )
+    except (jwt.PyJWTError, KeyError, ValueError):
+        return None
+
+
+async def current_claims_principal(
+    token: Optional[str] = Depends(bearer_transport.scheme),
+) -> ClaimsPrincipal:
+    """Dependency returning the principal from the bearer token claims."""
+    principal = read_token_claims(token) if token else None
+    if principal is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+    return principal
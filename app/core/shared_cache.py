@@ -0,0 +1,451 @@
+"""Two-tier caching: a per-worker L1 in front of a tier shared by every worker.
+
+Gunicorn runs ``WEB_CONCURRENCY`` worker processes, each with its own
+in-process caches. ``TwoTierCache`` keeps that L1 (a ``TaggedCache``) and
+adds an L2 that all workers on all hosts share, so a page rendered by one
+worker is served from L2 by the others instead of being rebuilt.
+
+Invalidations go through the shared tier as well: the writing worker drops
+its own L1 entries, deletes the L2 entries and publishes the event; every
+other worker's listener drops its L1 entries when the event arrives.
+
+``SHARED_CACHE_URL`` picks the backend:
+
+* ``""``: no shared tier, caches are per-worker as before.
+* ``sqlite:///path/cache.db``: a SQLite file, polled for invalidations. Only
+  for workers on one host (and for tests).
+* ``redis://host:6379/0``: any Redis-protocol server, invalidations over
+  pub/sub. Needs the ``redis`` extra.
+
+The shared tier is an optimization: if it fails, lookups fall back to L1 and
+the database, and the error is counted in ``stats()``.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterable, Optional, Sequence
+
+import aiosqlite
+import orjson
+
+from app.core.cache import MISSING, TaggedCache
+
+logger = logging.getLogger(__name__)
+
+# Published invalidations older than this are pruned from the SQLite event log
+EVENT_RETENTION_SECONDS = 60.0
+
+
+class SharedBackend(ABC):
+    """Storage and invalidation fan-out shared by every worker."""
+
+    name = "none"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float, tags: Sequence[str]) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, keys: Sequence[str] = (), tags: Sequence[str] = ()) -> None:
+        """Delete the given keys and every key stored under any of ``tags``."""
+
+    @abstractmethod
+    async def publish(self, message: bytes) -> None:
+        ...
+
+    @abstractmethod
+    async def subscribe(self) -> AsyncIterator[bytes]:
+        """Start listening; the returned iterator yields every message published since, by any worker."""
+
+    async def close(self) -> None:
+        pass
+
+
+class SQLiteBackend(SharedBackend):
+    """Shared tier in a SQLite file, for workers on a single host.
+
+    Invalidations are appended to an event table that each worker polls
+    every ``poll_interval`` seconds.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, poll_interval: float = 0.2):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> aiosqlite.Connection:
+        async with self._lock:
+            if self._db is None:
+                db = await aiosqlite.connect(self.path)
+                await db.execute("PRAGMA journal_mode=WAL")
+                await db.execute("PRAGMA busy_timeout=5000")
+                await db.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS cache_entries (
+                        key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS cache_tags (
+                        tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key)
+                    );
+                    CREATE TABLE IF NOT EXISTS cache_events (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        message BLOB NOT NULL,
+                        created_at REAL NOT NULL
+                    );
+                    """
+                )
+                await db.commit()
+                self._db = db
+            return self._db
+
+    async def get(self, key: str) -> Optional[bytes]:
+        db = await self._connect()
+        async with db.execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ) as cursor:
+            row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Sequence[str]) -> None:
+        db = await self._connect()
+        now = time.time()
+        await db.execute(
+            "DELETE FROM cache_tags WHERE key IN (SELECT key FROM cache_entries WHERE expires_at <= ?)", (now,)
+        )
+        await db.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        await db.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, now + ttl),
+        )
+        await db.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+        await db.executemany(
+            "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)", [(tag, key) for tag in tags]
+        )
+        await db.commit()
+
+    async def delete(self, keys: Sequence[str] = (), tags: Sequence[str] = ()) -> None:
+        db = await self._connect()
+        keys = list(keys)
+        if tags:
+            marks = ",".join("?" * len(tags))
+            async with db.execute(f"SELECT key FROM cache_tags WHERE tag IN ({marks})", list(tags)) as cursor:
+                keys.extend(row[0] for row in await cursor.fetchall())
+        await db.executemany("DELETE FROM cache_entries WHERE key = ?", [(key,) for key in keys])
+        await db.executemany("DELETE FROM cache_tags WHERE key = ?", [(key,) for key in keys])
+        await db.commit()
+
+    async def publish(self, message: bytes) -> None:
+        db = await self._connect()
+        now = time.time()
+        await db.execute("INSERT INTO cache_events (message, created_at) VALUES (?, ?)", (message, now))
+        await db.execute("DELETE FROM cache_events WHERE created_at < ?", (now - EVENT_RETENTION_SECONDS,))
+        await db.commit()
+
+    async def subscribe(self) -> AsyncIterator[bytes]:
+        db = await self._connect()
+        async with db.execute("SELECT COALESCE(MAX(id), 0) FROM cache_events") as cursor:
+            (last_id,) = await cursor.fetchone()
+        return self._poll(db, last_id)
+
+    async def _poll(self, db: aiosqlite.Connection, last_id: int) -> AsyncIterator[bytes]:
+        while True:
+            async with db.execute(
+                "SELECT id, message FROM cache_events WHERE id > ? ORDER BY id", (last_id,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+            for last_id, message in rows:
+                yield message
+            await asyncio.sleep(self.poll_interval)
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+
+class RedisBackend(SharedBackend):
+    """Shared tier on a Redis-protocol server, invalidations over pub/sub.
+
+    Tags are Redis sets of the keys stored under them.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, channel: str = "cache-invalidations"):
+        import redis.asyncio as redis  # optional: pip install "demo_mvp[redis]"
+
+        self.channel = channel
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Sequence[str]) -> None:
+        ttl_ms = max(int(ttl * 1000), 1)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, value, px=ttl_ms)
+            for tag in tags:
+                pipe.sadd(f"tag:{tag}", key)
+                pipe.pexpire(f"tag:{tag}", ttl_ms)
+            await pipe.execute()
+
+    async def delete(self, keys: Sequence[str] = (), tags: Sequence[str] = ()) -> None:
+        keys = list(keys)
+        for tag in tags:
+            keys.extend(await self._redis.smembers(f"tag:{tag}"))
+        keys.extend(f"tag:{tag}" for tag in tags)
+        if keys:
+            await self._redis.delete(*keys)
+
+    async def publish(self, message: bytes) -> None:
+        await self._redis.publish(self.channel, message)
+
+    async def subscribe(self) -> AsyncIterator[bytes]:
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        return self._messages(pubsub)
+
+    async def _messages(self, pubsub: Any) -> AsyncIterator[bytes]:
+        try:
+            async for message in pubsub.listen():
+                yield message["data"]
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def build_backend(url: str) -> Optional[SharedBackend]:
+    """Create the backend for ``SHARED_CACHE_URL``; None when it is empty."""
+    if not url:
+        return None
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported SHARED_CACHE_URL: {url}")
+
+
+class SharedTier:
+    """This worker's connection to the shared tier and its invalidation listener."""
+
+    def __init__(self) -> None:
+        self.backend: Optional[SharedBackend] = None
+        self.origin = uuid.uuid4().hex
+        self._caches: Dict[str, "TwoTierCache"] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self.events_received = 0
+        self.listener_errors = 0
+
+    def register(self, cache: "TwoTierCache") -> None:
+        self._caches[cache.name] = cache
+
+    async def start(self, url: str) -> None:
+        backend = build_backend(url)
+        if backend is None:
+            return
+        self.backend = backend
+        started = asyncio.Event()
+        self._listener = asyncio.create_task(self._listen(started))
+        await started.wait()
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self.backend is not None:
+            await self.backend.close()
+            self.backend = None
+
+    async def _listen(self, started: asyncio.Event) -> None:
+        while True:
+            try:
+                messages = await self.backend.subscribe()
+                started.set()
+                async for message in messages:
+                    self._apply(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # L1 entries missed while disconnected expire after their TTL
+                self.listener_errors += 1
+                started.set()
+                logger.exception("Shared cache listener failed; reconnecting")
+                await asyncio.sleep(1.0)
+
+    def _apply(self, message: bytes) -> None:
+        event = orjson.loads(message)
+        if event["origin"] == self.origin:
+            return
+        self.events_received += 1
+        cache = self._caches.get(event["cache"])
+        if cache is not None:
+            cache.apply_invalidation(event["keys"], event["tags"])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name if self.backend else None,
+            "listening": self._listener is not None and not self._listener.done(),
+            "events_received": self.events_received,
+            "listener_errors": self.listener_errors,
+        }
+
+
+shared_tier = SharedTier()
+
+
+class TwoTierCache:
+    """A ``TaggedCache`` L1 backed by the shared tier.
+
+    Values are stored in L2 only when ``encode``/``decode`` are given;
+    without them the cache stays per-worker but its invalidations still
+    reach every worker. Keys must round-trip through ``str`` and
+    ``key_type`` so invalidations can name them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        l1: TaggedCache,
+        tier: SharedTier = shared_tier,
+        encode: Optional[Callable[[Any], bytes]] = None,
+        decode: Optional[Callable[[bytes], Any]] = None,
+        key_type: Callable[[str], Hashable] = str,
+    ):
+        self.name = name
+        self.l1 = l1
+        self.tier = tier
+        self._encode = encode
+        self._decode = decode
+        self._key_type = key_type
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+        tier.register(self)
+
+    @property
+    def hits(self) -> int:
+        return self.l1.hits
+
+    def __len__(self) -> int:
+        return len(self.l1)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.l1
+
+    def _shared(self) -> Optional[SharedBackend]:
+        return self.tier.backend if self._encode is not None else None
+
+    def _l2_key(self, key: Hashable) -> str:
+        return f"{self.name}:{key}"
+
+    def _l2_tags(self, tags: Iterable[str]) -> list:
+        return [f"{self.name}:{tag}" for tag in tags]
+
+    async def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.l1.get(key, MISSING)
+        if value is not MISSING:
+            return value
+        backend = self._shared()
+        if backend is None:
+            return default
+        try:
+            raw = await backend.get(self._l2_key(key))
+        except Exception:
+            self.l2_errors += 1
+            logger.exception("Shared cache get failed for %s", self.name)
+            return default
+        if raw is None:
+            self.l2_misses += 1
+            return default
+
+        self.l2_hits += 1
+        header, _, payload = raw.partition(b"\n")
+        meta = orjson.loads(header)
+        value = self._decode(payload)
+        ttl = meta["expires_at"] - time.time()
+        if ttl > 0:
+            self.l1.set(key, value, ttl=min(ttl, self.l1.ttl), tags=meta["tags"], size=meta["size"])
+        return value
+
+    async def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        size: int = 0,
+    ) -> None:
+        tags = tuple(tags)
+        ttl = self.l1.ttl if ttl is None else ttl
+        self.l1.set(key, value, ttl=ttl, tags=tags, size=size)
+        backend = self._shared()
+        if backend is None:
+            return
+        header = orjson.dumps({"tags": tags, "size": size, "expires_at": time.time() + ttl})
+        try:
+            await backend.set(self._l2_key(key), header + b"\n" + self._encode(value), ttl, self._l2_tags(tags))
+        except Exception:
+            self.l2_errors += 1
+            logger.exception("Shared cache set failed for %s", self.name)
+
+    async def invalidate(self, key: Hashable) -> bool:
+        dropped = self.l1.invalidate(key)
+        await self._propagate(keys=[str(key)])
+        return dropped
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Drop entries carrying any of ``tags`` here, in L2 and in every other worker."""
+        dropped = self.l1.invalidate_tags(*tags)
+        await self._propagate(tags=list(tags))
+        return dropped
+
+    async def _propagate(self, keys: Sequence[str] = (), tags: Sequence[str] = ()) -> None:
+        backend = self.tier.backend
+        if backend is None:
+            return
+        try:
+            if self._shared() is not None:
+                await backend.delete([self._l2_key(key) for key in keys], self._l2_tags(tags))
+            await backend.publish(orjson.dumps({
+                "origin": self.tier.origin, "cache": self.name, "keys": keys, "tags": tags,
+            }))
+        except Exception:
+            self.l2_errors += 1
+            logger.exception("Shared cache invalidation failed for %s", self.name)
+
+    def apply_invalidation(self, keys: Sequence[str], tags: Sequence[str]) -> None:
+        """Apply an invalidation published by another worker to this worker's L1."""
+        for key in keys:
+            self.l1.invalidate(self._key_type(key))
+        if tags:
+            self.l1.invalidate_tags(*tags)
+
+    def clear(self) -> None:
+        """Clear this worker's L1 only."""
+        self.l1.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.l1.stats()
+        stats["shared"] = {
+            "enabled": self._shared() is not None,
+            "hits": self.l2_hits,
+            "misses": self.l2_misses,
+            "errors": self.l2_errors,
+        }
+        return stats
@@ -0,0 +1,246 @@
+"""Offline similarity between repair requests and services on hashed TF-IDF vectors.
+
+Texts become fixed-size vectors with a hashing vectorizer. Its features are:
+
+- the stemmed words (``app.core.matching.tokenize``);
+- character trigrams of each word, so "plumber" and "plumbing" overlap;
+- trade concepts from a small built-in lexicon, so "leaking tap" and a
+  "Plumbing" service share the ``plumbing`` concept even with no word in
+  common.
+
+Each feature is hashed with blake2b (stable across processes, unlike
+``hash()``) into one of ``dimensions`` signed buckets. No model is
+downloaded; everything runs on NumPy.
+
+Every service is one row of a float32 matrix, weighted by IDF over the
+services and L2-normalized, saved as ``.npy`` files and memory-mapped. The
+snapshot is stamped with the ``services`` table version from
+``app.core.etags``. A lookup reads that version (one primary-key lookup)
+and uses the snapshot on disk if it is current; otherwise the first worker
+to notice rebuilds and atomically swaps the files. Worker restarts just map
+the files again. Top-k is one matrix product and an ``argpartition`` for a
+whole batch of queries.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.etags import table_versions
+from app.core.matching import REQUEST_FIELDS, SERVICE_FIELDS, stem, tokenize
+from app.models.services import Service
+
+CHAR_NGRAM = 3
+CHAR_NGRAM_WEIGHT = 0.25
+CONCEPT_WEIGHT = 1.5
+# Trade concept -> words that imply it (stemmed when the lexicon is built)
+TRADE_LEXICON = {
+    "plumbing": "plumbing plumber tap faucet pipe leak drip drain sink toilet cistern shower bath basin valve "
+                "water sewer blocked clog flush washer stopcock",
+    "heating": "heating boiler radiator thermostat heater furnace hot cold pressure pilot underfloor gas",
+    "electrical": "electrical electrician socket switch fuse breaker wiring wire light lamp bulb power outlet "
+                  "trip tripping spark sparks circuit voltage",
+    "carpentry": "carpentry carpenter joiner door hinge cupboard cabinet shelf wood floorboard skirting "
+                 "staircase stair banister frame squeaky",
+    "roofing": "roofing roofer roof tile slate gutter chimney flashing loft felt downpipe",
+    "glazing": "glazing glazier window glass pane double seal condensation",
+    "appliances": "appliance appliances oven cooker hob fridge freezer dishwasher washing dryer microwave",
+    "locksmith": "locksmith lock key locked deadbolt latch",
+    "decorating": "decorating decorator paint painting wallpaper plaster crack ceiling wall damp mould",
+    "gardening": "gardening gardener garden fence lawn hedge tree patio decking gate shed",
+}
+
+
+def _lexicon() -> Dict[str, List[str]]:
+    concepts: Dict[str, List[str]] = defaultdict(list)
+    for concept, words in TRADE_LEXICON.items():
+        for word in words.split():
+            concepts[stem(word)].append(concept)
+    return dict(concepts)
+
+
+CONCEPTS = _lexicon()
+
+
+def features(fields: Iterable[Tuple[Optional[str], float]]) -> Dict[str, float]:
+    """Weighted feature counts of text fields, before hashing."""
+    counts: Dict[str, float] = defaultdict(float)
+    for text, weight in fields:
+        for word in tokenize(text):
+            counts["w:" + word] += weight
+            padded = f"<{word}>"
+            for i in range(len(padded) - CHAR_NGRAM + 1):
+                counts["c:" + padded[i:i + CHAR_NGRAM]] += weight * CHAR_NGRAM_WEIGHT
+            for concept in CONCEPTS.get(word, ()):
+                counts["t:" + concept] += weight * CONCEPT_WEIGHT
+    return counts
+
+
+def _bucket(feature: str, dimensions: int) -> Tuple[int, float]:
+    digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+    return digest % dimensions, -1.0 if digest >> 63 else 1.0
+
+
+def vectorize(documents: Sequence[Iterable[Tuple[Optional[str], float]]], dimensions: int) -> np.ndarray:
+    """Hashed, log-scaled term frequencies of ``documents`` as a ``(len(documents), dimensions)`` matrix."""
+    rows: List[int] = []
+    columns: List[int] = []
+    values: List[float] = []
+    for row, fields in enumerate(documents):
+        for feature, count in features(fields).items():
+            column, sign = _bucket(feature, dimensions)
+            rows.append(row)
+            columns.append(column)
+            values.append(sign * (1.0 + math.log1p(count)))
+    matrix = np.zeros((len(documents), dimensions), dtype=np.float32)
+    np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(columns, dtype=np.intp)), values)
+    return matrix
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def request_documents(requests: Iterable) -> List[List[Tuple[Optional[str], float]]]:
+    return [[(getattr(r, name), weight) for name, weight in REQUEST_FIELDS.items()] for r in requests]
+
+
+def service_documents(services: Iterable) -> List[List[Tuple[Optional[str], float]]]:
+    return [[(getattr(s, name), weight) for name, weight in SERVICE_FIELDS.items()] for s in services]
+
+
+@dataclass
+class Snapshot:
+    """Service vectors as of one ``services`` table version."""
+
+    stamp: str
+    ids: np.ndarray  # (n, 16) uint8 UUID bytes
+    vectors: np.ndarray  # (n, dimensions) float32, unit rows
+    idf: np.ndarray  # (dimensions,) float32
+
+    def embed(self, documents: Sequence[Iterable[Tuple[Optional[str], float]]]) -> np.ndarray:
+        """Unit query vectors for ``documents`` in this snapshot's IDF space."""
+        return _normalize(vectorize(documents, self.idf.shape[0]) * self.idf)
+
+    def top_k(self, queries: np.ndarray, k: int) -> List[List[Tuple[uuid.UUID, float]]]:
+        """The ``k`` most similar services for each query row, best first, with cosine similarity."""
+        if not len(self.ids) or k <= 0:
+            return [[] for _ in queries]
+        scores = self.vectors @ queries.T  # (services, queries)
+        k = min(k, scores.shape[0])
+        best = np.argpartition(-scores, k - 1, axis=0)[:k]
+        results = []
+        for column in range(scores.shape[1]):
+            picked = best[:, column]
+            picked = picked[np.argsort(-scores[picked, column], kind="stable")]
+            results.append([
+                (uuid.UUID(bytes=self.ids[i].tobytes()), float(scores[i, column]))
+                for i in picked if scores[i, column] > 0
+            ])
+        return results
+
+
+class SimilarityIndex:
+    """Memory-mapped service vectors under ``directory``, rebuilt when the services table changes."""
+
+    def __init__(self, directory: str, dimensions: int):
+        self.directory = Path(directory)
+        self.dimensions = dimensions
+        self._snapshot: Optional[Snapshot] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.directory / "services.json"
+
+    def _files(self, token: str) -> Dict[str, Path]:
+        return {name: self.directory / f"services-{token}.{name}.npy" for name in ("ids", "vectors", "idf")}
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            return json.loads(self._meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _load(self, stamp: str) -> Optional[Snapshot]:
+        """Map the snapshot on disk if it was built for ``stamp``."""
+        meta = self._read_meta()
+        if not meta or meta.get("stamp") != stamp or meta.get("dimensions") != self.dimensions:
+            return None
+        files = self._files(meta["token"])
+        try:
+            # An empty matrix has no data to map
+            mode = "r" if meta["rows"] else None
+            return Snapshot(
+                stamp,
+                np.load(files["ids"], mmap_mode=mode),
+                np.load(files["vectors"], mmap_mode=mode),
+                np.load(files["idf"]),
+            )
+        except (OSError, ValueError):
+            return None
+
+    def _build(self, stamp: str, services: Sequence) -> Snapshot:
+        """Vectorize ``services``, write the files and swap them in."""
+        raw = vectorize(service_documents(services), self.dimensions)
+        document_frequency = np.count_nonzero(raw, axis=0)
+        idf = (np.log((1.0 + len(services)) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+        vectors = _normalize(raw * idf)
+        ids = np.frombuffer(b"".join(s.id.bytes for s in services), dtype=np.uint8).reshape(-1, 16)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        previous = self._read_meta()
+        token = uuid.uuid4().hex
+        files = self._files(token)
+        for name, array in (("ids", ids), ("vectors", vectors), ("idf", idf)):
+            np.save(files[name], array)
+        meta = {"stamp": stamp, "token": token, "rows": len(services), "dimensions": self.dimensions}
+        staging = self._meta_path.with_suffix(f".{token}.tmp")
+        staging.write_text(json.dumps(meta))
+        os.replace(staging, self._meta_path)
+        # Workers still mapping the old files keep them alive until they remap
+        if previous and previous.get("token") != token:
+            for path in self._files(previous["token"]).values():
+                path.unlink(missing_ok=True)
+        return self._load(stamp) or Snapshot(stamp, ids, vectors, idf)
+
+    async def snapshot(self, session: AsyncSession) -> Snapshot:
+        """The current snapshot, mapped from disk or rebuilt if services changed since."""
+        bind = session.get_bind()
+        stamp = f"{bind.url.render_as_string(hide_password=True)}#{await table_versions(session, ('services',))}"
+        if self._snapshot is not None and self._snapshot.stamp == stamp:
+            return self._snapshot
+        async with self._lock:
+            if self._snapshot is None or self._snapshot.stamp != stamp:
+                snapshot = await asyncio.to_thread(self._load, stamp)
+                if snapshot is None:
+                    result = await session.execute(
+                        select(Service.id, *(getattr(Service, name) for name in SERVICE_FIELDS))
+                        .order_by(Service.id)
+                    )
+                    snapshot = await asyncio.to_thread(self._build, stamp, result.all())
+                self._snapshot = snapshot
+        return self._snapshot
+
+    async def similar_services(
+        self, session: AsyncSession, requests: Sequence, k: int
+    ) -> List[List[Tuple[uuid.UUID, float]]]:
+        """The ``k`` services most similar to each repair request, best first."""
+        snapshot = await self.snapshot(session)
+        return snapshot.top_k(snapshot.embed(request_documents(requests)), k)
+
+
+service_similarity = SimilarityIndex(settings.SIMILARITY_INDEX_DIR, settings.SIMILARITY_DIMENSIONS)
@@ -0,0 +1,102 @@
+"""Single-flight coalescing of identical concurrent reads.
+
+When many identical requests arrive together (a batch of providers logging in
+and loading the same first page), only the first one, the leader, runs the
+query and renders the response. The rest await the leader's result and each
+get their own copy of the rendered body. Their sessions are never used, so
+they never check out a connection.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.response_cache import request_key
+
+
+class _LeaderCancelled(Exception):
+    """The leader went away (client disconnect); a waiter takes over."""
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its outcome."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.waiting = 0
+        self.max_waiting = 0
+        self.executions = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                result = await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue
+            finally:
+                self.waiting -= 1
+            self.shared += 1
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()  # Nobody may be waiting; mark it retrieved
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "executions": self.executions,
+            "shared": self.shared,
+        }
+
+
+read_flight = SingleFlight()
+
+
+async def coalesce(request: Request, render: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``render`` for this request, sharing it with identical concurrent requests.
+
+    Requests are identical when path, query string, Accept and If-None-Match
+    all match, so a shared 304 is only ever sent to callers that asked for
+    it. Only rendered ``Response`` objects are shared; each caller gets its own
+    copy. The endpoint must not depend on who is calling beyond the route's
+    role check.
+    """
+    if not (settings.SINGLE_FLIGHT_READS and settings.FAST_JSON_RESPONSES):
+        return await render()
+
+    async def snapshot():
+        response = await render()
+        headers = {
+            k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")
+        }
+        return response.status_code, response.body, response.media_type, headers
+
+    key = (request_key(request), request.headers.get("if-none-match", ""))
+    status_code, body, media_type, headers = await read_flight.do(key, snapshot)
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
@@ -0,0 +1,43 @@
+"""Background tasks; importing this module registers them with ``app.core.jobs``."""
+
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.audio import analyse_voice, rendition_path
+from app.core.changes import compact_change_log
+from app.core.config import settings
+from app.core.dashboard import recompute_counters
+from app.core.jobs import task
+from app.core.matching import rebuild_matches
+from app.models.repair_requests import RepairRequest
+
+
+@task("dashboard.recompute", max_attempts=3)
+async def recompute_dashboard(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    await recompute_counters(session)
+
+
+@task("matching.rebuild", max_attempts=3)
+async def rebuild_match_index(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    await rebuild_matches(session)
+
+
+@task("changes.compact", max_attempts=3)
+async def compact_changes(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    await compact_change_log(session, payload.get("tombstone_days", settings.CHANGE_LOG_TOMBSTONE_DAYS))
+
+
+@task("voice.transcode", queue="voice")
+async def transcode_voice(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    repair_request = await session.get(RepairRequest, uuid.UUID(payload["repair_request_id"]))
+    if repair_request is None or not repair_request.voice_file:
+        return
+    source = Path(repair_request.voice_file)
+    voice = await analyse_voice(source, rendition_path(source.parent, source.name))
+    repair_request.voice_rendition = voice["rendition"]
+    repair_request.voice_duration = voice["duration"]
+    repair_request.voice_bytes = voice["bytes"]
+    repair_request.voice_peaks = voice["peaks"]
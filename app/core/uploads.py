@@ -0,0 +1,125 @@
+"""Streaming file upload helpers."""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Iterable, Tuple
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB"
+    )
+
+
+async def save_upload(
+    upload: UploadFile,
+    destination: Path,
+    max_bytes: int,
+    chunk_size: int = 64 * 1024,
+) -> Tuple[int, str]:
+    """Stream an upload to ``destination`` chunk by chunk.
+
+    Memory use stays at one chunk regardless of file size. The SHA-256 is
+    computed while writing. Returns ``(size, sha256_hex)``. Raises 413 as soon
+    as ``max_bytes`` is exceeded, and removes the partial file on any failure.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(destination, "wb") as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        try:
+            os.remove(destination)
+        except FileNotFoundError:
+            pass
+        raise
+    return size, digest.hexdigest()
+
+
+class _BodyTooLarge(HTTPException):
+    # An HTTPException so FastAPI's body parsing re-raises it unchanged
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=413,
+            detail="Request body too large"
+        )
+
+
+class UploadSizeLimitMiddleware:
+    """Reject upload requests whose body exceeds ``max_body_size``.
+
+    Multipart bodies are parsed before the endpoint runs, so the limit has to be
+    enforced here, while the bytes arrive. A declared Content-Length over the
+    limit is rejected before any body is read.
+    """
+
+    def __init__(self, app, max_body_size: int, paths: Iterable[str]):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("POST", "PUT")
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            await self._reject(send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise _BodyTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if not response_started:
+                await self._reject(send)
+
+    async def _reject(self, send) -> None:
+        body = b'{"detail":"Request body too large"}'
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -4,3 +4,8 @@ from app.models.repair_requests import RepairRequest  # noqa
 from app.models.service_providers import ServiceProvider  # noqa
 from app.models.services import Service  # noqa
 from app.models.user_roles import UserRole  # noqa
+from app.models.dashboard_counters import DashboardCounter  # noqa
+from app.models.table_versions import TableVersion  # noqa
+from app.models.matching import RepairRequestMatch, RepairRequestTerm, ServiceTerm  # noqa
+from app.models.change_log import ChangeLogEntry  # noqa
+from app.models.jobs import Job  # noqa
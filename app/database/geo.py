@@ -0,0 +1,191 @@
+"""Geohash-indexed "nearest within N km" lookups on SQLite and Postgres.
+
+A geohash interleaves latitude and longitude bits into a base32 string, so
+points that share a prefix lie in the same cell and an ordinary B-tree index
+on the string answers "every point in this cell" as a range scan. That needs
+no spatial extension on either database.
+
+``GeoIndex`` keeps a ``geohash`` column in step with ``latitude`` and
+``longitude`` on every flush. A lookup covers the circle's bounding box with
+a handful of cells, reads ``(id, latitude, longitude)`` for the points in
+them and in the box through the index, keeps those within the radius by
+great-circle distance and returns the nearest first. It starts with a small
+radius and widens it until enough points are found, so dense areas do not
+pull in every point within the full radius.
+"""
+
+import math
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, event, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+GEOHASH_PRECISION = 12
+# Lookups use the finest cells that still cover the circle with this many
+MAX_COVERING_CELLS = 32
+MAX_SEARCH_RADIUS_KM = 500.0
+# Lookups start at radius / RING_GROWTH ** RING_STEPS (but no smaller than
+# MIN_RING_KM) and widen by RING_GROWTH until enough points are found
+RING_GROWTH = 4
+RING_STEPS = 3
+MIN_RING_KM = 1.0
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = bit_count = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Height and width in degrees of a geohash cell."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _steps(start: float, stop: float, step: float) -> Iterable[float]:
+    value = start
+    while value < stop:
+        yield value
+        value += step
+    yield stop
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """``(lat_min, lat_max, lng_min, lng_max)`` around the circle; longitudes may pass ±180."""
+    lat_span = radius_km / KM_PER_DEGREE
+    lat_min, lat_max = max(latitude - lat_span, -90.0), min(latitude + lat_span, 90.0)
+    widest = max(abs(lat_min), abs(lat_max))
+    if widest >= 90.0:
+        return lat_min, lat_max, -180.0, 180.0
+    lng_span = lat_span / math.cos(math.radians(widest))
+    if lng_span >= 180.0:
+        return lat_min, lat_max, -180.0, 180.0
+    return lat_min, lat_max, longitude - lng_span, longitude + lng_span
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float) -> Set[str]:
+    """Geohash prefixes whose cells together cover the circle around a point."""
+    lat_min, lat_max, lng_min, lng_max = bounding_box(latitude, longitude, radius_km)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        count = (math.ceil((lat_max - lat_min) / height) + 1) * (math.ceil((lng_max - lng_min) / width) + 1)
+        if count <= MAX_COVERING_CELLS or precision == 1:
+            break
+
+    cells = set()
+    for lat in _steps(lat_min, lat_max, height):
+        for lng in _steps(lng_min, lng_max, width):
+            # Wrap across the antimeridian
+            lng = (lng + 180.0) % 360.0 - 180.0
+            cells.add(encode_geohash(min(lat, 90.0), lng, precision))
+    return cells
+
+
+def check_location(latitude: Optional[float], longitude: Optional[float]) -> None:
+    """Raise 400 unless both coordinates are given and in range, or neither is."""
+    if latitude is None and longitude is None:
+        return
+    if latitude is None or longitude is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Latitude and longitude must be given together"
+        )
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Latitude must be within [-90, 90] and longitude within [-180, 180]"
+        )
+
+
+class GeoIndex:
+    """Nearest-first radius lookups for an entity with latitude, longitude and geohash columns."""
+
+    def __init__(self, entity: Any):
+        self.entity = entity
+        event.listen(entity, "before_insert", self._set_geohash)
+        event.listen(entity, "before_update", self._set_geohash)
+
+    @staticmethod
+    def _set_geohash(mapper, connection, target) -> None:
+        if target.latitude is None or target.longitude is None:
+            target.geohash = None
+        else:
+            target.geohash = encode_geohash(target.latitude, target.longitude)
+
+    def candidates(self, latitude: float, longitude: float, radius_km: float) -> Select:
+        """Select ``(id, latitude, longitude)`` of every point in the covering cells and bounding box."""
+        entity = self.entity
+        ranges = [
+            # "~" sorts after every base32 character, so this is "starts with cell"
+            and_(entity.geohash >= cell, entity.geohash < cell + "~")
+            for cell in sorted(covering_cells(latitude, longitude, radius_km))
+        ]
+        statement = select(entity.id, entity.latitude, entity.longitude).where(or_(*ranges))
+        lat_min, lat_max, lng_min, lng_max = bounding_box(latitude, longitude, radius_km)
+        # Cells overshoot the box; trim with the coordinates stored in the index
+        statement = statement.where(entity.latitude.between(lat_min, lat_max))
+        if lng_min >= -180.0 and lng_max <= 180.0:
+            statement = statement.where(entity.longitude.between(lng_min, lng_max))
+        return statement
+
+    @staticmethod
+    def nearest(
+        rows: Iterable[Tuple[Any, float, float]], latitude: float, longitude: float, radius_km: float, limit: int
+    ) -> List[Tuple[Any, float]]:
+        """Keep candidate rows within ``radius_km`` and return ``(id, distance_km)``, nearest first."""
+        hits = []
+        for row_id, lat, lng in rows:
+            distance = haversine_km(latitude, longitude, lat, lng)
+            if distance <= radius_km:
+                hits.append((distance, row_id))
+        hits.sort(key=lambda hit: hit[0])
+        return [(row_id, distance) for distance, row_id in hits[:limit]]
+
+    async def within(
+        self, session: AsyncSession, latitude: float, longitude: float, radius_km: float, limit: int
+    ) -> List[Tuple[Any, float]]:
+        """Ids of the ``limit`` nearest points within ``radius_km``, with their distances."""
+        if not 0 < radius_km <= MAX_SEARCH_RADIUS_KM:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"radius_km must be greater than 0 and at most {MAX_SEARCH_RADIUS_KM:g}"
+            )
+        rings = [radius_km / RING_GROWTH ** step for step in range(RING_STEPS, 0, -1)]
+        for ring_km in [ring for ring in rings if ring >= MIN_RING_KM] + [radius_km]:
+            result = await session.execute(self.candidates(latitude, longitude, ring_km))
+            hits = self.nearest(result.all(), latitude, longitude, ring_km, limit)
+            # Everything outside the ring is farther than every hit inside it
+            if len(hits) >= limit:
+                break
+        return hits
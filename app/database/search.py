@@ -0,0 +1,141 @@
+"""Full-text search indexes: FTS5 on SQLite, a weighted tsvector with GIN on Postgres.
+
+``TextSearch`` attaches the index DDL to a table, so ``create_all`` builds it,
+and turns a free-text query into a ranked select that also returns a
+highlighted snippet. The database keeps the index current by itself: FTS5
+triggers on SQLite, a stored generated column on Postgres. Every insert,
+update and delete is covered, including cascades and raw SQL.
+
+SQLite's external-content FTS5 table is keyed by the base table's rowid,
+which ``VACUUM`` may renumber; run ``rebuild_sqlite`` after a VACUUM.
+"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DDL, Select, Table, column, event, func, literal_column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+# bm25 column weights on SQLite for the Postgres weight classes
+SQLITE_WEIGHTS = {"A": 10.0, "B": 4.0, "C": 2.0, "D": 1.0}
+
+
+def search_terms(q: str) -> List[str]:
+    """Split a user query into words; raises 400 when there are none."""
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain at least one word"
+        )
+    return terms
+
+
+class TextSearch:
+    """A full-text index over ``weights`` (column name -> Postgres weight class "A".."D")."""
+
+    def __init__(self, target: Table, weights: Dict[str, str], language: str = "english"):
+        self.table = target
+        self.weights = weights
+        self.language = language
+        self.fts_table = f"{target.name}_fts"
+        for dialect, statements in (("sqlite", self.sqlite_ddl()), ("postgresql", self.postgresql_ddl())):
+            for statement in statements:
+                event.listen(target, "after_create", DDL(statement).execute_if(dialect=dialect))
+        event.listen(
+            target, "before_drop", DDL(f"DROP TABLE IF EXISTS {self.fts_table}").execute_if(dialect="sqlite")
+        )
+
+    def sqlite_ddl(self) -> List[str]:
+        name, fts = self.table.name, self.fts_table
+        columns = ", ".join(self.weights)
+        new = ", ".join(f"new.{c}" for c in self.weights)
+        old = ", ".join(f"old.{c}" for c in self.weights)
+        weights = ", ".join(str(SQLITE_WEIGHTS[w]) for w in self.weights.values())
+        insert_new = f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.rowid, {new});"
+        delete_old = f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.rowid, {old});"
+        return [
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{name}', tokenize='porter unicode61')",
+            f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({weights})')",
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {name} BEGIN {insert_new} END",
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {name} BEGIN {delete_old} END",
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {columns} ON {name} BEGIN {delete_old} {insert_new} END",
+        ]
+
+    def postgresql_ddl(self) -> List[str]:
+        name = self.table.name
+        vector = " || ".join(
+            f"setweight(to_tsvector('{self.language}', coalesce({c}, '')), '{w}')" for c, w in self.weights.items()
+        )
+        return [
+            f"ALTER TABLE {name} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({vector}) STORED",
+            f"CREATE INDEX ix_{name}_search_vector ON {name} USING gin (search_vector)",
+        ]
+
+    def rebuild_sqlite(self):
+        """Statement that rebuilds the SQLite index from the base table."""
+        return text(f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('rebuild')")
+
+    def apply(self, statement: Select, q: str, dialect: str, *, skip: int = 0, limit: int = 100) -> Select:
+        """Restrict ``statement`` (a select of this table's entity) to rows matching ``q``.
+
+        Rows come best match first, with ``rank`` (higher is better) and
+        ``snippet`` columns added. Every word of ``q`` must match; words are
+        stemmed, so "leaking" finds "leak".
+        """
+        terms = search_terms(q)
+        primary_key = list(self.table.primary_key.columns)[0]
+
+        if dialect == "sqlite":
+            fts = table(self.fts_table, column("rowid"), column("rank"))
+            match = " ".join(f'"{term}"' for term in terms)
+            return (
+                statement.join_from(fts, self.table, literal_column(f"{self.table.name}.rowid") == fts.c.rowid)
+                .where(literal_column(self.fts_table).op("MATCH")(match))
+                .add_columns(
+                    (-fts.c.rank).label("rank"),
+                    func.snippet(
+                        literal_column(self.fts_table), -1, SNIPPET_START, SNIPPET_END, "…", 16
+                    ).label("snippet"),
+                )
+                # FTS5 returns rows in rank order itself, so LIMIT stops early
+                # and snippets are only built for the returned page
+                .order_by(fts.c.rank)
+                .offset(skip)
+                .limit(limit)
+            )
+
+        config = literal_column(f"'{self.language}'::regconfig")
+        vector = literal_column(f"{self.table.name}.search_vector")
+        query = func.plainto_tsquery(config, " ".join(terms))
+        rank = func.ts_rank_cd(vector, query)
+        # Rank every match in the index, but only build headlines for the page
+        hits = (
+            select(primary_key.label("id"), rank.label("rank"))
+            .where(vector.op("@@")(query))
+            .order_by(rank.desc(), primary_key.desc())
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+        document = func.concat_ws(" ", *(self.table.c[name] for name in self.weights))
+        headline = func.ts_headline(
+            config, document, query,
+            f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxWords=16, MinWords=6, MaxFragments=2",
+        )
+        return (
+            statement.join(hits, hits.c.id == primary_key)
+            .add_columns(hits.c.rank, headline.label("snippet"))
+            .order_by(hits.c.rank.desc(), primary_key.desc())
+        )
+
+    async def search(
+        self, session: AsyncSession, statement: Select, q: str, *, skip: int = 0, limit: int = 100
+    ) -> List[Tuple[Any, float, str]]:
+        """Run ``statement`` restricted to ``q``; returns ``(row, rank, snippet)`` tuples, best first."""
+        dialect = session.get_bind().dialect.name
+        result = await session.execute(self.apply(statement, q, dialect, skip=skip, limit=limit))
+        return [tuple(row) for row in result.all()]
@@ -1,22 +1,89 @@
 """Database session configuration for SQLAlchemy."""
 
+import time
 from collections.abc import AsyncGenerator
+from typing import Any, Dict, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
 
-# Async engine for FastAPI
-# Use SQLite for local development
-DATABASE_URL = "sqlite+aiosqlite:///./database.db"
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
 
-async_engine = create_async_engine(
-    DATABASE_URL,
-    echo=settings.ENVIRONMENT == "development",
-    future=True,
-)
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        self.total_checkouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def connect(self):
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except Exception:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+        waited = time.perf_counter() - start
+        self.total_checkouts += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return connection
+
+    def recreate(self):
+        # Keep counters across pool recreation (e.g. after engine.dispose())
+        pool = super().recreate()
+        pool.total_checkouts = self.total_checkouts
+        pool.total_wait_seconds = self.total_wait_seconds
+        pool.max_wait_seconds = self.max_wait_seconds
+        pool.timeouts = self.timeouts
+        return pool
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def build_engine(database_url: Optional[str] = None) -> AsyncEngine:
+    """Create the async engine with pool settings taken from ``settings``."""
+    url = make_url(database_url or settings.DATABASE_URL)
+    engine_kwargs: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "future": True,
+    }
+
+    # In-memory SQLite needs the dialect's default single-connection pool
+    if not _is_memory_sqlite(url):
+        engine_kwargs.update(
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+
+    if url.get_driver_name() == "asyncpg":
+        # Set both to 0 when running behind pgbouncer in transaction mode
+        engine_kwargs["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+
+    return create_async_engine(url, **engine_kwargs)
+
+
+# Async engine for FastAPI
+async_engine = build_engine()
 
 # Async session factory for FastAPI
 AsyncSessionLocal = sessionmaker(
@@ -26,6 +93,31 @@ AsyncSessionLocal = sessionmaker(
 )
 
 
+def get_pool_stats(engine: Optional[AsyncEngine] = None) -> Dict[str, Any]:
+    """Return a snapshot of the connection pool for this worker."""
+    pool = (engine or async_engine).pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if not isinstance(pool, InstrumentedAsyncQueuePool):
+        return stats
+
+    checkouts = pool.total_checkouts
+    stats.update(
+        {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "waiting": pool.waiting,
+            "total_checkouts": checkouts,
+            "timeouts": pool.timeouts,
+            "avg_wait_ms": (pool.total_wait_seconds / checkouts * 1000) if checkouts else 0.0,
+            "max_wait_ms": pool.max_wait_seconds * 1000,
+        }
+    )
+    return stats
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get async database session for FastAPI."""
     async with AsyncSessionLocal() as session:
@@ -0,0 +1,38 @@
+"""Dialect-aware atomic counter upserts."""
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Table, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+
+def increment(
+    connection: Connection, table: Table, key: Dict[str, Any], column: str, delta: int = 1, returning: bool = False
+) -> Optional[int]:
+    """Atomically add ``delta`` to ``column`` of the row at ``key``, creating it if needed.
+
+    With ``returning`` the new value is returned. The row stays locked until
+    the transaction ends, so values handed out this way commit in order.
+    """
+    target = table.c[column]
+    where = [table.c[name] == value for name, value in key.items()]
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(table).values(**key, **{column: delta})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in key],
+            set_={column: target + stmt.excluded[column]},
+        )
+        if returning:
+            return connection.execute(stmt.returning(target)).scalar_one()
+        connection.execute(stmt)
+        return None
+
+    updated = connection.execute(table.update().where(*where).values({column: target + delta}))
+    if updated.rowcount == 0:
+        connection.execute(table.insert().values(**key, **{column: delta}))
+    if returning:
+        return connection.execute(select(target).where(*where)).scalar_one()
+    return None
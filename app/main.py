@@ -1,10 +1,31 @@
 """Main FastAPI application."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.events import change_bus
+from app.core.jobs import start_worker, stop_worker
+from app.core.shared_cache import shared_tier
+from app.core.uploads import UploadSizeLimitMiddleware
+from app.database.session import AsyncSessionLocal
 from app.api.v1.api import api_v1_router
+from app.core import changes, dashboard, etags, feeds, matching, tasks  # noqa: F401  registers the change log, counter, table version, feed and match index listeners and the background tasks
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """Listen for cache invalidations and other workers' change events, and run background jobs, while serving."""
+    await shared_tier.start(settings.SHARED_CACHE_URL)
+    await change_bus.start(settings.EVENT_BUS_DATABASE_URL or settings.DATABASE_URL)
+    if settings.JOB_WORKER_IN_PROCESS:
+        start_worker(AsyncSessionLocal)
+    yield
+    await stop_worker()
+    await change_bus.stop()
+    await shared_tier.stop()
 
 
 def create_application() -> FastAPI:
@@ -17,6 +38,7 @@ def create_application() -> FastAPI:
         openapi_url=None if settings.ENVIRONMENT == "production" else f"{settings.API_V1_STR}/openapi.json",
         docs_url=None if settings.ENVIRONMENT == "production" else f"{settings.API_V1_STR}/docs",
         redoc_url=None if settings.ENVIRONMENT == "production" else f"{settings.API_V1_STR}/redoc",
+        lifespan=lifespan,
     )
 
     # Set up CORS
@@ -29,6 +51,12 @@ def create_application() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    # Cap voice upload bodies while they stream in (file limit + form overhead)
+    application.add_middleware(
+        UploadSizeLimitMiddleware,
+        max_body_size=settings.VOICE_UPLOAD_MAX_BYTES + 1024 * 1024,
+        paths=[f"{settings.API_V1_STR}/repair-requests/"],
+    )
     application.include_router(api_v1_router)
     return application
 
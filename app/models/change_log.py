@@ -0,0 +1,33 @@
+"""Append-only log of changes to synced rows, read by the change feed."""
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base_class import Base
+
+
+class ChangeLogEntry(Base):
+    """One insert, update or delete of a repair request, service or provider.
+
+    ``seq`` is handed out in commit order by ``app.core.changes``. Compaction
+    drops entries superseded by a later one for the same row, and old
+    deletions.
+    """
+
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_entity_entity_id_seq", "entity", "entity_id", "seq"),
+        Index("ix_change_log_action_created_at", "action", "created_at"),
+    )
+
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    entity: Mapped[str] = mapped_column(String(32), nullable=False)
+    entity_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    action: Mapped[str] = mapped_column(String(16), nullable=False)
+    # User the row belongs to; kept after the row (and user) are deleted
+    owner_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
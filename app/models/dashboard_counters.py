@@ -0,0 +1,20 @@
+"""Precomputed counters for the admin dashboard."""
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base_class import Base
+
+
+class DashboardCounter(Base):
+    """One running count, e.g. ``("users.role", "user")`` or ``("repair_requests.day", "2025-01-31")``.
+
+    Maintained incrementally by ``app.core.dashboard``; rebuild with
+    ``python recompute_dashboard_stats.py`` if it ever drifts.
+    """
+
+    __tablename__ = "dashboard_counters"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    bucket: Mapped[str] = mapped_column(String(100), primary_key=True, default="")
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
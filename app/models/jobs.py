@@ -0,0 +1,38 @@
+"""Durable background jobs."""
+
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base_class import Base
+
+
+class Job(Base):
+    """A unit of slow work, run outside the request by ``app.core.jobs``.
+
+    ``status`` is ``queued`` (waiting for ``run_at``), ``running`` (claimed
+    by ``locked_by`` until ``locked_until``) or ``dead`` (out of attempts,
+    kept for inspection). Finished jobs are deleted.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claiming: the due jobs of a queue, oldest first
+        Index("ix_jobs_queue_status_run_at", "queue", "status", "run_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    queue: Mapped[str] = mapped_column(String(64), nullable=False)
+    task: Mapped[str] = mapped_column(String(128), nullable=False)
+    payload: Mapped[Any] = mapped_column(JSON, nullable=False, default=dict)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    run_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -0,0 +1,70 @@
+"""Inverted index and precomputed scores behind the provider match feed."""
+
+import uuid
+
+from sqlalchemy import Float, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.database.base_class import Base
+from app.models.repair_requests import RepairRequest
+
+
+class RepairRequestTerm(Base):
+    """Posting of one term in a repair request, with its weight in the request's unit vector.
+
+    Maintained by ``app.core.matching``.
+    """
+
+    __tablename__ = "repair_request_terms"
+    __table_args__ = (
+        Index("ix_repair_request_terms_repair_request_id", "repair_request_id"),
+    )
+
+    term: Mapped[str] = mapped_column(String(64), primary_key=True)
+    repair_request_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("repair_requests.id", ondelete="CASCADE"), primary_key=True
+    )
+    weight: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class ServiceTerm(Base):
+    """Posting of one term in a service, with its weight in the service's unit vector.
+
+    Maintained by ``app.core.matching``.
+    """
+
+    __tablename__ = "service_terms"
+    __table_args__ = (
+        Index("ix_service_terms_service_id", "service_id"),
+        # A provider's combined term vector
+        Index("ix_service_terms_provider_id_term", "provider_id", "term", "weight"),
+    )
+
+    term: Mapped[str] = mapped_column(String(64), primary_key=True)
+    service_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("services.id", ondelete="CASCADE"), primary_key=True)
+    provider_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    weight: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class RepairRequestMatch(Base):
+    """How well a repair request matches a provider's services; rows exist only for a score > 0.
+
+    Maintained by ``app.core.matching``; rebuild with
+    ``python rebuild_match_index.py`` if it ever drifts.
+    """
+
+    __tablename__ = "repair_request_matches"
+    __table_args__ = (
+        # The feed: a provider's matches, best first
+        Index("ix_repair_request_matches_provider_id_score", "provider_id", "score", "repair_request_id"),
+        Index("ix_repair_request_matches_repair_request_id", "repair_request_id"),
+    )
+
+    provider_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    repair_request_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("repair_requests.id", ondelete="CASCADE"), primary_key=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+
+    # Relationships
+    repair_request: Mapped[RepairRequest] = relationship(RepairRequest)
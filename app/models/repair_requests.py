@@ -2,12 +2,13 @@
 
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import String, Text, DateTime, ForeignKey
+from sqlalchemy import JSON, String, Text, DateTime, Float, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base_class import Base
+from app.database.search import TextSearch
 
 if TYPE_CHECKING:
     from app.models.users import User
@@ -17,13 +18,33 @@ class RepairRequest(Base):
     """RepairRequest model for storing repair requests."""
 
     __tablename__ = "repair_requests"
+    __table_args__ = (
+        # Newest-first listing with (created_at, id) keyset pagination
+        Index("ix_repair_requests_created_at_id", "created_at", "id"),
+        # "My requests": filter by owner, same ordering
+        Index("ix_repair_requests_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     voice_file: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    voice_file_sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Filled in by the voice.transcode job: the compact Opus rendition (if
+    # ffmpeg made one), the size of what is served, and waveform peaks
+    voice_rendition: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    voice_duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    voice_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    voice_peaks: Mapped[Optional[List[float]]] = mapped_column(JSON, nullable=True)
+    # Where the repair is needed, for finding nearby providers
+    latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="repair_requests")
+
+
+# Full-text index for ?q= searches, titles weighted above descriptions
+repair_request_search = TextSearch(RepairRequest.__table__, {"title": "A", "description": "B"})
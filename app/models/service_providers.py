@@ -2,12 +2,13 @@
 
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base_class import Base
+from app.database.geo import GeoIndex
 
 if TYPE_CHECKING:
     from app.models.users import User
@@ -17,12 +18,25 @@ class ServiceProvider(Base):
     """ServiceProvider model for storing service provider information."""
 
     __tablename__ = "service_providers"
+    __table_args__ = (
+        Index("ix_service_providers_created_at_id", "created_at", "id"),
+        Index("ix_service_providers_user_id_created_at_id", "user_id", "created_at", "id"),
+        # "Providers within N km": geohash prefix range scans that read the
+        # coordinates from the index alone
+        Index("ix_service_providers_geohash", "geohash", "latitude", "longitude", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     service_type: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     contact_info: Mapped[str] = mapped_column(Text, nullable=False)
+    latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # How far from its location the provider travels for jobs
+    service_radius_km: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # Maintained from latitude/longitude by provider_locations
+    geohash: Mapped[Optional[str]] = mapped_column(String(12), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -32,3 +46,6 @@ class ServiceProvider(Base):
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="service_providers")
+
+
+provider_locations = GeoIndex(ServiceProvider)
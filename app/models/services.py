@@ -4,10 +4,11 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Text, DateTime, ForeignKey
+from sqlalchemy import String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base_class import Base
+from app.database.search import TextSearch
 
 if TYPE_CHECKING:
     from app.models.users import User
@@ -17,6 +18,13 @@ class Service(Base):
     """Service model for storing provider services."""
 
     __tablename__ = "services"
+    __table_args__ = (
+        Index("ix_services_created_at_id", "created_at", "id"),
+        # A provider's own services, newest first
+        Index("ix_services_provider_id_created_at_id", "provider_id", "created_at", "id"),
+        # Service type filters and the dashboard distribution
+        Index("ix_services_service_type", "service_type"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -28,3 +36,7 @@ class Service(Base):
 
     # Relationships
     provider: Mapped["User"] = relationship("User", back_populates="services")
+
+
+# Full-text index for ?q= searches
+service_search = TextSearch(Service.__table__, {"name": "A", "service_type": "B", "description": "C"})
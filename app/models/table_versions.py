@@ -0,0 +1,18 @@
+"""Per-table change versions for conditional GET."""
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base_class import Base
+
+
+class TableVersion(Base):
+    """Monotonic version of a table, bumped by every ORM write that touches it.
+
+    Maintained by ``app.core.etags``; read to build list and detail ETags.
+    """
+
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING, List, Optional
 
 from fastapi_users_db_sqlalchemy import SQLAlchemyBaseUserTableUUID
-from sqlalchemy import String, Text, Integer, Enum
+from sqlalchemy import String, Text, Integer, Enum, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.base_class import Base
 from app.models.user_roles import UserRole
@@ -14,6 +14,12 @@ if TYPE_CHECKING:
 
 class User(SQLAlchemyBaseUserTableUUID, Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Role counts and filters in the admin dashboard
+        Index("ix_users_role", "role"),
+        # Admin user list: ORDER BY email DESC, id DESC keyset pagination
+        Index("ix_users_email_id", "email", "id"),
+    )
 
     first_name: Mapped[str | None] = mapped_column(String, nullable=True)
     last_name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -44,3 +50,7 @@ class User(SQLAlchemyBaseUserTableUUID, Base):
     services: Mapped[List["Service"]] = relationship(
         "Service", back_populates="provider", cascade="all, delete-orphan"
     )
+
+
+# fastapi-users looks users up by lower(email) on login and registration
+Index("ix_users_email_lower", func.lower(User.email))
@@ -0,0 +1,13 @@
+"""Paginated response schemas."""
+
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """A page of results with the cursor for the next page."""
+    items: List[T]
+    next_cursor: Optional[str] = None
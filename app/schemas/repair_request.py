@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 from pydantic import BaseModel, ConfigDict
 
@@ -28,6 +28,8 @@ class RepairRequestUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     voice_file: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
 
 class RepairRequestInDBBase(RepairRequestBase):
@@ -44,6 +46,13 @@ class RepairRequest(RepairRequestInDBBase):
     title: str
     description: Optional[str] = None
     voice_file: Optional[str] = None
+    voice_file_sha256: Optional[str] = None
+    # Set once the upload has been processed in the background
+    voice_duration: Optional[float] = None
+    voice_bytes: Optional[int] = None
+    voice_peaks: Optional[List[float]] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     user: Optional["UserRead"] = None
 
 
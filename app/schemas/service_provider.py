@@ -13,6 +13,9 @@ class ServiceProviderBase(BaseModel):
     service_type: str
     description: str
     contact_info: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    service_radius_km: Optional[float] = None
 
 
 class ServiceProviderCreate(ServiceProviderBase):
@@ -26,6 +29,9 @@ class ServiceProviderUpdate(BaseModel):
     service_type: Optional[str] = None
     description: Optional[str] = None
     contact_info: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    service_radius_km: Optional[float] = None
 
 
 class ServiceProviderInDBBase(ServiceProviderBase):
@@ -42,6 +48,13 @@ class ServiceProvider(ServiceProviderInDBBase):
     pass
 
 
+class NearbyServiceProvider(ServiceProvider):
+    """A service provider found near a location."""
+    distance_km: float
+    # Whether the location is within the provider's service radius (None if unset)
+    serves_location: Optional[bool] = None
+
+
 class ServiceProviderInDB(ServiceProviderInDBBase):
     """Schema for ServiceProvider in database."""
     pass
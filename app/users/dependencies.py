@@ -1,8 +1,31 @@
+import uuid
+
 from app.models.users import User
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 from fastapi import Depends
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.cache import TaggedCache
+from app.core.config import settings
+from app.core.response_cache import invalidate as invalidate_responses
+from app.core.shared_cache import TwoTierCache
 from app.database.session import get_db
 
+# Per-worker cache of user column values keyed by user id. A primary key lookup
+# costs about as much as a shared tier round trip, so values stay in L1 only;
+# writes evict the entry here and, through the shared tier, in every other
+# worker. Without a shared tier other workers pick up the change once
+# USER_CACHE_TTL_SECONDS has passed.
+user_cache = TwoTierCache(
+    "users",
+    TaggedCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS),
+    key_type=uuid.UUID,
+)
+
+
+def _snapshot(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
 
 class DebugSQLAlchemyUserDatabase(SQLAlchemyUserDatabase):
     """Enhanced SQLAlchemyUserDatabase with debugging."""
@@ -24,5 +47,39 @@ class DebugSQLAlchemyUserDatabase(SQLAlchemyUserDatabase):
             raise
 
 
+class CachedSQLAlchemyUserDatabase(DebugSQLAlchemyUserDatabase):
+    """User database that serves ``get`` by id from the per-worker user cache."""
+
+    async def get(self, id):
+        if settings.USER_CACHE_TTL_SECONDS <= 0:
+            return await super().get(id)
+
+        snapshot = await user_cache.get(id)
+        if snapshot is not None:
+            # Attach a fresh copy to this request's session without a query,
+            # so concurrent requests never share one ORM instance.
+            user = User(**snapshot)
+            make_transient_to_detached(user)
+            return await self.session.merge(user, load=False)
+
+        user = await super().get(id)
+        if user is not None:
+            await user_cache.set(id, _snapshot(user))
+        return user
+
+    async def update(self, user, update_dict):
+        await user_cache.invalidate(user.id)
+        try:
+            return await super().update(user, update_dict)
+        finally:
+            await user_cache.invalidate(user.id)
+            await invalidate_responses("users")
+
+    async def delete(self, user) -> None:
+        await user_cache.invalidate(user.id)
+        await super().delete(user)
+        await invalidate_responses("users", "services", "service_providers")
+
+
 async def get_user_db(session=Depends(get_db)):
-    yield DebugSQLAlchemyUserDatabase(session, User)
+    yield CachedSQLAlchemyUserDatabase(session, User)
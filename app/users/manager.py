@@ -1,9 +1,13 @@
+from typing import Any, Dict, Optional
+
 from fastapi import Depends
-from fastapi_users import BaseUserManager, UUIDIDMixin
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import BaseUserManager, UUIDIDMixin, exceptions
 from fastapi_users.exceptions import UserAlreadyExists
 from app.models.users import User
 from app.core.config import settings
 from app.users.dependencies import get_user_db
+from app.users.passwords import password_hasher
 from app.schemas.user import UserCreate
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -32,8 +36,18 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, str]):
             
             print(f"✅ No existing user found, proceeding with creation")
             
-            # Call parent create method
-            user = await super().create(user_create, safe, request)
+            # Same steps as BaseUserManager.create, but the password is
+            # hashed in the executor instead of on the event loop
+            await self.validate_password(user_create.password, user_create)
+            user_dict = (
+                user_create.create_update_dict()
+                if safe
+                else user_create.create_update_dict_superuser()
+            )
+            password = user_dict.pop("password")
+            user_dict["hashed_password"] = await password_hasher.hash(password)
+            user = await self.user_db.create(user_dict)
+            await self.on_after_register(user, request)
             print(f"✅ User created successfully: {user.email}")
             return user
             
@@ -45,6 +59,35 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, str]):
             print(f"❌ Error type: {type(e).__name__}")
             raise
 
+    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> Optional[User]:
+        """Authenticate by email and password, verifying off the event loop."""
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Run the hasher anyway to mitigate timing attacks
+            await password_hasher.hash(credentials.password)
+            return None
+
+        verified, updated_password_hash = await password_hasher.verify_and_update(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        # Upgrade the stored hash if the hasher recommends it
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+
+        return user
+
+    async def _update(self, user: User, update_dict: Dict[str, Any]) -> User:
+        """Hash a new password in the executor before applying the update."""
+        password = update_dict.get("password")
+        if password is not None:
+            await self.validate_password(password, user)
+            update_dict = {k: v for k, v in update_dict.items() if k != "password"}
+            update_dict["hashed_password"] = await password_hasher.hash(password)
+        return await super()._update(user, update_dict)
+
 
 async def get_user_manager(user_db=Depends(get_user_db)):
     yield UserManager(user_db)
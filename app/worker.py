@@ -0,0 +1,35 @@
+"""Run background jobs outside the web processes: ``python -m app.worker``.
+
+Set ``JOB_WORKER_IN_PROCESS=false`` on the web processes to leave all jobs
+to these workers. SIGTERM or SIGINT stops claiming and lets running jobs
+finish.
+"""
+
+import asyncio
+import logging
+import signal
+
+from app.core import changes, dashboard, etags, events, matching, tasks  # noqa: F401  registers the write listeners and tasks
+from app.core.jobs import build_worker
+from app.database.session import AsyncSessionLocal, async_engine
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    worker = build_worker(AsyncSessionLocal)
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stopped.set)
+
+    worker.start()
+    logger.info("Job worker %s running queues %s", worker.worker_id, worker.queues)
+    await stopped.wait()
+    await worker.stop()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark idle server-sent event streams in one worker.
+
+Run this: python benchmarks/feeds_benchmark.py --connections 10000
+
+Opens ``--connections`` subscriptions to an ``EventFeed``, each drained by its
+own task the way Starlette drains a ``StreamingResponse`` body, and reports
+the memory held per idle connection, the time to fan one event out to every
+connection, and the time until every connection has received it. No
+sockets or database are involved, so this is the feed's own overhead.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.feeds import EventFeed  # noqa: E402
+
+
+async def run(args) -> None:
+    feed = EventFeed(queue_size=100, replay_size=500, heartbeat=3600)
+    received = 0
+    everyone = asyncio.Event()
+
+    async def client(stream):
+        nonlocal received
+        async for frame in stream:
+            if frame.startswith(b"id: "):
+                received += 1
+                if received == args.connections:
+                    everyone.set()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    clients = [asyncio.create_task(client(feed.stream(feed.subscribe()))) for _ in range(args.connections)]
+    await asyncio.sleep(0)
+    per_connection = (tracemalloc.get_traced_memory()[0] - before) / args.connections
+    tracemalloc.stop()
+
+    fan_out, delivered = [], []
+    summary = {"id": "00000000-0000-0000-0000-000000000000", "title": "Leaking tap", "description": "Under the sink"}
+    for n in range(args.events):
+        received = 0
+        everyone.clear()
+        started = time.perf_counter()
+        feed.publish("repair_request", str(n), summary)
+        fan_out.append(time.perf_counter() - started)
+        await everyone.wait()
+        delivered.append(time.perf_counter() - started)
+
+    for task in clients:
+        task.cancel()
+    await asyncio.gather(*clients, return_exceptions=True)
+    assert feed.stats()["subscribers"] == 0
+
+    print(f"{args.connections:,} idle connections: {per_connection / 1024:.1f} KiB each")
+    print(f"  publish (queue for all)  {statistics.median(fan_out) * 1000:7.2f} ms")
+    print(f"  delivered to all         {statistics.median(delivered) * 1000:7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
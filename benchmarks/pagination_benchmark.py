@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Benchmark OFFSET vs keyset pagination on a large repair_requests table.
+
+Run this: python benchmarks/pagination_benchmark.py --rows 2000000
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.core.pagination import encode_cursor, paginate  # noqa: E402
+from app.database.base import Base  # noqa: E402
+from app.models.repair_requests import RepairRequest  # noqa: E402
+
+
+def seed(path: str, rows: int) -> None:
+    """Bulk-insert rows with sqlite3 directly; the ORM is far too slow for millions."""
+    conn = sqlite3.connect(path)
+    user_id = uuid.uuid4().hex
+    conn.execute(
+        "INSERT INTO users (id, email, hashed_password, is_active, is_superuser, is_verified, role) "
+        "VALUES (?, 'bench@example.com', 'x', 1, 0, 0, 'USER')",
+        (user_id,),
+    )
+    start = datetime(2024, 1, 1)
+    batch = []
+    for i in range(rows):
+        created_at = (start + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S.%f")
+        batch.append((uuid.uuid4().hex, f"Request {i}", "Leaking tap in the kitchen", created_at, user_id))
+        if len(batch) == 50_000:
+            conn.executemany(
+                "INSERT INTO repair_requests (id, title, description, created_at, user_id) "
+                "VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+            batch.clear()
+    if batch:
+        conn.executemany(
+            "INSERT INTO repair_requests (id, title, description, created_at, user_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            batch,
+        )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+async def timed(coro_factory, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def run(rows: int, limit: int, repeat: int) -> None:
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    print(f"Seeding {rows:,} repair requests...")
+    started = time.perf_counter()
+    seed(path, rows)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s\n")
+
+    statement = select(RepairRequest)
+    depths = [d for d in (0, 1_000, 10_000, 100_000, 1_000_000, rows - limit) if 0 <= d <= rows - limit]
+
+    print(f"{'page start':>12} {'offset ms':>12} {'keyset ms':>12} {'speedup':>9}")
+    async with AsyncSession(engine) as session:
+        for depth in depths:
+            # Cursor pointing just before row `depth` (not timed)
+            cursor = None
+            if depth:
+                anchor = (
+                    await session.execute(
+                        select(RepairRequest.created_at, RepairRequest.id)
+                        .order_by(RepairRequest.created_at.desc(), RepairRequest.id.desc())
+                        .offset(depth - 1)
+                        .limit(1)
+                    )
+                ).one()
+                cursor = encode_cursor(anchor.created_at, anchor.id)
+
+            async def offset_page():
+                items, _ = await paginate(
+                    session, statement, RepairRequest.created_at, RepairRequest.id,
+                    skip=depth, limit=limit,
+                )
+                session.expunge_all()
+                return items
+
+            async def keyset_page():
+                items, _ = await paginate(
+                    session, statement, RepairRequest.created_at, RepairRequest.id,
+                    cursor=cursor, limit=limit,
+                )
+                session.expunge_all()
+                return items
+
+            offset_items = await offset_page()
+            keyset_items = await keyset_page()
+            assert [r.id for r in offset_items] == [r.id for r in keyset_items]
+
+            offset_ms = await timed(offset_page, repeat)
+            keyset_ms = await timed(keyset_page, repeat)
+            print(f"{depth:>12,} {offset_ms:>12.2f} {keyset_ms:>12.2f} {offset_ms / keyset_ms:>8.1f}x")
+
+    await engine.dispose()
+    os.remove(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
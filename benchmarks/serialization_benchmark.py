@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark response_model validation vs the prebuilt serializer + orjson path.
+
+Run this: python benchmarks/serialization_benchmark.py --rows 100 1000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.core.serialization import ModelSerializer  # noqa: E402
+from app.main import app  # noqa: E402,F401  resolves schema forward references
+from app.models.repair_requests import RepairRequest  # noqa: E402
+from app.models.user_roles import UserRole  # noqa: E402
+from app.models.users import User  # noqa: E402
+from app.schemas.repair_request import RepairRequest as RepairRequestSchema  # noqa: E402
+
+
+def build_rows(count: int) -> List[RepairRequest]:
+    """Detached ORM rows shaped like a provider's repair request page."""
+    users = [
+        User(
+            id=uuid.uuid4(), email=f"user{i}@example.com", hashed_password="x",
+            is_active=True, is_superuser=False, is_verified=True,
+            first_name="First", last_name="Last", role=UserRole.USER,
+            contact_info="Call after 5pm " * 4, experience=None,
+        )
+        for i in range(max(count // 5, 1))
+    ]
+    rows = []
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        user = users[i % len(users)]
+        row = RepairRequest(
+            id=uuid.uuid4(), title=f"Request {i}", description="Leaking tap in the kitchen " * 3,
+            created_at=start + timedelta(seconds=i), user_id=user.id,
+        )
+        row.user = user
+        rows.append(row)
+    return rows
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(List[RepairRequestSchema])
+    serializer = ModelSerializer(RepairRequestSchema)
+
+    def current(rows):
+        # What FastAPI does with response_model: validate from attributes, then dump
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+    def fast(rows):
+        return ORJSONResponse(serializer.many(rows)).body
+
+    print(f"{'rows':>6} {'response_model':>16} {'serializer+orjson':>18} {'speedup':>8}")
+    for count in args.rows:
+        rows = build_rows(count)
+        assert len(current(rows)) and len(fast(rows))
+        slow_ms = timed(lambda: current(rows), args.repeat)
+        fast_ms = timed(lambda: fast(rows), args.repeat)
+        print(f"{count:>6} {slow_ms:>13.2f} ms {fast_ms:>15.2f} ms {slow_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
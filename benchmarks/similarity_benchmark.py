@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark service similarity lookups: one matrix product vs a per-row Python loop.
+
+Run this: python benchmarks/similarity_benchmark.py --services 10000 --requests 1000
+
+Services and requests are generated from a small trade vocabulary. "build"
+vectorizes every service and writes the snapshot; "map" opens it again as a
+restarted worker would. "batched" scores all requests against all services
+with one matrix product; "per request" does one product per request; "loop"
+scores each (request, service) pair in Python over sparse feature dicts,
+the approach this replaces. No database is needed.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.similarity import SimilarityIndex, features, request_documents, service_documents  # noqa: E402
+
+TRADES = {
+    "Plumbing": ["leaking", "tap", "pipe", "drain", "blocked", "toilet", "cistern", "shower", "sink"],
+    "Heating": ["boiler", "radiator", "thermostat", "pressure", "pilot", "cold", "heating"],
+    "Electrical": ["socket", "switch", "fuse", "wiring", "light", "tripping", "sparks"],
+    "Carpentry": ["door", "hinge", "cupboard", "floorboard", "staircase", "squeaky", "shelf"],
+    "Roofing": ["roof", "tile", "gutter", "chimney", "flashing", "loft", "slate"],
+    "Gardening": ["fence", "lawn", "hedge", "tree", "patio", "decking", "gate"],
+}
+FILLER = ["kitchen", "bathroom", "bedroom", "garage", "urgent", "weekend", "again", "morning", "tenant", "quote"]
+
+
+def generate(rng: random.Random, services: int, requests: int):
+    trades = list(TRADES)
+    service_rows = [
+        SimpleNamespace(
+            id=uuid.uuid4(), service_type=trade, name=f"{rng.choice(FILLER).title()} {trade}",
+            description=" ".join(rng.sample(TRADES[trade], 3) + rng.sample(FILLER, 2)),
+        )
+        for trade in (rng.choice(trades) for _ in range(services))
+    ]
+    request_rows = []
+    for _ in range(requests):
+        words = rng.sample(TRADES[rng.choice(trades)], 2)
+        request_rows.append(SimpleNamespace(title=" ".join(words), description=" ".join(words + rng.sample(FILLER, 3))))
+    return service_rows, request_rows
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=1_000)
+    parser.add_argument("--dimensions", type=int, default=2048)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--loop-requests", type=int, default=20, help="requests scored by the Python loop")
+    args = parser.parse_args()
+
+    services, requests = generate(random.Random(42), args.services, args.requests)
+    directory = tempfile.mkdtemp()
+    index = SimilarityIndex(directory, args.dimensions)
+    _, build = timed(lambda: index._build("bench", services))
+    snapshot, load = timed(lambda: SimilarityIndex(directory, args.dimensions)._load("bench"))
+    size = snapshot.vectors.nbytes / 1024 / 1024
+    print(f"{args.services:,} services x {args.dimensions} dims ({size:.0f} MiB): "
+          f"build {build * 1000:.0f} ms, map {load * 1000:.1f} ms")
+
+    queries, embed = timed(lambda: snapshot.embed(request_documents(requests)))
+    batched, batch_time = timed(lambda: snapshot.top_k(queries, args.k))
+    _, single_time = timed(lambda: [snapshot.top_k(queries[i:i + 1], args.k) for i in range(len(requests))])
+
+    # Baseline: cosine over sparse feature dicts, one pair at a time
+    service_features = [features(doc) for doc in service_documents(services)]
+    service_norms = [sum(v * v for v in f.values()) ** 0.5 for f in service_features]
+
+    def loop(request):
+        query = features(request_documents([request])[0])
+        scores = []
+        for f, norm in zip(service_features, service_norms):
+            dot = sum(weight * f.get(feature, 0.0) for feature, weight in query.items())
+            scores.append(dot / norm if norm else 0.0)
+        return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[: args.k]
+
+    sample = requests[: args.loop_requests]
+    _, loop_time = timed(lambda: [loop(r) for r in sample])
+    per_request = {
+        "batched": (embed + batch_time) / len(requests),
+        "per request": (embed + single_time) / len(requests),
+        "loop": loop_time / len(sample),
+    }
+    print(f"top-{args.k} for {len(requests):,} requests (embedding {embed * 1000:.0f} ms of it):")
+    for name, seconds in per_request.items():
+        print(f"  {name:<12} {seconds * 1000:8.2f} ms per request")
+    assert all(len(result) == args.k for result in batched)
+
+
+if __name__ == "__main__":
+    main()
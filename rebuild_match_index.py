@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Rebuild the provider match index from repair requests and services."""
+
+import asyncio
+
+
+async def rebuild_match_index():
+    """Re-tokenize every request and service and rescore every provider in one transaction."""
+    print("🔄 Rebuilding the provider match index...")
+
+    try:
+        from app.core.matching import rebuild_matches
+        from app.database.session import AsyncSessionLocal, async_engine
+
+        async with AsyncSessionLocal() as session:
+            counts = await rebuild_matches(session)
+            await session.commit()
+        await async_engine.dispose()
+
+        print(f"✅ Providers with services: {counts['providers']}")
+        print(f"✅ Request/provider matches: {counts['matches']}")
+        print("🎉 Match index rebuilt")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error rebuilding the match index: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_match_index())
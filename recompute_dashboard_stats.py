@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Rebuild the precomputed admin dashboard counters from the source tables."""
+
+import asyncio
+
+
+async def recompute_dashboard_stats():
+    """Recompute every dashboard counter in one transaction."""
+    print("🔄 Recomputing dashboard counters...")
+
+    try:
+        from app.core.dashboard import recompute_counters
+        from app.database.session import AsyncSessionLocal, async_engine
+
+        async with AsyncSessionLocal() as session:
+            counters = await recompute_counters(session)
+            await session.commit()
+        await async_engine.dispose()
+
+        print(f"✅ Users: {counters['users']}, providers: {counters['providers']}")
+        print(f"✅ Repair requests: {counters['repair_requests']} ({counters['new_requests_30d']} in the last 30 days)")
+        print(f"✅ Services: {counters['services']}")
+        print("🎉 Dashboard counters rebuilt")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error recomputing dashboard counters: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    asyncio.run(recompute_dashboard_stats())
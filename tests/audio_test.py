@@ -0,0 +1,95 @@
+"""Test background voice processing: waveform peaks, durations and renditions."""
+
+import asyncio
+import io
+import shutil
+import wave
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints import repair_requests
+from app.core.audio import process_voice, rendition_path, waveform_peaks
+from app.core.config import settings
+from app.core.jobs import JobWorker
+
+NO_FFMPEG = "ffmpeg-not-installed"
+
+
+def _wav(seconds: float, rate: int = 16000, channels: int = 2) -> bytes:
+    """Half a second at half scale, then silence."""
+    samples = np.zeros(int(seconds * rate), np.int16)
+    samples[: rate // 2] = np.where(np.arange(rate // 2) % 2, 16384, -16384)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as audio:
+        audio.setnchannels(channels)
+        audio.setsampwidth(2)
+        audio.setframerate(rate)
+        audio.writeframes(np.repeat(samples, channels).tobytes())
+    return buffer.getvalue()
+
+
+def test_wav_is_analysed_without_ffmpeg(tmp_path):
+    source = tmp_path / "voice.wav"
+    source.write_bytes(_wav(2.0))
+
+    voice = process_voice(str(source), str(tmp_path / "voice.opus"), NO_FFMPEG, "24k", 8)
+    assert voice["rendition"] is None and voice["bytes"] == source.stat().st_size
+    assert voice["duration"] == pytest.approx(2.0, abs=0.01)
+    # Loud first quarter, silent rest
+    assert voice["peaks"][:2] == [0.5, 0.5] and max(voice["peaks"][2:]) == 0.0
+
+    assert waveform_peaks(np.zeros(3, np.float32), 8) == [0.0, 0.0, 0.0]
+    (tmp_path / "voice.webm").write_bytes(b"\x1aE\xdf\xa3 not a wav")
+    with pytest.raises(RuntimeError, match="ffmpeg"):
+        process_voice(str(tmp_path / "voice.webm"), str(tmp_path / "out.opus"), NO_FFMPEG, "24k", 8)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_ffmpeg_writes_a_compact_rendition(tmp_path):
+    source = tmp_path / "voice.wav"
+    source.write_bytes(_wav(3.0, rate=48000))
+    rendition = rendition_path(tmp_path, source.name)
+
+    voice = process_voice(str(source), str(rendition), "ffmpeg", "24k", 8)
+    assert voice["rendition"] == str(rendition) and rendition.read_bytes()[:4] == b"OggS"
+    assert voice["bytes"] == rendition.stat().st_size < source.stat().st_size / 10
+    assert voice["duration"] == pytest.approx(3.0, abs=0.05) and len(voice["peaks"]) == 8
+
+
+@pytest.fixture
+def uploads(tmp_path, monkeypatch):
+    """Store uploads under tmp_path and process them without ffmpeg."""
+    monkeypatch.setattr(repair_requests, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(settings, "VOICE_FFMPEG_PATH", NO_FFMPEG)
+    return tmp_path
+
+
+def test_uploads_are_processed_in_the_background_and_served_compact(client, engine, uploads, login):
+    c = client
+    user = login("audio-user@example.com", "user")
+    provider = login("audio-provider@example.com", "provider_individual")
+    created = c.post(
+        "/api/v1/repair-requests/", data={"title": "Noisy boiler"},
+        files={"voice_file": ("boiler.wav", _wav(1.0), "audio/wav")}, headers=user,
+    ).json()
+    assert created["voice_duration"] is None and created["voice_peaks"] is None
+
+    worker = JobWorker(lambda: AsyncSession(engine, expire_on_commit=False), {"voice": 1}, 0.01, 60.0)
+    asyncio.run(worker.drain())
+    assert worker.stats()["succeeded"] == 1
+    processed = c.get(f"/api/v1/repair-requests/{created['id']}", headers=provider).json()
+    assert processed["voice_duration"] == pytest.approx(1.0, abs=0.01)
+    assert processed["voice_bytes"] == len(_wav(1.0)) and len(processed["voice_peaks"]) == settings.VOICE_WAVEFORM_PEAKS
+
+    # Without a rendition the upload is served; with one, the rendition unless the original is asked for
+    filename = created["voice_file"].rsplit("/", 1)[-1]
+    assert c.get(f"/api/v1/repair-requests/voice/{filename}", headers=provider).content == _wav(1.0)
+    rendition = rendition_path(uploads, filename)
+    rendition.parent.mkdir()
+    rendition.write_bytes(b"OggS compact")
+    r = c.get(f"/api/v1/repair-requests/voice/{filename}", headers=provider)
+    assert r.content == b"OggS compact" and r.headers["content-type"] == "audio/ogg; codecs=opus"
+    r = c.get(f"/api/v1/repair-requests/voice/{filename}", params={"original": "true"}, headers=provider)
+    assert r.content == _wav(1.0)
@@ -0,0 +1,137 @@
+"""Test the incremental change feed and its compacted log."""
+
+import asyncio
+import uuid
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.changes import compact_change_log, seed_change_log
+from app.database.base import RepairRequest
+from app.models.change_log import ChangeLogEntry
+
+
+def _changes(c, headers: dict, **params) -> dict:
+    r = c.get("/api/v1/changes/", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _sync(c, headers: dict, since=None, limit: int = 500):
+    """Follow the feed to its end; returns (changes, cursor)."""
+    changes = []
+    while True:
+        page = _changes(c, headers, limit=limit, **({"since": since} if since else {}))
+        changes += page["changes"]
+        since = page["next_cursor"]
+        if not page["has_more"]:
+            return changes, since
+
+
+def _summary(changes):
+    return [(change["entity"], change["action"], change["data"] and change["data"].get("title", change["data"].get("name")))
+            for change in changes]
+
+
+async def _with_session(engine, fn):
+    async with AsyncSession(engine) as session:
+        result = await fn(session)
+        await session.commit()
+        return result
+
+
+def test_change_feed_follows_writes_per_role(client, login):
+    c = client
+    user = login("changes-user@example.com", "user")
+    other = login("changes-other@example.com", "user")
+    provider = login("changes-provider@example.com", "provider_individual")
+
+    service_id = c.post("/api/v1/services/", json={
+        "name": "Taps", "service_type": "Plumbing", "description": "Taps", "contact_info": "c",
+    }, headers=provider).json()["id"]
+    c.post("/api/v1/providers/", json={
+        "name": "Smith & Sons", "service_type": "Plumbing", "description": "d", "contact_info": "c",
+    }, headers=provider)
+    mine = c.post("/api/v1/repair-requests/", data={"title": "Leaking tap", "description": "d"}, headers=user).json()
+    c.post("/api/v1/repair-requests/", data={"title": "Broken gate", "description": "d"}, headers=other)
+
+    # Users see every service and provider but only their own requests; providers the reverse
+    changes, user_cursor = _sync(c, user)
+    assert _summary(changes) == [
+        ("service", "created", "Taps"), ("provider", "created", "Smith & Sons"),
+        ("repair_request", "created", "Leaking tap"),
+    ]
+    assert changes[2]["id"] == mine["id"] and changes[2]["data"]["user_id"] == mine["user_id"]
+    assert "user" not in changes[2]["data"] and "provider" not in changes[0]["data"]
+    assert [change["seq"] for change in changes] == sorted(change["seq"] for change in changes)
+    provider_changes, provider_cursor = _sync(c, provider)
+    assert [title for _, _, title in _summary(provider_changes)] == ["Taps", "Smith & Sons", "Leaking tap", "Broken gate"]
+    # Short pages give the same result
+    assert _sync(c, provider, limit=1) == (provider_changes, provider_cursor)
+
+    # Nothing new: same cursor back, even past changes the caller cannot see
+    c.post("/api/v1/repair-requests/", data={"title": "Squeaky door", "description": "d"}, headers=other)
+    page = _changes(c, user, since=user_cursor)
+    assert page["changes"] == [] and int(page["next_cursor"]) > int(user_cursor)
+    user_cursor = page["next_cursor"]
+
+    c.put(f"/api/v1/repair-requests/{mine['id']}", json={"title": "Dripping tap"}, headers=user)
+    c.delete(f"/api/v1/services/{service_id}", headers=provider)
+    changes, user_cursor = _sync(c, user, since=user_cursor)
+    assert _summary(changes) == [("repair_request", "updated", "Dripping tap"), ("service", "deleted", None)]
+    assert changes[1]["id"] == service_id
+
+    assert c.get("/api/v1/changes/", params={"since": "abc"}, headers=user).status_code == 400
+    assert c.get("/api/v1/changes/").status_code == 401
+
+
+def test_compaction_bounds_the_log_and_expires_old_cursors(client, engine, login):
+    c = client
+    user = login("compact-user@example.com", "user")
+    ids = [
+        c.post("/api/v1/repair-requests/", data={"title": f"Request {n}", "description": "d"}, headers=user).json()["id"]
+        for n in range(3)
+    ]
+    _, old_cursor = _sync(c, user)
+    for n in range(5):
+        c.put(f"/api/v1/repair-requests/{ids[0]}", json={"title": f"Edit {n}"}, headers=user)
+    c.delete(f"/api/v1/repair-requests/{ids[1]}", headers=user)
+    before, cursor = _sync(c, user)
+
+    # Keep recent deletions: only superseded entries go and every cursor stays valid
+    counts = asyncio.run(_with_session(engine, lambda s: compact_change_log(s, tombstone_days=30)))
+    assert counts == {"superseded": 6, "tombstones": 0, "compacted_seq": 0}
+    changes, _ = _sync(c, user, since=old_cursor)
+    assert _summary(changes) == [("repair_request", "updated", "Edit 4"), ("repair_request", "deleted", None)]
+
+    # Dropping the deletion expires cursors from before it; a full sync gives the live rows once each
+    counts = asyncio.run(_with_session(engine, lambda s: compact_change_log(s, tombstone_days=0)))
+    assert counts["tombstones"] == 1 and counts["compacted_seq"] > int(old_cursor)
+    assert c.get("/api/v1/changes/", params={"since": old_cursor}, headers=user).status_code == 410
+    assert _changes(c, user, since=cursor)["changes"] == []
+    changes, _ = _sync(c, user)
+    assert sorted(_summary(changes)) == [("repair_request", "created", "Request 2"), ("repair_request", "updated", "Edit 4")]
+    assert len(before) > len(changes)
+
+
+def test_seed_logs_rows_written_outside_the_orm(client, engine, login):
+    c = client
+    user = login("seed-user@example.com", "user")
+    user_id = uuid.UUID(c.get("/api/v1/users/me", headers=user).json()["id"])
+
+    async def insert_directly(session):
+        await session.execute(RepairRequest.__table__.insert().values(
+            id=uuid.uuid4(), title="Imported", description="d", created_at=datetime.utcnow(), user_id=user_id,
+        ))
+
+    asyncio.run(_with_session(engine, insert_directly))
+    assert _sync(c, user)[0] == []
+    assert asyncio.run(_with_session(engine, seed_change_log)) == 1
+    assert asyncio.run(_with_session(engine, seed_change_log)) == 0
+    assert _summary(_sync(c, user)[0]) == [("repair_request", "created", "Imported")]
+
+    async def count(session):
+        return (await session.execute(select(func.count()).select_from(ChangeLogEntry))).scalar()
+
+    assert asyncio.run(_with_session(engine, count)) == 1
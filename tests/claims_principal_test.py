@@ -0,0 +1,42 @@
+"""Test the JWT claims fast path used by read-only guards."""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.permissions import require_provider_claims, require_user_claims
+from app.core.security import get_jwt_strategy, read_token_claims
+from app.models.user_roles import UserRole
+
+
+async def _token_for(role: UserRole) -> tuple:
+    user = SimpleNamespace(id=uuid.uuid4(), role=role, first_name="Jane", last_name="Doe")
+    return user, await get_jwt_strategy().write_token(user)
+
+
+@pytest.mark.asyncio
+async def test_read_token_claims_builds_principal():
+    user, token = await _token_for(UserRole.PROVIDER_INDIVIDUAL)
+    principal = read_token_claims(token)
+
+    assert principal.id == user.id
+    assert principal.role == UserRole.PROVIDER_INDIVIDUAL
+    assert principal.first_name == "Jane"
+    assert require_provider_claims(principal) is principal
+
+
+@pytest.mark.asyncio
+async def test_claims_guard_rejects_wrong_role():
+    _, token = await _token_for(UserRole.PROVIDER_ORGANIZATION)
+    with pytest.raises(HTTPException) as exc:
+        require_user_claims(read_token_claims(token))
+    assert exc.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_tampered_token_is_rejected():
+    _, token = await _token_for(UserRole.USER)
+    assert read_token_claims(token[:-2] + "xx") is None
+    assert read_token_claims("not-a-jwt") is None
@@ -0,0 +1,68 @@
+"""Test compound-document list responses."""
+
+import json
+import uuid
+from datetime import datetime
+
+from fastapi import Response
+
+from app.core.compound import COMPOUND_MEDIA_TYPE, Embedded, compound_document
+from app.core.pagination import page_response
+from app.core.serialization import ModelSerializer
+from app.main import app  # noqa: F401  resolves schema forward references
+from app.models.services import Service
+from app.models.user_roles import UserRole
+from app.models.users import User
+from app.schemas.service import Service as ServiceSchema
+
+PROVIDERS = Embedded("provider", "provider_id", "users")
+
+
+def _services(count: int):
+    provider = User(
+        id=uuid.uuid4(), email="p@example.com", hashed_password="x", is_active=True,
+        is_superuser=False, is_verified=False, first_name="Pat", role=UserRole.PROVIDER_INDIVIDUAL,
+    )
+    services = []
+    for i in range(count):
+        service = Service(
+            id=uuid.uuid4(), name=f"s{i}", service_type="Plumbing", description="d",
+            contact_info="c", created_at=datetime(2025, 1, 1), provider_id=provider.id,
+        )
+        service.provider = provider
+        services.append(service)
+    return provider, services
+
+
+def test_compound_document_includes_each_user_once():
+    provider, services = _services(3)
+
+    document = compound_document(services, ModelSerializer(ServiceSchema), PROVIDERS)
+
+    assert len(document["items"]) == 3
+    assert all("provider" not in row and row["provider_id"] == provider.id for row in document["items"])
+    assert list(document["included"]["users"]) == [str(provider.id)]
+    assert document["included"]["users"][str(provider.id)]["first_name"] == "Pat"
+
+
+def test_compound_document_respects_sparse_fieldsets():
+    provider, services = _services(2)
+    serializer = ModelSerializer(ServiceSchema)
+
+    without_provider = compound_document(services, serializer.only({"name": None}), PROVIDERS)
+    assert without_provider == {"items": [{"name": "s0"}, {"name": "s1"}], "included": {"users": {}}}
+
+    names_only = compound_document(
+        services, serializer.only({"name": None, "provider": frozenset({"first_name"})}), PROVIDERS
+    )
+    assert names_only["included"]["users"] == {str(provider.id): {"first_name": "Pat"}}
+
+
+def test_page_response_serves_compound_media_type():
+    _, services = _services(2)
+    response = page_response(Response(), services, "next", None, ModelSerializer(ServiceSchema), PROVIDERS)
+
+    assert response.media_type == COMPOUND_MEDIA_TYPE
+    body = json.loads(response.body)
+    assert body["next_cursor"] == "next"
+    assert len(body["included"]["users"]) == 1
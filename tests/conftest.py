@@ -0,0 +1,61 @@
+"""Shared fixtures: the app served from a throwaway SQLite database."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.response_cache import response_cache
+from app.database.base import Base
+from app.database.session import build_engine, get_db
+from app.main import app
+
+
+async def _create_all(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@pytest.fixture
+def engine(tmp_path, request):
+    """A database with every table, in the test's tmp_path.
+
+    Parametrise indirectly with ``async def seed(engine)`` to load data first:
+    ``@pytest.mark.parametrize("engine", [seed], indirect=True)``.
+    """
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    asyncio.run(_create_all(engine))
+    seed = getattr(request, "param", None)
+    if seed is not None:
+        asyncio.run(seed(engine))
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def client(engine):
+    """A TestClient whose requests use ``engine``, with an empty response cache."""
+    async def override_get_db():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    response_cache.clear()
+    yield TestClient(app)
+    response_cache.clear()
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def login(client):
+    """``login(email, role, **fields)`` registers a user and returns their auth headers."""
+    def _login(email: str, role: str, **fields) -> dict:
+        client.post("/api/v1/auth/register-with-role", json={
+            "email": email, "password": "pass12345", "first_name": "F", "last_name": "L", "role": role,
+            "service_type": "Plumbing", **fields,
+        })
+        r = client.post("/api/v1/auth/login", data={"username": email, "password": "pass12345"})
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    return _login
@@ -0,0 +1,70 @@
+"""Test the incrementally maintained dashboard counters."""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dashboard import read_counters, recompute_counters
+from app.models.repair_requests import RepairRequest
+from app.models.services import Service
+from app.models.user_roles import UserRole
+from app.models.users import User
+
+
+def _user(role: UserRole) -> User:
+    return User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex}@example.com", hashed_password="x", role=role)
+
+
+def _service(provider: User, service_type: str) -> Service:
+    return Service(
+        name="s", service_type=service_type, description="d", contact_info="c", provider_id=provider.id
+    )
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_writes_and_match_recompute(engine):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await _check_counters(session)
+
+
+async def _check_counters(session: AsyncSession) -> None:
+    user, provider, other = _user(UserRole.USER), _user(UserRole.PROVIDER_INDIVIDUAL), _user(UserRole.USER)
+    session.add_all([user, provider, other])
+    await session.flush()
+    old = datetime.utcnow() - timedelta(days=90)
+    session.add_all([
+        RepairRequest(title="new", user_id=user.id),
+        RepairRequest(title="old", created_at=old, user_id=user.id),
+        RepairRequest(title="other", user_id=other.id),
+        _service(provider, "Plumbing"),
+        _service(provider, "Electrical"),
+    ])
+    await session.commit()
+
+    counters = await read_counters(session)
+    assert counters["users"] == 2
+    assert counters["providers"] == 1
+    assert counters["repair_requests"] == 3
+    assert counters["new_requests_30d"] == 2
+    assert counters["service_types"] == {"Plumbing": 1, "Electrical": 1}
+
+    # Role change, service type change and a cascaded delete
+    other.role = UserRole.PROVIDER_ORGANIZATION
+    service = await session.scalar(select(Service).where(Service.service_type == "Electrical"))
+    service.service_type = "Plumbing"
+    await session.commit()
+    await session.delete(await session.get(User, user.id))
+    await session.commit()
+
+    counters = await read_counters(session)
+    assert counters["users"] == 0
+    assert counters["providers"] == 2
+    assert counters["repair_requests"] == 1
+    assert counters["new_requests_30d"] == 1
+    assert counters["user_roles"] == {"provider_individual": 1, "provider_organization": 1}
+    assert counters["service_types"] == {"Plumbing": 2}
+
+    assert await recompute_counters(session) == counters
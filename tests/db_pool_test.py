@@ -0,0 +1,30 @@
+"""Test the instrumented connection pool."""
+
+import pytest
+from sqlalchemy import text
+
+from app.database.session import InstrumentedAsyncQueuePool, build_engine, get_pool_stats
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_track_checkouts(tmp_path):
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    assert isinstance(engine.pool, InstrumentedAsyncQueuePool)
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        stats = get_pool_stats(engine)
+        assert stats["checked_out"] == 1
+        assert stats["waiting"] == 0
+
+    stats = get_pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["total_checkouts"] >= 1
+    assert stats["max_wait_ms"] >= stats["avg_wait_ms"] >= 0
+    await engine.dispose()
+
+
+def test_memory_sqlite_keeps_default_pool():
+    engine = build_engine("sqlite+aiosqlite://")
+    assert not isinstance(engine.pool, InstrumentedAsyncQueuePool)
+    assert get_pool_stats(engine) == {"pool_class": type(engine.pool).__name__}
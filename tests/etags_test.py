@@ -0,0 +1,44 @@
+"""Test ETags and conditional GET on read endpoints."""
+
+from sqlalchemy import event
+
+
+def test_conditional_get_skips_the_list_query(client, engine, login):
+    c = client
+    user = login("etag-user@example.com", "user")
+    c.post("/api/v1/repair-requests/", data={"title": "Leak", "description": "Tap"}, headers=user)
+
+    first = c.get("/api/v1/repair-requests/my-requests", headers=user)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    cached = c.get("/api/v1/repair-requests/my-requests", headers={**user, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert len(statements) == 1 and "table_versions" in statements[0]
+
+    # Different query params or shape are different representations
+    sparse = c.get("/api/v1/repair-requests/my-requests", params={"fields": "title"}, headers=user)
+    assert sparse.headers["etag"] != etag
+
+    c.post("/api/v1/repair-requests/", data={"title": "Door", "description": "Hinge"}, headers=user)
+    changed = c.get("/api/v1/repair-requests/my-requests", headers={**user, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(changed.json()) == 2
+
+
+def test_detail_etag_changes_when_the_owner_changes(client, login):
+    c = client
+    user = login("etag-detail@example.com", "user")
+    request_id = c.post("/api/v1/repair-requests/", data={"title": "Leak", "description": "Tap"}, headers=user).json()["id"]
+
+    etag = c.get(f"/api/v1/repair-requests/{request_id}").headers["etag"]
+    assert c.get(f"/api/v1/repair-requests/{request_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    c.patch("/api/v1/users/me", json={"first_name": "Renamed"}, headers=user)
+    renamed = c.get(f"/api/v1/repair-requests/{request_id}", headers={"If-None-Match": etag})
+    assert renamed.status_code == 200
+    assert renamed.json()["user"]["first_name"] == "Renamed"
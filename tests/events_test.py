@@ -0,0 +1,87 @@
+"""Test change events published on commit."""
+
+import orjson
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.events import MAX_PAYLOAD_BYTES, change_bus, encode_change
+from app.database.base import RepairRequest, Service, User, UserRole
+
+
+@pytest.fixture
+def changes():
+    received = []
+    change_bus.subscribe(received.append)
+    yield received
+    change_bus.unsubscribe(received.append)
+
+
+@pytest.mark.asyncio
+async def test_orm_writes_publish_events_after_commit_only(engine, changes):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        user = User(email="events@example.com", hashed_password="x", role=UserRole.PROVIDER_INDIVIDUAL)
+        session.add(user)
+        await session.flush()
+        request = RepairRequest(title="Leaking tap", description="Under the sink", user_id=user.id)
+        service = Service(name="Taps", service_type="Plumbing", description="d", contact_info="c", provider_id=user.id)
+        session.add_all([request, service])
+        await session.flush()
+        assert changes == []
+        await session.commit()
+        assert [(c["type"], c["id"]) for c in changes] == [
+            ("user.created", str(user.id)),
+            ("repair_request.created", str(request.id)),
+            ("service.created", str(service.id)),
+        ]
+        assert changes[1]["data"]["title"] == "Leaking tap"
+        assert changes[1]["data"]["user_id"] == str(user.id)
+        assert "hashed_password" not in changes[0]["data"] and "email" not in changes[0]["data"]
+
+        # Rolled back writes publish nothing; writes that change no column are skipped
+        changes.clear()
+        request.title = "Dripping tap"
+        await session.flush()
+        await session.rollback()
+        await session.refresh(service)
+        service.name = service.name
+        await session.commit()
+        assert changes == []
+
+        request.title = "Dripping tap"
+        await session.commit()
+        assert [(c["type"], c["data"]["title"]) for c in changes] == [("repair_request.updated", "Dripping tap")]
+
+        # Deleting a user deletes (and announces) its requests and services too
+        changes.clear()
+        await session.delete(user)
+        await session.commit()
+        assert sorted(c["type"] for c in changes) == ["repair_request.deleted", "service.deleted", "user.deleted"]
+        assert all(c["data"] is None for c in changes)
+
+
+def test_listener_notifications_reach_handlers_and_big_payloads_drop_data(changes):
+    payload = encode_change("repair_request", "created", "abc", {"title": "Tap"})
+    change_bus._on_notify(None, 1234, change_bus.channel, payload)
+    assert changes == [{"type": "repair_request.created", "entity": "repair_request", "action": "created",
+                        "id": "abc", "data": {"title": "Tap"}}]
+
+    big = encode_change("repair_request", "created", "abc", {"description": "x" * MAX_PAYLOAD_BYTES})
+    assert len(big) < MAX_PAYLOAD_BYTES and orjson.loads(big)["data"] is None
+
+
+@pytest.mark.asyncio
+async def test_failing_handler_does_not_stop_the_others(changes):
+    def broken(change):
+        raise RuntimeError("boom")
+
+    change_bus._handlers.insert(0, broken)
+    errors = change_bus.stats()["handler_errors"]
+    try:
+        change_bus.dispatch(encode_change("service", "deleted", "abc", None))
+    finally:
+        change_bus.unsubscribe(broken)
+    assert [c["type"] for c in changes] == ["service.deleted"]
+    assert change_bus.stats()["handler_errors"] == errors + 1
+
+    await change_bus.start("sqlite+aiosqlite:///unused.db")
+    assert change_bus.stats()["backend"] == "in-process" and not change_bus.stats()["listening"]
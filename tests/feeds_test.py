@@ -0,0 +1,118 @@
+"""Test the server-sent event feed of new repair requests."""
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.feeds import HEARTBEAT, RESET, EventFeed, repair_request_feed
+from app.database.session import get_db
+from app.main import app
+
+
+async def _take(stream, count: int) -> list:
+    return [await stream.__anext__() for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscribers_are_reset_without_holding_up_others():
+    feed = EventFeed(queue_size=2, replay_size=10, heartbeat=3600)
+    fast, slow = feed.subscribe(), feed.subscribe()
+    fast_stream = feed.stream(fast)
+    await _take(fast_stream, 1)  # retry hint
+
+    for n in range(3):
+        feed.publish("repair_request", f"id-{n}", {"n": n})
+        frames = await _take(fast_stream, 1)
+        assert frames == [b'id: id-%d\nevent: repair_request\ndata: {"n":%d}\n\n' % (n, n)]
+
+    # The third event overflowed the slow queue: its backlog is gone, it gets one reset and ends
+    assert feed.stats()["dropped"] == 1 and feed.stats()["subscribers"] == 1
+    slow_stream = feed.stream(slow)
+    assert await _take(slow_stream, 2) == [b"retry: 5000\n\n", RESET]
+    with pytest.raises(StopAsyncIteration):
+        await slow_stream.__anext__()
+
+    # Closing the stream unsubscribes it
+    await fast_stream.aclose()
+    assert feed.stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_last_event_id_replays_and_heartbeats_keep_streams_alive():
+    feed = EventFeed(queue_size=10, replay_size=2, heartbeat=0.01)
+    for n in range(3):
+        feed.publish("repair_request", f"id-{n}", {"n": n})
+
+    resumed = feed.stream(feed.subscribe("id-1"))
+    assert (await _take(resumed, 2))[1].startswith(b"id: id-2\n")
+    assert await _take(resumed, 1) == [HEARTBEAT]
+
+    # id-0 fell out of the replay buffer: the client is told to refetch, then stays subscribed
+    stale = feed.stream(feed.subscribe("id-0"))
+    assert (await _take(stale, 2))[1] == RESET
+    feed.publish("repair_request", "id-3", {"n": 3})
+    frame = await _take(stale, 1)
+    assert frame in ([HEARTBEAT], [b'id: id-3\nevent: repair_request\ndata: {"n":3}\n\n'])
+
+    await resumed.aclose()
+    await stale.aclose()
+    await asyncio.sleep(0.05)
+    assert feed._heartbeat_task.done()
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_pushes_created_requests(engine, login):
+    user = login("feed-user@example.com", "user")
+    provider = login("feed-provider@example.com", "provider_individual")
+    sessions = []
+
+    async def override_get_db():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            sessions.append(session)
+            yield session
+
+    # Track the sessions handed out; the login fixture restores the overrides afterwards
+    app.dependency_overrides[get_db] = override_get_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        r = await c.get("/api/v1/repair-requests/stream", headers=user)
+        assert r.status_code == 403
+
+        # Drive the streaming response by hand: httpx's ASGI transport would wait for it to finish
+        sent = asyncio.Queue()
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        scope = {
+            "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http", "root_path": "",
+            "path": "/api/v1/repair-requests/stream", "raw_path": b"/api/v1/repair-requests/stream",
+            "query_string": b"", "server": ("test", 80), "client": ("127.0.0.1", 1),
+            "headers": [(b"host", b"test"), (b"authorization", provider["Authorization"].encode())],
+        }
+        streaming = asyncio.create_task(app(scope, receive, sent.put))
+        start = await sent.get()
+        assert start["status"] == 200
+        assert dict(start["headers"])[b"content-type"].startswith(b"text/event-stream")
+        assert (await sent.get())["body"] == b"retry: 5000\n\n"
+        # The stream's database session was closed before streaming began
+        assert not sessions[-1].in_transaction()
+
+        created = await c.post("/api/v1/repair-requests/", data={
+            "title": "Leaking tap", "description": "Under the sink",
+        }, headers=user)
+        body = (await asyncio.wait_for(sent.get(), 5))["body"]
+        head, _, data = body.rstrip(b"\n").rpartition(b"\ndata: ")
+        assert head == b"id: %s\nevent: repair_request" % created.json()["id"].encode()
+        event = orjson.loads(data)
+        assert event["title"] == "Leaking tap" and event["id"] == created.json()["id"]
+        assert "user" not in event and "voice_file" not in event
+
+        assert repair_request_feed.stats()["subscribers"] == 1
+        disconnect.set()
+        await asyncio.wait_for(streaming, 5)
+        assert repair_request_feed.stats()["subscribers"] == 0
@@ -0,0 +1,41 @@
+"""Test sparse fieldsets on list and detail endpoints."""
+
+from sqlalchemy import event
+
+
+def test_fields_limit_columns_and_skip_relationship_load(client, engine, login):
+    c = client
+    user = login("fields-user@example.com", "user", first_name="Ada", contact_info="long contact text")
+    provider = login("fields-provider@example.com", "provider_individual", first_name="Ada", contact_info="long contact text")
+    created = c.post("/api/v1/repair-requests/", data={"title": "Leak", "description": "Kitchen tap"}, headers=user)
+    request_id = created.json()["id"]
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    r = c.get("/api/v1/repair-requests/", params={"fields": "id,title,created_at,user.first_name,user.last_name"}, headers=provider)
+    assert r.status_code == 200
+    assert r.json() == [{
+        "id": request_id,
+        "title": "Leak",
+        "created_at": created.json()["created_at"],
+        "user": {"first_name": "Ada", "last_name": "L"},
+    }]
+    selects = [s for s in statements if s.lstrip().startswith("SELECT")]
+    request_select = next(s for s in selects if "FROM repair_requests" in s)
+    assert "description" not in request_select
+    # The owners' load, not the caller's own user lookup
+    user_select = next(s for s in selects if "FROM users" in s and "users.id IN" in s)
+    assert "contact_info" not in user_select
+
+    statements.clear()
+    r = c.get("/api/v1/repair-requests/", params={"fields": "id,title", "cursor": ""}, headers=provider)
+    assert r.json()["items"] == [{"id": request_id, "title": "Leak"}]
+    assert not any("FROM users" in s and "users.id IN" in s for s in statements)
+
+    detail = c.get(f"/api/v1/repair-requests/{request_id}", params={"fields": "title,user"})
+    assert detail.json()["title"] == "Leak"
+    assert detail.json()["user"]["contact_info"] == "long contact text"
+
+    assert c.get("/api/v1/repair-requests/", params={"fields": "title,password"}, headers=provider).status_code == 400
+    assert c.get("/api/v1/repair-requests/", params={"fields": "user.hashed_password"}, headers=provider).status_code == 400
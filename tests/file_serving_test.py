@@ -0,0 +1,84 @@
+"""Test ranged and conditional file serving."""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.files import parse_range, serve_file
+
+DATA = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    path = tmp_path / "voice.mp3"
+    path.write_bytes(DATA)
+
+    def factory(**options) -> TestClient:
+        app = FastAPI()
+
+        @app.api_route("/voice", methods=["GET", "HEAD"])
+        async def voice(request: Request):
+            return serve_file(request, path, **options)
+
+        return TestClient(app)
+
+    return factory
+
+
+def test_parse_range():
+    assert parse_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_range("bytes=900-", 1000) == (900, 999)
+    assert parse_range("bytes=-100", 1000) == (900, 999)
+    assert parse_range("bytes=990-2000", 1000) == (990, 999)
+    assert parse_range("bytes=0-1,5-6", 1000) is None
+    assert parse_range("items=0-1", 1000) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=1000-", 1000)
+
+
+def test_full_and_partial_responses(make_client):
+    client = make_client()
+    full = client.get("/voice")
+    assert full.status_code == 200
+    assert full.content == DATA
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["content-type"] == "audio/mpeg"
+    etag = full.headers["etag"]
+    assert not etag.startswith("W/")
+
+    part = client.get("/voice", headers={"Range": "bytes=100-199"})
+    assert part.status_code == 206
+    assert part.content == DATA[100:200]
+    assert part.headers["content-range"] == f"bytes 100-199/{len(DATA)}"
+
+    unsatisfiable = client.get("/voice", headers={"Range": f"bytes={len(DATA)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(DATA)}"
+
+
+def test_conditional_requests(make_client):
+    client = make_client()
+    first = client.get("/voice")
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    assert client.get("/voice", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/voice", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    stale = client.get("/voice", headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+    assert stale.status_code == 200
+    assert stale.content == DATA
+
+    fresh = client.get("/voice", headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert fresh.status_code == 206
+    assert fresh.content == DATA[:10]
+
+
+def test_proxy_offload_modes(make_client):
+    accel = make_client(sendfile_mode="x-accel-redirect", accel_location="/protected/voices/")
+    response = accel.get("/voice")
+    assert response.headers["x-accel-redirect"] == "/protected/voices/voice.mp3"
+    assert response.content == b""
+
+    sendfile = make_client(sendfile_mode="x-sendfile")
+    assert sendfile.get("/voice").headers["x-sendfile"].endswith("voice.mp3")
@@ -0,0 +1,78 @@
+"""Test geohash provider lookups."""
+
+import random
+
+from app.database.geo import covering_cells, encode_geohash, haversine_km
+
+LONDON = (51.5074, -0.1278)
+
+
+def test_covering_cells_contain_every_point_in_the_circle():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    rng = random.Random(7)
+    for latitude, longitude, radius_km in [(*LONDON, 0.5), (*LONDON, 25), (0.0, 179.99, 10), (89.9, 0.0, 30)]:
+        cells = covering_cells(latitude, longitude, radius_km)
+        for _ in range(500):
+            lat = max(min(latitude + rng.uniform(-1, 1) * radius_km / 111, 90.0), -90.0)
+            lng = (longitude + rng.uniform(-1, 1) * radius_km / 10 + 180) % 360 - 180
+            if haversine_km(latitude, longitude, lat, lng) <= radius_km:
+                assert any(encode_geohash(lat, lng).startswith(cell) for cell in cells), (lat, lng)
+
+
+def test_nearby_providers_ranked_by_distance(client, login):
+    c = client
+    user = login("geo-user@example.com", "user")
+    provider = login("geo-provider@example.com", "provider_individual")
+    for name, lat, lng, radius in [
+        ("Croydon", 51.3762, -0.0982, 10.0),  # ~15 km south
+        ("Westminster", 51.4975, -0.1357, 5.0),  # ~1.2 km
+        ("Paris", 48.8566, 2.3522, 50.0),
+        ("No location", None, None, None),
+    ]:
+        r = c.post("/api/v1/providers/", json={
+            "name": name, "service_type": "Plumbing", "description": "d", "contact_info": "c",
+            "latitude": lat, "longitude": lng, "service_radius_km": radius,
+        }, headers=provider)
+        assert r.status_code == 201, r.text
+
+    nearby = c.get("/api/v1/providers/nearby", params={
+        "latitude": LONDON[0], "longitude": LONDON[1], "radius_km": 20,
+    }, headers=user).json()
+    assert [(p["name"], p["serves_location"]) for p in nearby] == [("Westminster", True), ("Croydon", False)]
+    assert 1.0 < nearby[0]["distance_km"] < 1.5
+    # A small limit is met from an inner ring; a larger one widens to the full radius
+    for limit, names in [(1, ["Westminster"]), (2, ["Westminster", "Croydon"])]:
+        assert [p["name"] for p in c.get("/api/v1/providers/nearby", params={
+            "latitude": LONDON[0], "longitude": LONDON[1], "radius_km": 20, "limit": limit,
+        }, headers=user).json()] == names
+
+    request_id = c.post("/api/v1/repair-requests/", data={
+        "title": "Leak", "description": "Tap", "latitude": "51.3800", "longitude": "-0.1000",
+    }, headers=user).json()["id"]
+    near_request = c.get("/api/v1/providers/nearby", params={"repair_request_id": request_id, "radius_km": 5},
+                         headers=user).json()
+    assert [p["name"] for p in near_request] == ["Croydon"]
+
+    # Moving a provider moves it in the index
+    croydon = next(p for p in nearby if p["name"] == "Croydon")
+    c.put(f"/api/v1/providers/{croydon['id']}", json={"latitude": 48.85, "longitude": 2.35}, headers=provider)
+    assert c.get("/api/v1/providers/nearby", params={"repair_request_id": request_id, "radius_km": 5},
+                 headers=user).json() == []
+
+
+def test_invalid_locations_are_rejected(client, login):
+    c = client
+    user = login("geo-user@example.com", "user")
+    provider = login("geo-provider@example.com", "provider_individual")
+
+    assert c.post("/api/v1/repair-requests/", data={"title": "Leak", "description": "Tap", "latitude": "51.5"},
+                  headers=user).status_code == 400
+    assert c.post("/api/v1/providers/", json={
+        "name": "n", "service_type": "t", "description": "d", "contact_info": "c", "latitude": 91, "longitude": 0,
+    }, headers=provider).status_code == 400
+    assert c.get("/api/v1/providers/nearby", params={"latitude": 51.5}, headers=user).status_code == 400
+    assert c.get("/api/v1/providers/nearby", params={"latitude": 51.5, "longitude": 0, "radius_km": 0},
+                 headers=user).status_code == 400
+    for limit in (0, 101):
+        assert c.get("/api/v1/providers/nearby", params={"latitude": 51.5, "longitude": 0, "limit": limit},
+                     headers=user).status_code == 422
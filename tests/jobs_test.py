@@ -0,0 +1,162 @@
+"""Test the durable background job queue."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.jobs import JobWorker, enqueue, queue_depths, retry_delay, task
+from app.database.base import TableVersion
+from app.models.jobs import Job
+
+calls = []
+
+
+@task("test.record", queue="test")
+async def record(session, payload):
+    calls.append(payload["n"])
+    session.add(TableVersion(table_name=f"job-{payload['n']}", version=payload["n"]))
+
+
+@task("test.fail", queue="test", max_attempts=3)
+async def fail(session, payload):
+    calls.append("fail")
+    session.add(TableVersion(table_name="never", version=1))
+    raise RuntimeError("boom")
+
+
+@task("test.slow", queue="slow")
+async def slow(session, payload):
+    calls.append("start")
+    await asyncio.sleep(0.05)
+    calls.append("end")
+
+
+@task("test.long", queue="long")
+async def long(session, payload):
+    calls.append("long")
+    await asyncio.sleep(0.3)
+
+
+@pytest.fixture(autouse=True)
+def immediate_retries(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 0.0)
+    calls.clear()
+
+
+def _worker(engine, queues, lease=60.0) -> JobWorker:
+    return JobWorker(lambda: AsyncSession(engine, expire_on_commit=False), queues, 0.01, lease)
+
+
+async def _jobs(engine):
+    async with AsyncSession(engine) as session:
+        return list((await session.execute(select(Job).order_by(Job.created_at))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_jobs_commit_with_the_caller_and_their_writes_with_completion(engine):
+    async with AsyncSession(engine) as session:
+        await enqueue(session, "test.record", {"n": 1})
+        await session.rollback()
+        await enqueue(session, "test.record", {"n": 2})
+        await enqueue(session, "test.record", {"n": 3}, delay=3600)
+        await session.commit()
+        with pytest.raises(ValueError):
+            await enqueue(session, "test.missing")
+
+    worker = _worker(engine, {"test": 2})
+    await worker.drain()
+    assert calls == [2]
+    [delayed] = await _jobs(engine)
+    assert delayed.payload == {"n": 3} and delayed.status == "queued"
+    async with AsyncSession(engine) as session:
+        assert await session.get(TableVersion, "job-2") is not None
+        depths = await queue_depths(session)
+    assert depths == {"test": {"queued": 1, "due": 0, "running": 0, "dead": 0, "oldest_due_seconds": None}}
+    stats = worker.stats()
+    assert stats["claimed"] == stats["succeeded"] == 1 and stats["run_seconds"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_then_dead_letter(engine, monkeypatch):
+    async with AsyncSession(engine) as session:
+        await enqueue(session, "test.fail")
+        await session.commit()
+
+    worker = _worker(engine, {"test": 1})
+    await worker.drain()
+    assert calls == ["fail"] * 3
+    [job] = await _jobs(engine)
+    assert job.status == "dead" and job.attempts == 3 and "RuntimeError: boom" in job.last_error
+    async with AsyncSession(engine) as session:
+        assert await session.get(TableVersion, "never") is None
+    assert worker.stats()["retried"] == 2 and worker.stats()["dead"] == 1
+
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 10.0)
+    monkeypatch.setattr(settings, "JOB_RETRY_MAX_SECONDS", 60.0)
+    assert 5 <= retry_delay(1) <= 10 and 20 <= retry_delay(3) <= 40 and 30 <= retry_delay(10) <= 60
+
+
+def test_admin_lists_and_retries_dead_jobs(client, engine, login):
+    c = client
+    admin = login("jobs-admin@example.com", "admin")
+
+    r = c.post("/api/v1/admin/analytics/recompute", params={"background": "true"}, headers=admin)
+    assert r.status_code == 202
+    job_id = r.json()["job_id"]
+    asyncio.run(_mark_dead(engine))
+    dead = c.get("/api/v1/admin/jobs/dead", headers=admin).json()
+    assert [(job["id"], job["task"]) for job in dead] == [(job_id, "dashboard.recompute")]
+    assert c.get("/api/v1/admin/system/jobs", headers=admin).json()["queues"]["default"]["dead"] == 1
+
+    assert c.post(f"/api/v1/admin/jobs/{job_id}/retry", headers=admin).status_code == 202
+    assert c.post(f"/api/v1/admin/jobs/{job_id}/retry", headers=admin).status_code == 404
+    asyncio.run(_worker(engine, {"default": 1}).drain())
+    assert asyncio.run(_jobs(engine)) == []
+
+
+async def _mark_dead(engine):
+    async with AsyncSession(engine) as session:
+        await session.execute(update(Job).values(status="dead", attempts=5, last_error="boom"))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_queue_limit_holds_across_workers_and_expired_leases_are_reclaimed(engine):
+    async with AsyncSession(engine) as session:
+        for _ in range(3):
+            await enqueue(session, "test.slow")
+        await session.commit()
+
+    first, second = _worker(engine, {"slow": 1}), _worker(engine, {"slow": 1})
+    assert await first.poll() == 1
+    # The queue's one slot is taken, by another worker
+    assert await second.poll() == 0
+    await first.drain()
+    assert calls == ["start", "end"] * 3
+
+    # A job claimed by a worker that died is taken over once its lease runs out
+    async with AsyncSession(engine) as session:
+        await enqueue(session, "test.slow")
+        await session.commit()
+    assert len(await _worker(engine, {"slow": 1}, lease=0.0)._claim("slow", 1, 1)) == 1
+    await second.drain()
+    assert await _jobs(engine) == [] and second.stats()["succeeded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_running_jobs_renew_their_lease(engine):
+    async with AsyncSession(engine) as session:
+        await enqueue(session, "test.long")
+        await session.commit()
+
+    first = _worker(engine, {"long": 1}, lease=0.1)
+    assert await first.poll() == 1
+    # Well past the lease taken at claim time, the job is still held
+    await asyncio.sleep(0.2)
+    assert await _worker(engine, {"long": 1}, lease=0.1).poll() == 0
+    await first.drain()
+    assert calls == ["long"] and first.stats()["succeeded"] == 1 and first.stats()["lost"] == 0
+    assert await _jobs(engine) == []
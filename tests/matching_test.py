@@ -0,0 +1,102 @@
+"""Test the provider match feed and its incrementally maintained index."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.matching import rebuild_matches, term_vector, tokenize
+from app.models.matching import RepairRequestMatch, RepairRequestTerm, ServiceTerm
+
+
+def test_tokenize_stems_and_drops_stopwords():
+    assert list(tokenize("The tap is Leaking, leaks and leaked in 2 places!")) == [
+        "tap", "leak", "leak", "leak", "plac",
+    ]
+    vector = term_vector([("Leaking tap", 2.0), ("tap drips", 1.0)])
+    assert set(vector) == {"leak", "tap", "drip"}
+    assert vector["tap"] > vector["leak"] > vector["drip"]
+    assert sum(weight * weight for weight in vector.values()) == pytest.approx(1.0)
+    assert term_vector([("the and of", 1.0)]) == {}
+
+
+def _service(c, headers: dict, name: str, service_type: str, description: str) -> str:
+    r = c.post("/api/v1/services/", json={
+        "name": name, "service_type": service_type, "description": description, "contact_info": "c",
+    }, headers=headers)
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _feed(c, headers: dict, **params):
+    r = c.get("/api/v1/repair-requests/matched", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+async def _index_rows(engine):
+    async with AsyncSession(engine) as session:
+        rows = []
+        for entity in (RepairRequestTerm, ServiceTerm, RepairRequestMatch):
+            result = await session.execute(select(entity.__table__))
+            rows.append(sorted(tuple(round(v, 9) if isinstance(v, float) else str(v) for v in row) for row in result))
+        return rows
+
+
+async def _rebuild(engine):
+    async with AsyncSession(engine) as session:
+        counts = await rebuild_matches(session)
+        await session.commit()
+        return counts
+
+
+def test_matched_feed_ranks_and_follows_writes(client, engine, login):
+    c = client
+    user = login("match-user@example.com", "user")
+    plumber = login("match-plumber@example.com", "provider_individual")
+    electrician = login("match-electrician@example.com", "provider_individual")
+    plumbing = _service(c, plumber, "Tap and pipe repairs", "Plumbing", "Leaking taps, burst pipes and blocked drains")
+    wiring = _service(c, electrician, "Home wiring", "Electrical", "Sockets, switches and fuse boxes")
+
+    ids = {}
+    for title, description in [
+        ("Leaking tap", "Kitchen tap leaks all night"),
+        ("Blocked drain", "Bathroom drain is slow"),
+        ("Broken socket", "Socket sparks when used"),
+        ("Garden fence", "Fence panel blown over"),
+    ]:
+        r = c.post("/api/v1/repair-requests/", data={"title": title, "description": description}, headers=user)
+        ids[title] = r.json()["id"]
+
+    feed = _feed(c, plumber)
+    assert [item["title"] for item in feed] == ["Leaking tap", "Blocked drain"]
+    assert feed[0]["match_score"] > feed[1]["match_score"] > 0
+    assert [item["title"] for item in _feed(c, electrician)] == ["Broken socket"]
+
+    # Keyset pages over the same order
+    page = _feed(c, plumber, cursor="", limit=1)
+    assert [item["title"] for item in page["items"]] == ["Leaking tap"]
+    page = _feed(c, plumber, cursor=page["next_cursor"], limit=1)
+    assert [item["title"] for item in page["items"]] == ["Blocked drain"] and page["next_cursor"] is None
+
+    # Editing a service rescores its provider; editing or deleting a request rescores the request
+    c.put(f"/api/v1/services/{wiring}", json={"description": "Sockets, switches and garden fence lighting"},
+          headers=electrician)
+    assert [item["title"] for item in _feed(c, electrician)] == ["Garden fence", "Broken socket"]
+    c.put(f"/api/v1/repair-requests/{ids['Garden fence']}", json={"title": "Shed roof", "description": "Felt blown off"}, headers=user)
+    c.delete(f"/api/v1/repair-requests/{ids['Leaking tap']}", headers=user)
+    assert [item["title"] for item in _feed(c, plumber)] == ["Blocked drain"]
+    assert [item["title"] for item in _feed(c, electrician)] == ["Broken socket"]
+    # Dropping a term from a service drops the matches that relied on it
+    c.put(f"/api/v1/services/{plumbing}", json={"description": "Leaking taps and burst pipes"}, headers=plumber)
+    assert _feed(c, plumber) == []
+
+    # The incremental index matches a rebuild from scratch
+    incremental = asyncio.run(_index_rows(engine))
+    assert asyncio.run(_rebuild(engine)) == {"providers": 2, "matches": 1}
+    assert asyncio.run(_index_rows(engine)) == incremental
+
+    c.delete(f"/api/v1/services/{wiring}", headers=electrician)
+    assert _feed(c, electrician) == []
+    assert c.get("/api/v1/repair-requests/matched", headers=user).status_code == 403
@@ -0,0 +1,68 @@
+"""Test keyset pagination."""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.pagination import decode_cursor, encode_cursor, paginate
+from app.database.base import Base
+from app.models.repair_requests import RepairRequest
+from app.models.users import User
+
+
+def test_cursor_roundtrip():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678)
+    row_id = uuid.uuid4()
+    cursor = encode_cursor(created_at, row_id)
+
+    assert decode_cursor(cursor, RepairRequest.created_at) == (created_at, row_id)
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", RepairRequest.created_at)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_match_offset_order(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pages.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        user = User(email="a@example.com", hashed_password="x")
+        session.add(user)
+        await session.flush()
+        # Pairs of rows share a timestamp so the id tie-breaker is exercised
+        base = datetime(2025, 1, 1)
+        for i in range(7):
+            session.add(
+                RepairRequest(
+                    title=f"r{i}", created_at=base + timedelta(minutes=i // 2), user_id=user.id
+                )
+            )
+        await session.commit()
+
+        everything, next_cursor = await paginate(
+            session, select(RepairRequest), RepairRequest.created_at, RepairRequest.id, limit=100
+        )
+        assert next_cursor is None
+
+        seen, cursor = [], ""
+        while True:
+            items, cursor = await paginate(
+                session,
+                select(RepairRequest),
+                RepairRequest.created_at,
+                RepairRequest.id,
+                cursor=cursor,
+                limit=3,
+            )
+            seen.extend(items)
+            if cursor is None:
+                break
+
+    assert [r.id for r in seen] == [r.id for r in everything]
+    await engine.dispose()
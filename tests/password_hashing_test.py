@@ -0,0 +1,44 @@
+"""Test password hashing in the executor."""
+
+import asyncio
+
+import pytest
+
+from app.users.passwords import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_roundtrip():
+    hasher = PasswordHasher(workers=1, max_concurrency=1)
+    hashed = await hasher.hash("s3cret-pass")
+
+    assert (await hasher.verify_and_update("s3cret-pass", hashed))[0] is True
+    assert (await hasher.verify_and_update("wrong", hashed))[0] is False
+    assert hasher.stats()["completed"] == 3
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_event_loop():
+    hasher = PasswordHasher(workers=1, max_concurrency=1)
+    ticks = 0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    async def hash_all():
+        results = await asyncio.gather(*(hasher.hash(f"pw-{i}") for i in range(3)))
+        done.set()
+        return results
+
+    results, _ = await asyncio.gather(hash_all(), ticker())
+
+    assert len(set(results)) == 3
+    assert ticks > 3
+    assert hasher.stats()["waiting"] == 0
+    assert hasher.stats()["max_wait_ms"] > 0
+    hasher.shutdown()
@@ -0,0 +1,105 @@
+"""Check that endpoint queries use indexes instead of full table scans."""
+
+import asyncio
+import re
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.repair_requests import RepairRequest
+from app.models.service_providers import ServiceProvider
+from app.models.services import Service
+from app.models.user_roles import UserRole
+from app.models.users import User
+
+# A bare "SCAN <table>" (no USING INDEX) is SQLite's sequential scan
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+# Aggregate tables that stay a few dozen rows by construction
+SMALL_TABLES = {"dashboard_counters", "table_versions"}
+
+
+async def _seed(engine) -> None:
+    async with AsyncSession(engine) as session:
+        base = datetime(2025, 1, 1)
+        for u in range(50):
+            role = UserRole.USER if u % 2 else UserRole.PROVIDER_INDIVIDUAL
+            user = User(id=uuid.uuid4(), email=f"seed{u}@example.com", hashed_password="x", role=role)
+            session.add(user)
+            for i in range(20):
+                created_at = base + timedelta(minutes=u * 20 + i)
+                session.add(RepairRequest(
+                    title=f"r{i}", description="Leaking tap", created_at=created_at, user_id=user.id,
+                ))
+                if i % 4 == 0:
+                    session.add(Service(
+                        name="s", service_type=f"type{i % 5}", description="Tap repairs",
+                        contact_info="c", created_at=created_at, provider_id=user.id,
+                    ))
+            session.add(ServiceProvider(
+                name="p", service_type="t", description="d", contact_info="c", user_id=user.id,
+                latitude=50 + u * 0.1, longitude=-1 + u * 0.05,
+            ))
+        await session.commit()
+        await session.execute(text("ANALYZE"))
+        await session.commit()
+
+
+@pytest.mark.parametrize("engine", [_seed], indirect=True)
+def test_endpoint_queries_avoid_full_scans(client, engine, login):
+    c = client
+    user = login("plan-user@example.com", "user")
+    provider = login("plan-provider@example.com", "provider_individual")
+    admin = login("plan-admin@example.com", "admin")
+    c.post("/api/v1/services/", json={
+        "name": "Taps", "service_type": "Plumbing", "description": "Leaking taps", "contact_info": "c",
+    }, headers=provider)
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        cursor = c.get("/api/v1/repair-requests/", params={"limit": 5, "cursor": ""}, headers=provider).json()["next_cursor"]
+        requests = [
+            ("/api/v1/repair-requests/", {"limit": 5, "cursor": cursor}, provider),
+            ("/api/v1/repair-requests/my-requests", {"limit": 5}, user),
+            ("/api/v1/repair-requests/matched", {"limit": 5, "cursor": ""}, provider),
+            ("/api/v1/repair-requests/", {"limit": 5, "q": "r1"}, provider),
+            ("/api/v1/services/", {"limit": 5, "cursor": ""}, user),
+            ("/api/v1/services/", {"limit": 5, "q": "type1"}, user),
+            ("/api/v1/services/my/services", {}, provider),
+            ("/api/v1/providers/", {"limit": 5, "cursor": ""}, user),
+            ("/api/v1/providers/my/providers", {}, provider),
+            ("/api/v1/providers/nearby", {"latitude": 51.5, "longitude": -0.12, "radius_km": 5}, user),
+            ("/api/v1/admin/users", {"limit": 5, "cursor": ""}, admin),
+            ("/api/v1/admin/repair-requests", {"limit": 5}, admin),
+            ("/api/v1/admin/services", {"limit": 5}, admin),
+            ("/api/v1/admin/analytics/dashboard", {}, admin),
+            ("/api/v1/users/me", {}, user),
+        ]
+        for path, params, headers in requests:
+            assert c.get(path, params=params, headers=headers).status_code == 200, path
+        c.post("/api/v1/auth/login", data={"username": "plan-user@example.com", "password": "pass12345"})
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    async def explain():
+        failures = []
+        async with engine.connect() as conn:
+            for statement, parameters in statements:
+                plan = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                for row in plan:
+                    match = FULL_SCAN.match(row[-1])
+                    if match and match.group(1) not in SMALL_TABLES:
+                        failures.append(f"{row[-1]}\n    {statement}")
+        return failures
+
+    assert statements
+    failures = asyncio.run(explain())
+    assert not failures, "Full table scans:\n" + "\n".join(failures)
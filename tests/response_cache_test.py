@@ -0,0 +1,64 @@
+"""Test the tagged response cache for catalog endpoints."""
+
+from sqlalchemy import event
+
+from app.core.cache import TaggedCache
+from app.core.response_cache import response_cache
+
+
+def test_tagged_cache_invalidates_by_tag_and_tracks_bytes():
+    cache = TaggedCache(maxsize=2, ttl=60)
+    cache.set("a", b"aaaa", tags=("services",), size=4)
+    cache.set("b", b"bb", tags=("services", "users"), size=2)
+    assert cache.stats()["bytes"] == 6
+
+    assert cache.invalidate_tags("users") == 1
+    assert "b" not in cache and "a" in cache
+    assert cache.stats()["tags"] == {"services": 1}
+
+    # LRU eviction drops tag bookkeeping too
+    cache.set("c", b"c", tags=("providers",), size=1)
+    cache.set("d", b"d", tags=("providers",), size=1)
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 2
+    assert cache.stats()["tags"] == {"providers": 2}
+
+
+def _create_service(c, headers, name: str) -> None:
+    c.post("/api/v1/services/", json={
+        "name": name, "service_type": "Plumbing", "description": "d", "contact_info": "c",
+    }, headers=headers)
+
+
+def test_service_list_is_cached_until_a_write_invalidates_it(client, engine, login):
+    c = client
+    user = login("cache-user@example.com", "user")
+    provider = login("cache-provider@example.com", "provider_individual")
+    _create_service(c, provider, "First")
+
+    miss = c.get("/api/v1/services/", headers=user)
+    assert miss.headers["x-cache"] == "MISS"
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    hit = c.get("/api/v1/services/", headers=user)
+    assert hit.headers["x-cache"] == "HIT"
+    assert hit.json() == miss.json()
+    assert statements == []
+
+    not_modified = c.get("/api/v1/services/", headers={**user, "If-None-Match": miss.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert statements == []
+    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    _create_service(c, provider, "Second")
+    refreshed = c.get("/api/v1/services/", headers=user)
+    assert refreshed.headers["x-cache"] == "MISS"
+    assert [s["name"] for s in refreshed.json()] == ["Second", "First"]
+
+    stats = response_cache.stats()
+    assert stats["hits"] >= 2 and stats["bytes"] > 0
@@ -0,0 +1,49 @@
+"""Test full-text search on repair request and service listings."""
+
+
+def _search(c, path: str, q: str, headers: dict, **params):
+    r = c.get(path, params={"q": q, **params}, headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_repair_request_search_ranks_highlights_and_tracks_writes(client, login):
+    c = client
+    user = login("search-user@example.com", "user")
+    provider = login("search-provider@example.com", "provider_individual")
+    for title, description in [
+        ("Door hinge", "The bathroom tap is leaking"),
+        ("Leaking tap", "Kitchen tap drips all night"),
+        ("Broken window", "Glass cracked"),
+    ]:
+        c.post("/api/v1/repair-requests/", data={"title": title, "description": description}, headers=user)
+
+    results = _search(c, "/api/v1/repair-requests/", "leaks", provider)
+    assert [r["title"] for r in results] == ["Leaking tap", "Door hinge"]  # title outranks description
+    assert results[0]["rank"] > results[1]["rank"]
+    assert "<mark>Leaking</mark>" in results[0]["snippet"]
+    (sparse,) = _search(c, "/api/v1/repair-requests/", "leak kitchen", provider, fields="id,title")
+    assert set(sparse) == {"id", "title", "rank", "snippet"}
+    assert sparse["title"] == "Leaking tap"
+
+    request_id = results[1]["id"]
+    c.put(f"/api/v1/repair-requests/{request_id}", json={"description": "Squeaky hinge"}, headers=user)
+    assert [r["title"] for r in _search(c, "/api/v1/repair-requests/", "leak", provider)] == ["Leaking tap"]
+    assert [r["id"] for r in _search(c, "/api/v1/repair-requests/", "squeaky", provider)] == [request_id]
+
+    c.delete(f"/api/v1/repair-requests/{request_id}", headers=user)
+    assert _search(c, "/api/v1/repair-requests/", "squeaky", provider) == []
+
+
+def test_service_search_and_invalid_queries(client, login):
+    c = client
+    user = login("search-user@example.com", "user")
+    provider = login("search-provider@example.com", "provider_individual")
+    for name, service_type in [("Pipe Masters", "Plumbing"), ("Bright Sparks", "Electrical")]:
+        c.post("/api/v1/services/", json={
+            "name": name, "service_type": service_type, "description": "Fast and tidy", "contact_info": "555",
+        }, headers=provider)
+
+    assert [s["name"] for s in _search(c, "/api/v1/services/", "plumbing", user)] == ["Pipe Masters"]
+    assert c.get("/api/v1/services/", params={"q": "?!"}, headers=user).status_code == 400
+    assert c.get("/api/v1/services/", params={"q": "pipe", "cursor": ""}, headers=user).status_code == 400
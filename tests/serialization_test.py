@@ -0,0 +1,61 @@
+"""Test the fast list serialization path."""
+
+import json
+import uuid
+from datetime import datetime
+from typing import List
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.core.pagination import NEXT_CURSOR_HEADER, page_response
+from app.core.serialization import ModelSerializer
+from app.main import app  # noqa: F401  resolves schema forward references
+from app.models.repair_requests import RepairRequest
+from app.models.user_roles import UserRole
+from app.models.users import User
+from app.schemas.repair_request import RepairRequest as RepairRequestSchema
+
+
+def _rows() -> List[RepairRequest]:
+    user = User(
+        id=uuid.uuid4(), email="a@example.com", hashed_password="x", is_active=True,
+        is_superuser=False, is_verified=False, first_name="Ada", last_name="L",
+        role=UserRole.PROVIDER_ORGANIZATION, team_size=3,
+    )
+    with_user = RepairRequest(
+        id=uuid.uuid4(), title="Leak", description="Kitchen tap",
+        created_at=datetime(2025, 1, 2, 3, 4, 5, 678), user_id=user.id,
+    )
+    with_user.user = user
+    without_user = RepairRequest(
+        id=uuid.uuid4(), title="Door", voice_file="uploads/voices/a.wav",
+        created_at=datetime(2025, 1, 1), user_id=user.id,
+    )
+    without_user.user = None
+    return [with_user, without_user]
+
+
+def test_serializer_matches_pydantic_output():
+    rows = _rows()
+    adapter = TypeAdapter(List[RepairRequestSchema])
+    expected = json.loads(adapter.dump_json(adapter.validate_python(rows, from_attributes=True)))
+
+    fast = ORJSONResponse(ModelSerializer(RepairRequestSchema).many(rows))
+
+    assert json.loads(fast.body) == expected
+
+
+def test_page_response_returns_orjson_with_cursor_header():
+    serializer = ModelSerializer(RepairRequestSchema)
+
+    plain = page_response(Response(), _rows(), "next", None, serializer)
+    assert isinstance(plain, ORJSONResponse)
+    assert plain.headers[NEXT_CURSOR_HEADER] == "next"
+    assert len(json.loads(plain.body)) == 2
+
+    page = page_response(Response(), _rows(), None, "", serializer)
+    body = json.loads(page.body)
+    assert body["next_cursor"] is None
+    assert [item["title"] for item in body["items"]] == ["Leak", "Door"]
@@ -0,0 +1,71 @@
+"""Test the two-tier cache with the SQLite shared backend standing in for Redis."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.cache import TaggedCache
+from app.core.shared_cache import SharedTier, TwoTierCache, build_backend
+
+
+async def _worker(url: str):
+    """One worker process: its own shared tier connection and caches."""
+    tier = SharedTier()
+    await tier.start(url)
+    pages = TwoTierCache("pages", TaggedCache(maxsize=10, ttl=60), tier, encode=bytes, decode=bytes)
+    users = TwoTierCache("users", TaggedCache(maxsize=10, ttl=60), tier, key_type=uuid.UUID)
+    return tier, pages, users
+
+
+async def _until(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_l2_is_shared_and_invalidations_reach_every_worker(tmp_path):
+    url = f"sqlite:///{tmp_path / 'cache.db'}"
+    tier_a, pages_a, users_a = await _worker(url)
+    tier_b, pages_b, users_b = await _worker(url)
+    try:
+        await pages_a.set("/services/", b"[1]", tags=("services",), size=3)
+
+        # Worker B fills its L1 from the shared tier instead of rebuilding the page
+        assert await pages_b.get("/services/") == b"[1]"
+        assert pages_b.stats()["shared"]["hits"] == 1
+        assert "/services/" in pages_b
+        assert pages_b.stats()["tags"] == {"services": 1}
+
+        user_id = uuid.uuid4()
+        await users_b.set(user_id, {"email": "a@example.com"})
+        assert users_b.stats()["shared"]["enabled"] is False
+
+        await pages_a.invalidate_tags("services")
+        await users_a.invalidate(user_id)
+        await _until(lambda: "/services/" not in pages_b and user_id not in users_b)
+
+        assert await pages_b.get("/services/") is None
+        assert tier_b.stats()["events_received"] == 2
+        assert tier_a.stats()["events_received"] == 0  # own events are skipped
+    finally:
+        await tier_a.stop()
+        await tier_b.stop()
+
+
+@pytest.mark.asyncio
+async def test_without_a_shared_tier_caches_stay_per_worker():
+    tier = SharedTier()
+    await tier.start("")
+    cache = TwoTierCache("pages", TaggedCache(maxsize=10, ttl=60), tier, encode=bytes, decode=bytes)
+
+    await cache.set("k", b"v", tags=("services",))
+    assert await cache.get("k") == b"v"
+    assert await cache.invalidate_tags("services") == 1
+    assert await cache.get("k") is None
+    assert tier.stats()["backend"] is None
+    assert build_backend("") is None
+    with pytest.raises(ValueError):
+        build_backend("memcached://localhost")
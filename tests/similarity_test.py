@@ -0,0 +1,77 @@
+"""Test hashed-vector similarity between repair requests and services."""
+
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core.similarity import SimilarityIndex, service_similarity
+
+
+@pytest.fixture
+def vectors(tmp_path, monkeypatch):
+    """Build the service vectors under tmp_path instead of SIMILARITY_INDEX_DIR."""
+    monkeypatch.setattr(service_similarity, "directory", tmp_path / "vectors")
+    monkeypatch.setattr(service_similarity, "_snapshot", None)
+
+
+def _request(title: str, description: str = None):
+    return SimpleNamespace(title=title, description=description)
+
+
+def test_top_k_finds_related_trades_in_one_batch(tmp_path):
+    services = [
+        SimpleNamespace(id=uuid.uuid4(), service_type=service_type, name=name, description=description)
+        for service_type, name, description in [
+            ("Plumbing", "Smith & Sons", "Fast and friendly, 24/7 call-outs"),
+            ("Electrical", "Bright Sparks", "Rewires and consumer units"),
+            ("Gardening", "Green Thumb", "Lawns and hedges"),
+        ]
+    ]
+    snapshot = SimilarityIndex(str(tmp_path), 1024)._build("stamp", services)
+    assert isinstance(snapshot.vectors, np.memmap)
+
+    queries = snapshot.embed([[(r.title, 2.0), (r.description, 1.0)] for r in [
+        _request("Leaking tap", "Kitchen tap drips"),  # no word in common with the plumber
+        _request("Socket sparks"),
+        _request("xyzzy"),
+    ]])
+    ranked = snapshot.top_k(queries, 2)
+    assert ranked[0][0][0] == services[0].id
+    assert ranked[1][0][0] == services[1].id
+    assert ranked[2] == []
+    assert all(0 < score <= 1.0 for _, score in ranked[0])
+
+
+def test_similar_services_endpoint_persists_and_follows_writes(client, vectors, monkeypatch, login):
+    c = client
+    user = login("similar-user@example.com", "user")
+    other = login("similar-other@example.com", "user")
+    provider = login("similar-provider@example.com", "provider_individual")
+    for name, service_type in [("Smith & Sons", "Plumbing"), ("Bright Sparks", "Electrical")]:
+        c.post("/api/v1/services/", json={
+            "name": name, "service_type": service_type, "description": "Call any time", "contact_info": "c",
+        }, headers=provider)
+    request_id = c.post("/api/v1/repair-requests/", data={
+        "title": "Leaking tap", "description": "Water under the sink",
+    }, headers=user).json()["id"]
+
+    similar = c.get(f"/api/v1/repair-requests/{request_id}/services", headers=user).json()
+    assert similar[0]["name"] == "Smith & Sons"
+    assert all(similar[0]["similarity"] > s["similarity"] for s in similar[1:])
+    assert c.get(f"/api/v1/repair-requests/{request_id}/services", headers=other).status_code == 403
+
+    # A fresh worker maps the saved snapshot instead of rebuilding it
+    with monkeypatch.context() as m:
+        m.setattr(service_similarity, "_snapshot", None)
+        m.setattr(service_similarity, "_build", lambda *args: pytest.fail("rebuilt an unchanged index"))
+        assert c.get(f"/api/v1/repair-requests/{request_id}/services", headers=user).json() == similar
+
+    # A new service is picked up on the next lookup, and the old files are removed
+    c.post("/api/v1/services/", json={
+        "name": "Drip Fix", "service_type": "Plumbing", "description": "Leaking taps", "contact_info": "c",
+    }, headers=provider)
+    similar = c.get(f"/api/v1/repair-requests/{request_id}/services", headers=user).json()
+    assert similar[0]["name"] == "Drip Fix"
+    assert len(list(service_similarity.directory.glob("services-*.vectors.npy"))) == 1
@@ -0,0 +1,83 @@
+"""Test single-flight coalescing of identical reads."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException, Request, Response
+
+from app.core.singleflight import SingleFlight, coalesce, read_flight
+
+
+def _request(path: str = "/api/v1/repair-requests/", query: bytes = b"limit=100", headers=()) -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query, "headers": list(headers)})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def query():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "rows"
+
+    tasks = [asyncio.create_task(flight.do("page-1", query)) for _ in range(10)]
+    await asyncio.sleep(0)
+    assert flight.stats()["waiting"] == 9
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["rows"] * 10
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "waiting": 0, "max_waiting": 9, "executions": 1, "shared": 9}
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_cancelled_leaders_hand_over():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise HTTPException(status_code=304)
+
+    tasks = [asyncio.create_task(flight.do("k", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(r, HTTPException) and r.status_code == 304 for r in results)
+
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.01)
+        return "done"
+
+    leader = asyncio.create_task(flight.do("k", slow))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "done"
+
+
+@pytest.mark.asyncio
+async def test_coalesce_gives_each_caller_its_own_response():
+    renders = 0
+
+    async def render():
+        nonlocal renders
+        renders += 1
+        await asyncio.sleep(0.01)
+        return Response(b"[]", media_type="application/json", headers={"ETag": 'W/"v1"'})
+
+    first, second = await asyncio.gather(coalesce(_request(), render), coalesce(_request(), render))
+
+    assert renders == 1
+    assert first is not second
+    assert first.body == second.body == b"[]"
+    assert second.headers["etag"] == 'W/"v1"'
+    assert read_flight.stats()["in_flight"] == 0
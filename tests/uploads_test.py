@@ -0,0 +1,53 @@
+"""Test streaming voice uploads."""
+
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.uploads import UploadSizeLimitMiddleware, save_upload
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="voice.wav")
+
+
+@pytest.mark.asyncio
+async def test_save_upload_streams_and_hashes(tmp_path):
+    data = b"RIFF" + bytes(range(256)) * 1000
+    destination = tmp_path / "voice.wav"
+
+    size, sha256 = await save_upload(_upload(data), destination, max_bytes=1_000_000, chunk_size=4096)
+
+    assert size == len(data)
+    assert sha256 == hashlib.sha256(data).hexdigest()
+    assert destination.read_bytes() == data
+
+
+@pytest.mark.asyncio
+async def test_save_upload_rejects_oversized_file_and_cleans_up(tmp_path):
+    destination = tmp_path / "voice.wav"
+
+    with pytest.raises(HTTPException) as exc:
+        await save_upload(_upload(b"x" * 10_000), destination, max_bytes=5_000, chunk_size=1024)
+
+    assert exc.value.status_code == 413
+    assert not destination.exists()
+
+
+def test_middleware_limits_upload_body():
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_body_size=2_000, paths=["/upload"])
+
+    @app.post("/upload")
+    async def upload(voice_file: UploadFile = File(...)):
+        return {"size": len(await voice_file.read())}
+
+    client = TestClient(app)
+    ok = client.post("/upload", files={"voice_file": ("a.wav", b"x" * 500, "audio/wav")})
+    assert ok.status_code == 200
+
+    too_big = client.post("/upload", files={"voice_file": ("a.wav", b"x" * 5_000, "audio/wav")})
+    assert too_big.status_code == 413
@@ -0,0 +1,62 @@
+"""Test the per-worker user cache."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.cache import TTLCache
+from app.database.base import Base
+from app.models.user_roles import UserRole
+from app.models.users import User
+from app.users.dependencies import CachedSQLAlchemyUserDatabase, user_cache
+
+
+def test_ttl_cache_lru_and_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert "b" not in cache
+    assert cache.get("c") == 3
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_user_db_hits_and_invalidates(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user_cache.clear()
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        user_db = CachedSQLAlchemyUserDatabase(session, User)
+        user = await user_db.create(
+            {"email": "a@example.com", "hashed_password": "x", "role": UserRole.USER}
+        )
+        user_id = user.id
+
+    async with AsyncSession(engine) as session:
+        user_db = CachedSQLAlchemyUserDatabase(session, User)
+        hits = user_cache.hits
+        assert (await user_db.get(user_id)).email == "a@example.com"
+        cached = await user_db.get(user_id)
+        assert user_cache.hits == hits + 1
+        assert cached.role == UserRole.USER
+
+    async with AsyncSession(engine) as session:
+        user_db = CachedSQLAlchemyUserDatabase(session, User)
+        user = await user_db.get(user_id)
+        await user_db.update(user, {"role": UserRole.ADMIN})
+        assert user_id not in user_cache
+        assert (await user_db.get(user_id)).role == UserRole.ADMIN
+
+    user_cache.clear()
+    await engine.dispose()
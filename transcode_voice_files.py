@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Queue background processing for voice uploads that have not been processed yet."""
+
+import asyncio
+
+
+async def transcode_voice_files():
+    """Enqueue a voice.transcode job for every request with a voice file but no duration."""
+    print("🔄 Queueing unprocessed voice files...")
+
+    try:
+        from sqlalchemy import select
+
+        from app.core import tasks  # noqa: F401  registers voice.transcode
+        from app.core.jobs import enqueue
+        from app.database.session import AsyncSessionLocal, async_engine
+        from app.models.repair_requests import RepairRequest
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(RepairRequest.id).where(
+                    RepairRequest.voice_file.is_not(None), RepairRequest.voice_duration.is_(None)
+                )
+            )
+            ids = result.scalars().all()
+            for repair_request_id in ids:
+                await enqueue(session, "voice.transcode", {"repair_request_id": str(repair_request_id)})
+            await session.commit()
+        await async_engine.dispose()
+
+        print(f"✅ Voice files queued: {len(ids)}")
+        print("🎉 Job workers will transcode them in the background")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error queueing voice files: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    asyncio.run(transcode_voice_files())